@@ -1,8 +1,16 @@
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config, TestingConfig  
 from app.extensions import db, migrate, jwt, cache
 from flask_cors import CORS
 from app.logging_config import setup_logging
+from app.utils.permission_cache import init_permission_cache
+from app.utils.permission_claims import init_permission_claims
+from app.utils.token_revocation import init_token_revocation
+from app.utils.password_hasher import init_password_hasher
+from app.utils.login_throttle import init_login_throttle
+from app.utils.serialization_utils import init_json_provider
+from app.utils.tag_index import init_tag_index
 
 def create_app(config_class=Config):
     """Application factory."""
@@ -19,11 +27,22 @@ def create_app(config_class=Config):
     for key, value in security_config.items():
         app.config[key] = value
 
+    # Behind a reverse proxy, take the client address from X-Forwarded-For (login throttling keys on it)
+    if app.config.get('PROXY_FIX_X_FOR'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    init_token_revocation(app)
     cache.init_app(app)
+    init_permission_cache(app)
+    init_permission_claims(app)
+    init_password_hasher(app)
+    init_login_throttle(app)
+    init_json_provider(app)
+    init_tag_index(app)
     
     # Configure logging
     setup_logging(app)
@@ -32,7 +51,8 @@ def create_app(config_class=Config):
     CORS(
         app,
         resources={r"/api/*": {"origins": ["http://127.0.0.1:3000", "http://localhost:3000"]}},
-        supports_credentials=True
+        supports_credentials=True,
+        expose_headers=["X-Permissions-Stale"]
     )
 
     # Register blueprints
@@ -45,4 +65,16 @@ def create_app(config_class=Config):
         from app.errors.handlers import register_error_handlers
         register_error_handlers(app)
 
+    # Upgrade databases created from older models, then backfill derived tables on databases that predate them
+    from app.models.schema_upgrade import init_schema_upgrade
+    init_schema_upgrade(app)
+    from app.services.effective_permission_service import init_effective_permissions
+    init_effective_permissions(app)
+    from app.models.usergroup_models import init_usergroup_search_index
+    init_usergroup_search_index(app)
+
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
     return app
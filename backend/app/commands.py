@@ -0,0 +1,53 @@
+import click
+
+
+def register_commands(app):
+    """Registers the application's Flask CLI commands (run with `flask --app main <command>`)."""
+
+    @app.cli.command('upgrade-schema')
+    def upgrade_schema_command():
+        """Add the tables, columns, constraints and indexes an existing database lacks."""
+        from app import db
+        from app.models.schema_upgrade import upgrade_schema
+
+        with db.engine.begin() as connection:
+            applied = upgrade_schema(connection)
+        for step in applied:
+            click.echo(f'Applied: {step}')
+        click.echo(f'Schema upgrade complete: {len(applied)} changes.')
+
+    @app.cli.command('rebuild-permissions')
+    @click.option('--org', 'org_id', default=None, help='Only rebuild this organization.')
+    def rebuild_permissions_command(org_id):
+        """Rebuild user_effective_permission from the role tables."""
+        from app.services.effective_permission_service import rebuild_effective_permissions
+
+        count = rebuild_effective_permissions(org_id)
+        click.echo(f'Rebuilt user_effective_permission: {count} rows.')
+
+    @app.cli.command('prune-revoked-tokens')
+    def prune_revoked_tokens_command():
+        """Delete revoked_token rows for tokens that have expired."""
+        from app.utils.token_revocation import prune_revoked_tokens
+
+        count = prune_revoked_tokens()
+        click.echo(f'Pruned {count} expired revoked tokens.')
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Create and repopulate the user group full-text index (e.g. after VACUUM)."""
+        from app import db
+        from app.models.usergroup_models import rebuild_usergroup_search_index
+
+        with db.engine.begin() as connection:
+            rebuild_usergroup_search_index(connection)
+        click.echo('Rebuilt the user group search index.')
+
+    @app.cli.command('reconcile-tag-usage')
+    @click.option('--org', 'org_id', default=None, help='Only reconcile this organization.')
+    def reconcile_tag_usage_command(org_id):
+        """Repair tag usage counters that drifted from usergroup_tag."""
+        from app.services.tag_service import reconcile_tag_usage
+
+        count = reconcile_tag_usage(org_id)
+        click.echo(f'Reconciled tag usage counts: {count} tags corrected.')
@@ -4,9 +4,10 @@ from app.models.class_models import Class, class_enrollment
 from app.models.organization_models import Organization
 from app.models.quiz_models import Quiz, QuizQuestion
 from app.models.resource_models import Resource
+from app.models.revoked_token_models import RevokedToken
 from app.models.tag_models import Tag
 from app.models.usergroup_models import UserGroup
-from app.models.shared_tables import class_enrollment, securityrole_authorizations, user_securityroles, user_organization, usergroup_tag, usergroup_user
+from app.models.shared_tables import class_enrollment, securityrole_authorizations, user_securityroles, user_organization, usergroup_tag, usergroup_user, user_effective_permission
 
 __all__ = [
     "Action",
@@ -16,6 +17,7 @@ __all__ = [
     "Quiz",
     "QuizQuestion",
     "Resource",
+    "RevokedToken",
     "SecurityRole",
     "Tag",
     "User",
@@ -23,6 +25,7 @@ __all__ = [
     "class_enrollment",
     "securityrole_authorizations",
     "user_securityroles",
+    "user_effective_permission",
     "user_organization",
     "usergroup_tag",
     "usergroup_user",
@@ -21,6 +21,8 @@ class User(db.Model, UserMixin):
     locked = db.Column(db.Boolean, default=False)
     last_logon = db.Column(db.DateTime)
     logon_attempt = db.Column(db.Integer, nullable=False, default=0)
+    # Bumped whenever the user's effective permissions change; stamped into JWT permission claims
+    permission_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_by = db.Column(db.String(36), nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), default=func.now())
     updated_by = db.Column(db.String(36), nullable=False)
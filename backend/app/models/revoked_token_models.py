@@ -0,0 +1,13 @@
+from app import db
+from sqlalchemy import func
+
+# Table: RevokedToken
+class RevokedToken(db.Model):
+    """Denylisted JWT. Rows are pruned once the token would have expired anyway."""
+    __tablename__ = 'revoked_token'
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), nullable=True)
+    org_id = db.Column(db.String(36), nullable=True)
+    token_type = db.Column(db.String(10), nullable=False, default='access')
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # UTC
+    revoked_at = db.Column(db.DateTime(timezone=True), default=func.now())
@@ -0,0 +1,128 @@
+from flask import current_app
+from sqlalchemy import select, delete, update, func, inspect, UniqueConstraint
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateColumn
+from app import db
+from app.models.shared_tables import usergroup_user, usergroup_tag
+from app.models.tag_models import Tag
+
+# db.create_all() only creates missing tables; upgrade_schema brings a database created
+# from older models up to date: missing tables, columns and indexes, plus the unique
+# constraints below once the rows violating them are removed. Run at startup and by
+# `flask upgrade-schema`.
+
+# Indexes superseded by newer ones (usergroup_user's unique constraint covers (org_id, group_id, user_id))
+LEGACY_INDEXES = {'usergroup_user': ('idx_usergroup_user',)}
+
+
+def _dedupe_usergroup_user(connection):
+    """Collapses duplicate memberships into one row each, keeping the earliest. Returns rows removed."""
+    key = (usergroup_user.c.org_id, usergroup_user.c.group_id, usergroup_user.c.user_id)
+    duplicates = connection.execute(select(*key, func.count()).group_by(*key).having(func.count() > 1)).all()
+    removed = 0
+    for org_id, group_id, user_id, count in duplicates:
+        membership = (usergroup_user.c.org_id == org_id, usergroup_user.c.group_id == group_id,
+                      usergroup_user.c.user_id == user_id)
+        earliest = connection.execute(
+            select(usergroup_user).where(*membership).order_by(usergroup_user.c.created_at).limit(1)
+        ).mappings().one()
+        connection.execute(delete(usergroup_user).where(*membership))
+        connection.execute(usergroup_user.insert().values(**earliest))
+        removed += count - 1
+    return removed
+
+
+def _backfill_tag_usage(connection):
+    """Counts each tag's user groups into the new usage_count column."""
+    tag_table = Tag.__table__
+    connection.execute(update(tag_table).values(usage_count=select(func.count()).select_from(usergroup_tag).where(
+        usergroup_tag.c.org_id == tag_table.c.org_id, usergroup_tag.c.tag_id == tag_table.c.id
+    ).scalar_subquery()))
+
+
+# Unique constraints added to existing tables, with the step that removes the rows violating them
+ADDED_UNIQUE_CONSTRAINTS = {'uq_usergroup_user': _dedupe_usergroup_user}
+# Columns whose values must be derived from existing rows once added
+COLUMN_BACKFILLS = {('tag', 'usage_count'): _backfill_tag_usage}
+
+
+def _index_names(inspector, table_name):
+    names = {index['name'] for index in inspector.get_indexes(table_name)}
+    names.update(constraint['name'] for constraint in inspector.get_unique_constraints(table_name))
+    return names
+
+
+def upgrade_schema(connection):
+    """
+    Applies every model change an existing database lacks, idempotently.
+
+    Args:
+        connection (Connection): Connection in an open transaction.
+
+    Returns:
+        list: Descriptions of the steps applied; empty if the schema was current.
+    """
+    applied = []
+    preparer = connection.dialect.identifier_preparer
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+
+    missing = [table for table in db.metadata.sorted_tables if table.name not in existing]
+    if missing:
+        db.metadata.create_all(connection, tables=missing)
+        applied.extend(f'created table {table.name}' for table in missing)
+
+    for table in db.metadata.sorted_tables:
+        if table in missing:
+            continue
+        columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(f'Cannot add NOT NULL column {table.name}.{column.name} without a server default')
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}')
+            backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+            if backfill:
+                backfill(connection)
+            applied.append(f'added column {table.name}.{column.name}')
+
+        index_names = _index_names(inspector, table.name)
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or constraint.name not in ADDED_UNIQUE_CONSTRAINTS:
+                continue
+            if constraint.name in index_names:
+                continue
+            removed = ADDED_UNIQUE_CONSTRAINTS[constraint.name](connection)
+            # A unique index enforces the constraint on every dialect (SQLite cannot ALTER one in)
+            column_list = ', '.join(preparer.quote(column.name) for column in constraint.columns)
+            connection.exec_driver_sql(
+                f'CREATE UNIQUE INDEX {preparer.quote(constraint.name)} ON {preparer.format_table(table)} ({column_list})'
+            )
+            applied.append(f'added unique constraint {constraint.name} ({removed} duplicate rows removed)')
+        for index in table.indexes:
+            if index.name not in index_names:
+                index.create(connection)
+                applied.append(f'created index {index.name}')
+        for legacy_name in LEGACY_INDEXES.get(table.name, ()):
+            if legacy_name in index_names:
+                connection.exec_driver_sql(f'DROP INDEX {preparer.quote(legacy_name)}')
+                applied.append(f'dropped index {legacy_name}')
+    return applied
+
+
+def init_schema_upgrade(app):
+    """
+    Runs upgrade_schema at startup on databases that already have tables, so code
+    relying on newer columns, constraints and indexes finds them.
+    """
+    with app.app_context():
+        try:
+            if not inspect(db.engine).get_table_names():
+                return  # fresh database: created from the current models
+            with db.engine.begin() as connection:
+                for step in upgrade_schema(connection):
+                    current_app.logger.warning(f'Schema upgrade: {step}')
+        except (SQLAlchemyError, RuntimeError) as e:
+            current_app.logger.error(f'Schema upgrade failed at startup; run `flask upgrade-schema`: {e}')
@@ -45,7 +45,9 @@ usergroup_tag = db.Table('usergroup_tag',
     db.Column('usergroup_id', db.String(36), db.ForeignKey('usergroup.id', ondelete="SET NULL"), primary_key=True),
     db.Column('tag_id', db.String(36), db.ForeignKey('tag.id', ondelete="SET NULL"), primary_key=True),
     db.Column('created_at', db.DateTime(timezone=True), default=func.now()),
-    db.Column('created_by', db.String(36), nullable=False)
+    db.Column('created_by', db.String(36), nullable=False),
+    # Tag filters look up the groups of given tags within an organization
+    Index('idx_usergroup_tag_org_tag_group', 'org_id', 'tag_id', 'usergroup_id')
 )
 
 
@@ -57,5 +59,22 @@ usergroup_user = db.Table(
     db.Column('user_id', db.String(36), db.ForeignKey('user.id', ondelete="SET NULL"), nullable=False),
     db.Column('created_at', db.DateTime(timezone=True), default=func.now(), nullable=False),
     db.Column('created_by', db.String(36), nullable=False),
-    Index('idx_usergroup_user', 'org_id', 'group_id', 'user_id')
+    # One row per membership; its index also serves group -> members lookups
+    UniqueConstraint('org_id', 'group_id', 'user_id', name='uq_usergroup_user'),
+    # Reverse direction: a user's groups
+    Index('idx_usergroup_user_member', 'org_id', 'user_id', 'group_id')
+)
+
+
+# Materialized user -> (resource, action) grants, derived from
+# user_securityroles -> securityrole_authorizations -> authorization.
+# Maintained by the role services in app.services.authorization_service (backfilled at
+# startup when empty, rebuilt by `flask rebuild-permissions`); the primary key is
+# the covering index for every (org_id, user_id[, resource_id, action_id]) lookup.
+user_effective_permission = db.Table(
+    'user_effective_permission',
+    db.Column('org_id', db.String(36), db.ForeignKey('organization.id', ondelete="CASCADE"), primary_key=True),
+    db.Column('user_id', db.String(36), db.ForeignKey('user.id', ondelete="CASCADE"), primary_key=True),
+    db.Column('resource_id', db.String(36), db.ForeignKey('resource.id', ondelete="CASCADE"), primary_key=True),
+    db.Column('action_id', db.String(36), db.ForeignKey('action.id', ondelete="CASCADE"), primary_key=True),
 )
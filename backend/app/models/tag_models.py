@@ -13,6 +13,10 @@ class Tag(db.Model):
     created_by = db.Column(db.String(36), nullable=False)
     updated_at = db.Column(db.DateTime(timezone=True), default=func.now(), onupdate=func.now())
     updated_by = db.Column(db.String(36), nullable=False)
+    # Number of user groups carrying the tag, kept by the group write paths (see reconcile_tag_usage)
+    usage_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     __table_args__ = (
         UniqueConstraint('org_id', 'name', name='uq_org_tag_name'),
+        # Popular-tag lists read the most used tags of an organization in index order
+        Index('idx_tag_org_usage', 'org_id', 'usage_count'),
     )
\ No newline at end of file
@@ -1,5 +1,7 @@
+from flask import current_app
 from app import db
-from sqlalchemy import UniqueConstraint, func, Index
+from sqlalchemy import UniqueConstraint, func, Index, event, DDL, inspect
+from sqlalchemy.exc import SQLAlchemyError
 import uuid
 from app.models.shared_tables import usergroup_user, usergroup_tag
 
@@ -15,7 +17,110 @@ class UserGroup(db.Model):
     created_by = db.Column(db.String(36), nullable=False)
     updated_at = db.Column(db.DateTime(timezone=True), default=func.now(), onupdate=func.now())
     updated_by = db.Column(db.String(36), nullable=False)
+    # Bumped on every write to the group, its members or its tags (see touch_user_groups); part of its ETag
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Relationship to Users (many-to-many)
     users = db.relationship('User', secondary=usergroup_user, backref=db.backref('usergroup'))
     tags = db.relationship('Tag', secondary=usergroup_tag, backref=db.backref('usergroups', lazy='dynamic'))
+
+    __table_args__ = (
+        # Keyset pagination: seek on (sort key, id) within an organization
+        db.Index('idx_usergroup_org_title_id', 'org_id', 'title', 'id'),
+        db.Index('idx_usergroup_org_created_at_id', 'org_id', 'created_at', 'id'),
+    )
+
+
+# Full-text index over title/description, scoped by organization.
+# SQLite: an external-content FTS5 table kept in sync by triggers on usergroup; org_id is
+# indexed too so a search matches only the caller's organization (weight 0 in ranking).
+# VACUUM may renumber usergroup rowids; run `flask rebuild-search-index` afterwards.
+# PostgreSQL: a generated, weighted tsvector column with a GIN index.
+USERGROUP_FTS_COLUMNS = 'org_id, title, description'
+USERGROUP_SEARCH_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS usergroup_fts USING fts5("
+        f"{USERGROUP_FTS_COLUMNS}, content='usergroup', content_rowid='rowid', tokenize='unicode61', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS usergroup_fts_ai AFTER INSERT ON usergroup BEGIN "
+        f"INSERT INTO usergroup_fts(rowid, {USERGROUP_FTS_COLUMNS}) "
+        "VALUES (new.rowid, new.org_id, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS usergroup_fts_ad AFTER DELETE ON usergroup BEGIN "
+        f"INSERT INTO usergroup_fts(usergroup_fts, rowid, {USERGROUP_FTS_COLUMNS}) "
+        "VALUES ('delete', old.rowid, old.org_id, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS usergroup_fts_au AFTER UPDATE OF org_id, title, description ON usergroup BEGIN "
+        f"INSERT INTO usergroup_fts(usergroup_fts, rowid, {USERGROUP_FTS_COLUMNS}) "
+        "VALUES ('delete', old.rowid, old.org_id, old.title, old.description); "
+        f"INSERT INTO usergroup_fts(rowid, {USERGROUP_FTS_COLUMNS}) "
+        "VALUES (new.rowid, new.org_id, new.title, new.description); END",
+    ],
+    'postgresql': [
+        "ALTER TABLE usergroup ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS idx_usergroup_search_vector ON usergroup USING GIN (search_vector)",
+    ],
+}
+USERGROUP_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS usergroup_fts_ai",
+    "DROP TRIGGER IF EXISTS usergroup_fts_ad",
+    "DROP TRIGGER IF EXISTS usergroup_fts_au",
+    "DROP TABLE IF EXISTS usergroup_fts",
+]
+
+
+def create_usergroup_search_index(connection):
+    """Creates the dialect's full-text index objects for usergroup if they are missing."""
+    for statement in USERGROUP_SEARCH_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_usergroup_search_index(connection):
+    """Creates the index objects if needed and repopulates the SQLite FTS5 table from usergroup."""
+    create_usergroup_search_index(connection)
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql("INSERT INTO usergroup_fts(usergroup_fts) VALUES ('rebuild')")
+
+
+def ensure_usergroup_search_index(connection):
+    """
+    Brings an existing database's full-text index up to date, idempotently.
+
+    SQLite: a missing usergroup_fts table, or one created before it indexed org_id, is
+    (re)created with its triggers and backfilled from usergroup. PostgreSQL: the DDL is
+    IF NOT EXISTS and the generated column fills itself.
+
+    Returns:
+        bool: True if the index was created or rebuilt.
+    """
+    if connection.dialect.name != 'sqlite':
+        create_usergroup_search_index(connection)
+        return False
+    sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'usergroup_fts'"
+    ).scalar()
+    if sql and 'org_id' in sql:
+        return False
+    for statement in USERGROUP_FTS_DROP:
+        connection.exec_driver_sql(statement)
+    rebuild_usergroup_search_index(connection)
+    return True
+
+
+def init_usergroup_search_index(app):
+    """
+    Runs ensure_usergroup_search_index at startup so searches work on databases
+    created before the index (or its current layout) existed.
+    """
+    with app.app_context():
+        try:
+            if not inspect(db.engine).has_table(UserGroup.__tablename__):
+                return  # fresh database: created with the table (after_create)
+            with db.engine.begin() as connection:
+                if ensure_usergroup_search_index(connection):
+                    current_app.logger.warning('Built the user group search index.')
+        except SQLAlchemyError as e:
+            current_app.logger.error(f'User group search index not checked at startup: {e}')
+
+
+event.listen(UserGroup.__table__, 'after_create', lambda target, connection, **kw: create_usergroup_search_index(connection))
+event.listen(UserGroup.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS usergroup_fts').execute_if(dialect='sqlite'))
@@ -1,9 +1,9 @@
 from flask import Blueprint, request, current_app, g
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request, set_access_cookies, set_refresh_cookies
 from app.utils.jwt_utils import create_jwt_token, verify_refresh_token, set_tokens_in_cookies
-from app.utils.response_utils import create_response
+from app.utils.response_utils import create_response, is_not_modified, create_not_modified_response
 from app.utils.auth_decorators import inject_identity
-from app.services.authorization_service import get_user_authorizations
+from app.services.authorization_service import get_user_authorizations, get_user_authorizations_etag
 
 auth_bp = Blueprint('auth_bp', __name__)
 
@@ -54,7 +54,6 @@ def refresh_token():
 
 @auth_bp.route('/api/authorizations', methods=['GET'])
 @inject_identity
-@jwt_required()
 def get_authorizations():
     """
         Retrieves all authorizations for the logged-in user and organization, or for specific resources if provided.
@@ -62,7 +61,8 @@ def get_authorizations():
             resources: Optional list of resource names to filter the authorizations
                         (e.g., ['StudentGroup', 'Quiz']). If not provided, fetch all resources.
         Returns: 
-            Dictionary with resources as keys and authorization actions as values
+            Dictionary with resources as keys and authorization actions as values.
+            Carries an ETag; a matching If-None-Match is answered with 304.
     """
     try:
         # Extract the user_id from the JWT identity
@@ -70,9 +70,13 @@ def get_authorizations():
         org_id = g.org_id
         resources = request.args.get('resources')
 
+        etag = get_user_authorizations_etag(user_id, org_id, resources)
+        if etag and is_not_modified(etag):
+            return create_not_modified_response(etag)
+
         result = get_user_authorizations(user_id, org_id, resources)
 
-        return create_response(data=result, message=f"User authorizations has returned.", status=200)
+        return create_response(data=result, message=f"User authorizations has returned.", status=200, etag=etag)
     
     except PermissionError:
         # Raise a specific error if permissions are insufficient
@@ -0,0 +1,34 @@
+from flask import Blueprint
+from app.utils.response_utils import create_response
+from app.utils.auth_decorators import inject_identity, require_permission
+from app.utils.password_hasher import password_hasher
+from app.services.usergroup_service import list_cache_stats
+
+metrics_bp = Blueprint('metrics_bp', __name__)
+RESOURCE_NAME = 'metrics'
+
+@metrics_bp.route('/api/metrics', methods=['GET'])
+@inject_identity
+@require_permission(RESOURCE_NAME, 'read')
+def get_metrics():
+    """
+    Get Runtime Metrics
+
+    Reports in-process counters of this worker. Requires metrics:read.
+
+    Returns:
+        Response:
+            {
+                "data": {
+                    "login": {"workers": 4, "queue_depth": 0, "latency_ms": {"p50": ..., "p95": ..., "max": ...}, ...},
+                    "usergroup_list_cache": {"hits_total": 120, "misses_total": 30, "hit_ratio": 0.8}
+                },
+                "message": "Metrics retrieved successfully",
+                "status": 200
+            }
+    """
+    return create_response(
+        data={"login": password_hasher.metrics(), "usergroup_list_cache": list_cache_stats.snapshot()},
+        message="Metrics retrieved successfully",
+        status=200
+    )
@@ -1,19 +1,24 @@
-from flask import Blueprint, request, g
+from flask import Blueprint, request, g, current_app
 from flask_jwt_extended import jwt_required
 from app.services.tag_service import (
     get_tags_by_resource,
     create_tag,
     delete_tag,
-    get_tags_by_user_group
+    get_tags_by_user_group,
+    get_user_group_tags_etag,
+    suggest_tags,
+    get_popular_tags,
 )
-from app.utils.response_utils import create_response
-from app.utils.auth_decorators import inject_identity
+from app.utils.response_utils import create_response, is_not_modified, create_not_modified_response
+from app.utils.auth_decorators import inject_identity, require_permission
 
 tag_bp = Blueprint('tag_bp', __name__)
 
+# Tags are managed as part of user groups
+TAG_RESOURCE_NAME = 'usergroup'
+
 @tag_bp.route('/api/userGroupTags/<group_id>', methods=['GET'])
 @inject_identity
-@jwt_required()
 def get_user_group_tags(group_id):
     """
     Get Tags for User Group
@@ -30,17 +35,105 @@ def get_user_group_tags(group_id):
                 "message": "Tags fetched successfully",
                 "status": 200
             }
+        Carries an ETag and Last-Modified; a matching If-None-Match is answered with 304.
     """
     try:
         org_id = g.org_id
         user_id = g.user_id
 
+        etag, last_modified = get_user_group_tags_etag(org_id, group_id)
+        if etag and is_not_modified(etag):
+            return create_not_modified_response(etag, last_modified)
+
         tags = get_tags_by_user_group(org_id, user_id, group_id)
-        return create_response(data={"tags": tags}, message="Tags fetched successfully", status=200)
+        return create_response(data={"tags": tags}, message="Tags fetched successfully", status=200,
+                               etag=etag, last_modified=last_modified)
     except Exception as e:
         raise Exception(f"Error fetching tags for user group: {str(e)}")
 
 
+def _get_limit():
+    """Reads the `limit` query parameter (default 10); None unless it is 1..TAG_SUGGEST_MAX_LIMIT."""
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return None
+    return limit if 1 <= limit <= current_app.config.get('TAG_SUGGEST_MAX_LIMIT', 25) else None
+
+
+def _invalid_limit_response():
+    max_limit = current_app.config.get('TAG_SUGGEST_MAX_LIMIT', 25)
+    return create_response(data=None, message=f"limit must be between 1 and {max_limit}", status=400)
+
+
+@tag_bp.route('/api/tags/suggest', methods=['GET'])
+@inject_identity
+def suggest_org_tags():
+    """
+    Suggest Tags
+
+    Type-ahead for tag pickers: the organization's tags whose names start with `q`
+    (case-insensitive), most used first. Answered from an in-memory index once warm.
+
+    Query Parameters:
+        - q: Typed prefix; empty returns the most used tags.
+        - limit: Maximum number of suggestions (default 10, at most TAG_SUGGEST_MAX_LIMIT).
+
+    Returns:
+        Response:
+            {
+                "data": {"tags": [{"id": ..., "name": ..., "usage": ...}, ...]},
+                "message": "Tags suggested successfully",
+                "status": 200
+            }
+    """
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = _get_limit()
+        if limit is None:
+            return _invalid_limit_response()
+
+        tags = suggest_tags(g.org_id, prefix, limit)
+        if tags is None:
+            return create_response(data=None, message="Failed to suggest tags", status=500)
+        return create_response(data={"tags": tags}, message="Tags suggested successfully", status=200)
+    except Exception as e:
+        raise Exception(f"Error suggesting tags: {str(e)}")
+
+
+@tag_bp.route('/api/tags/popular', methods=['GET'])
+@inject_identity
+def get_org_popular_tags():
+    """
+    Get Popular Tags
+
+    Lists the organization's most used tags (tag clouds, pickers) from the tags'
+    usage counters; tags no group carries are left out.
+
+    Query Parameters:
+        - limit: Maximum number of tags (default 10, at most TAG_SUGGEST_MAX_LIMIT).
+
+    Returns:
+        Response:
+            {
+                "data": {"tags": [{"id": ..., "name": ..., "usage": ...}, ...]},
+                "message": "Popular tags fetched successfully",
+                "status": 200
+            }
+    """
+    try:
+        limit = _get_limit()
+        if limit is None:
+            return _invalid_limit_response()
+
+        tags = get_popular_tags(g.org_id, limit)
+        if tags is None:
+            return create_response(data=None, message="Failed to fetch popular tags", status=500)
+        return create_response(data={"tags": tags}, message="Popular tags fetched successfully", status=200)
+    except Exception as e:
+        raise Exception(f"Error fetching popular tags: {str(e)}")
+
+
 @tag_bp.route('/api/tags/<resource_id>', methods=['GET'])
 @jwt_required()
 def get_tags(resource_id):
@@ -71,7 +164,6 @@ def get_tags(resource_id):
 
 @tag_bp.route('/api/tags', methods=['POST'])
 @inject_identity
-@jwt_required()
 def create_new_tag():
     """
     Create New Tag
@@ -114,12 +206,13 @@ def create_new_tag():
 
 @tag_bp.route('/api/tags/<tag_id>', methods=['DELETE'])
 @inject_identity
-@jwt_required()
+@require_permission(TAG_RESOURCE_NAME, 'update')
 def delete_existing_tag(tag_id):
     """
     Delete Tag
 
-    Deletes a tag by its ID.
+    Deletes one of the organization's tags by its ID, removing it from every user group.
+    Requires permission to update user groups.
 
     Args:
         tag_id (str): ID of the tag to delete.
@@ -133,7 +226,7 @@ def delete_existing_tag(tag_id):
             }
     """
     try:
-        success = delete_tag(tag_id)
+        success = delete_tag(g.org_id, tag_id)
         if success:
             return create_response(data=None, message="Tag deleted successfully", status=200)
         return create_response(data=None, message=f"Tag with ID {tag_id} not found", status=404)
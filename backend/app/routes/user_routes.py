@@ -1,12 +1,14 @@
 # user_routes.py
 from flask import Blueprint, request, jsonify, make_response, current_app, g
-from flask_jwt_extended import jwt_required, unset_jwt_cookies
+from flask_jwt_extended import unset_jwt_cookies, get_jwt, decode_token
 from app.utils.jwt_utils import create_jwt_token, set_tokens_in_cookies
 from marshmallow import ValidationError
 from app.schemas.user_schemas import ForgotPasswordSchema, LoginSchema
 from app.services.user_service import user_service_login, user_service_logout, user_service_forgotpassword
 from app.utils.response_utils import create_response
 from app.utils.auth_decorators import inject_identity
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils.login_throttle import LoginThrottled
 
 user_bp = Blueprint('user_bp', __name__)
 
@@ -33,7 +35,7 @@ def login():
         data = schema.load(request.json)
         
         # Perform login
-        success, user_data, message = user_service_login(data['userId'], data['password'])
+        success, user_data, message = user_service_login(data['userId'], data['password'], request.remote_addr)
 
         if success:
             token_response = create_jwt_token(user_data["org_id"], user_data["id"])
@@ -51,6 +53,23 @@ def login():
     except ValidationError as ve:
         current_app.logger.error(f"ValueError: {str(ve)}")
         return create_response(data=None, message="Invalid credentials format", status=400)
+
+    except LoginThrottled as throttled:
+        return create_response(
+            data=None,
+            message="Too many failed logins. Please retry later.",
+            status=429,
+            headers={"Retry-After": str(throttled.retry_after)}
+        )
+
+    except PasswordHasherBusy as busy:
+        current_app.security_logger.warning("Login rejected: password hashing pool is full")
+        return create_response(
+            data=None,
+            message="Too many logins in progress. Please retry shortly.",
+            status=503,
+            headers={"Retry-After": str(busy.retry_after)}
+        )
     
     except Exception as e:
         current_app.logger.error(f"Unhandled exception: {str(e)}")
@@ -58,10 +77,10 @@ def login():
 
 @user_bp.route('/api/logout', methods=['POST'])
 @inject_identity
-@jwt_required()
 def logout():
     """
-        Logout user from system. Cookies are cleared.
+        Logout user from system. The access token (and the refresh token, if sent)
+        is revoked and cookies are cleared.
         Args:
             None
         Response:
@@ -72,9 +91,16 @@ def logout():
             }    """
     try:
         user_id = g.user_id
-        
+        tokens = [get_jwt()]
+        refresh_token = request.cookies.get(current_app.config["JWT_REFRESH_COOKIE_NAME"])
+        if refresh_token:
+            try:
+                tokens.append(decode_token(refresh_token, allow_expired=True))
+            except Exception as e:
+                current_app.security_logger.warning(f"Ignoring invalid refresh token at logout: {str(e)}")
+
         # Call the service to log out the user
-        if not user_service_logout(user_id):
+        if not user_service_logout(user_id, tokens):
             raise Exception("Logout failed. Unable to clear user session.")
         
         # Create a successful logout response
@@ -130,7 +156,6 @@ def forgot_password():
 
 @user_bp.route('/api/session', methods=['GET'])
 @inject_identity
-@jwt_required()
 def get_session():
     """
     Get User Session
@@ -1,25 +1,35 @@
-from flask import Blueprint, request, current_app, g
-from flask_jwt_extended import jwt_required
+import os
+import uuid
+from flask import Blueprint, Response, request, current_app, g, stream_with_context
 from marshmallow import ValidationError
-from app.utils.response_utils import create_response
-from app.utils.auth_decorators import inject_identity
+from app.utils.response_utils import create_response, is_not_modified, create_not_modified_response
+from app.utils.auth_decorators import inject_identity, require_permission
 from app.services.usergroup_service import (
+    RESOURCE_NAME,
+    COUNT_MODES,
+    TAG_MATCH_MODES,
     get_user_groups,
+    get_user_groups_by_cursor,
+    get_member_user_groups,
     get_user_group_by_id,
+    get_user_group_etag,
+    export_user_groups,
+    import_group_members,
     # get_students_by_user_group,
     create_user_group,
     update_user_group,
     delete_user_group,
     mass_update_group_status,
-    mass_delete_groups,
+    mass_delete_groups as mass_delete_groups_service,
+    validate_group_ids,
 )
-from app.utils.pagination_utils import get_pagination_params
+from app.utils.pagination_utils import get_pagination_params, get_cursor_params
 
 usergroup_bp = Blueprint("usergroup_bp", __name__)
 
 @usergroup_bp.route("/api/usergroups", methods=["GET"])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "read")
 def get_usergroups():
     """
     Get User Groups
@@ -28,9 +38,15 @@ def get_usergroups():
 
     Query Parameters:
         - search: Filter by search term.
-        - tags: Filter by tags.
+        - tags: Filter by tags (comma-separated names).
+        - match: "any" (default) - groups with any of the tags; "all" - groups with every tag.
         - page: Page number for pagination.
         - per_page: Number of records per page.
+        - count: "exact" (default) or "estimate" - a bounded count that may return
+          an approximate totalRows with "exact": false for very large results.
+        - pagination: "offset" (default) or "cursor" for keyset pagination.
+        - cursor: `next`/`prev` value from a previous cursor-mode page (implies cursor mode).
+        - sort: Cursor-mode sort key, "title" (default) or "created_at".
 
     Returns:
         Response:
@@ -40,21 +56,76 @@ def get_usergroups():
                     "pageInfo": {
                         "currentPage": ...,
                         "rowsPerPage": ...,
-                        "totalRows": ...
+                        "totalRows": ...,
+                        "exact": true
                     }
                 },
                 "message": "User groups fetched successfully",
                 "status": 200
             }
+        In cursor mode pageInfo is {"rowsPerPage": ..., "next": <cursor or null>, "prev": <cursor or null>}.
     """
     try:
         user_id = g.user_id
         org_id = g.org_id
         search_term = request.args.get("search")
         tags = request.args.get("tags")
-        page, per_page = get_pagination_params(request)
+        match = request.args.get("match", "any")
+        if match not in TAG_MATCH_MODES:
+            return create_response(data=None, message=f"Unsupported tag match mode: {match}", status=400)
+
+        if request.args.get("pagination") == "cursor" or request.args.get("cursor"):
+            params = get_cursor_params()
+            try:
+                result = get_user_groups_by_cursor(
+                    org_id, user_id, search_term, tags, params["cursor"], params["per_page"], params["sort"], match
+                )
+            except ValueError as ve:
+                return create_response(data=None, message=str(ve), status=400)
+        else:
+            params = get_pagination_params()
+            count_mode = request.args.get("count", "exact")
+            if count_mode not in COUNT_MODES:
+                return create_response(data=None, message=f"Unsupported count mode: {count_mode}", status=400)
+            result = get_user_groups(
+                org_id, user_id, search_term, tags, params["page"], params["per_page"], count_mode, match
+            )
+
+        return create_response(
+            data=result,
+            message="User groups fetched successfully",
+            status=200,
+        )
+    except Exception as e:
+        raise Exception(f"Error fetching user groups: {str(e)}")
+
 
-        result = get_user_groups(org_id, user_id, search_term, tags, page, per_page)
+@usergroup_bp.route("/api/me/usergroups", methods=["GET"])
+@inject_identity
+def get_my_usergroups():
+    """
+    Get My User Groups
+
+    Retrieves a paginated list, ordered by title, of the user groups the logged-in user belongs to.
+
+    Query Parameters:
+        - page: Page number for pagination.
+        - per_page: Number of records per page.
+
+    Returns:
+        Response:
+            {
+                "data": {
+                    "rows": [...],
+                    "pageInfo": {"currentPage": ..., "rowsPerPage": ..., "totalRows": ...}
+                },
+                "message": "User groups fetched successfully",
+                "status": 200
+            }
+    """
+    try:
+        params = get_pagination_params()
+        result = get_member_user_groups(g.org_id, g.user_id, params["page"], params["per_page"])
 
         return create_response(
             data=result,
@@ -65,9 +136,53 @@ def get_usergroups():
         raise Exception(f"Error fetching user groups: {str(e)}")
 
 
+@usergroup_bp.route("/api/usergroups/export", methods=["GET"])
+@inject_identity
+@require_permission(RESOURCE_NAME, "read")
+def export_usergroups():
+    """
+    Export User Groups
+
+    Streams every user group of the organization matching the filters, as a file download.
+
+    Query Parameters:
+        - format: "csv" (default) or "ndjson" (one JSON object per line).
+        - search, tags, match: Same filters as GET /api/usergroups.
+        - include_students: Add each group's students (true/false).
+        - include_tags: Add each group's tags (true/false).
+
+    Returns:
+        Response: text/csv or application/x-ndjson body, streamed in batches;
+                  400 for an unsupported format or match mode.
+    """
+    try:
+        user_id = g.user_id
+        org_id = g.org_id
+        export_format = request.args.get("format", "csv")
+        include_students = request.args.get("include_students", "false").lower() == "true"
+        include_tags = request.args.get("include_tags", "false").lower() == "true"
+
+        try:
+            chunks = export_user_groups(
+                org_id, user_id, request.args.get("search"), request.args.get("tags"),
+                request.args.get("match", "any"), export_format, include_students, include_tags,
+            )
+        except ValueError as ve:
+            return create_response(data=None, message=str(ve), status=400)
+
+        mimetype = "text/csv" if export_format == "csv" else "application/x-ndjson"
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="usergroups.{export_format}"'},
+        )
+    except Exception as e:
+        raise Exception(f"Error exporting user groups: {str(e)}")
+
+
 @usergroup_bp.route("/api/usergroups/<usergroup_id>", methods=["GET"])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "read")
 def get_usergroup_by_id(usergroup_id):
     """
     Get User Group by ID
@@ -85,6 +200,7 @@ def get_usergroup_by_id(usergroup_id):
                 "message": "User group fetched successfully",
                 "status": 200
             }
+        Carries an ETag and Last-Modified; a matching If-None-Match is answered with 304.
     """
     try:
         user_id = g.user_id
@@ -92,6 +208,10 @@ def get_usergroup_by_id(usergroup_id):
         include_students = request.args.get("include_students", "false").lower() == "true"
         include_tags = request.args.get("include_tags", "false").lower() == "true"
 
+        etag, last_modified = get_user_group_etag(org_id, usergroup_id, include_students, include_tags)
+        if etag and is_not_modified(etag):
+            return create_not_modified_response(etag, last_modified)
+
         result = get_user_group_by_id(org_id, user_id, usergroup_id, include_students, include_tags)
 
         if not result:
@@ -104,6 +224,8 @@ def get_usergroup_by_id(usergroup_id):
             data=result,
             message="User group fetched successfully",
             status=200,
+            etag=etag,
+            last_modified=last_modified,
         )
     except Exception as e:
         raise Exception(f"Error fetching user group: {str(e)}")
@@ -111,7 +233,7 @@ def get_usergroup_by_id(usergroup_id):
 
 @usergroup_bp.route("/api/usergroups", methods=["POST"])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "create")
 def create_usergroup():
     """
     Create User Group
@@ -150,9 +272,65 @@ def create_usergroup():
         raise Exception(f"Error creating user group: {str(e)}")
 
 
+@usergroup_bp.route("/api/usergroups/members/import", methods=["POST"])
+@inject_identity
+@require_permission(RESOURCE_NAME, "update")
+def import_usergroup_members():
+    """
+    Import User Group Members
+
+    Adds students to user groups from an uploaded CSV (multipart field "file",
+    at most MAX_CONTENT_LENGTH bytes) with a header row and columns:
+
+        group,email
+        <user group id>,<student email>
+
+    Returns:
+        Response:
+            {
+                "data": {
+                    "imported": 120,
+                    "skipped": 3,
+                    "errorCount": 1,
+                    "errors": [{"row": 7, "group": "...", "email": "...", "error": "Unknown email: ..."}]
+                },
+                "message": "Imported 120 memberships; 3 skipped, 1 rows with errors.",
+                "status": 200
+            }
+        400 if the file is missing, not UTF-8 text or lacks the required columns.
+    """
+    try:
+        user_id = g.user_id
+        org_id = g.org_id
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            return create_response(data=None, message="A CSV file is required in the 'file' field.", status=400)
+
+        # Spool to UPLOAD_FOLDER and parse from disk, so the upload never sits in memory whole
+        upload_folder = current_app.config["UPLOAD_FOLDER"]
+        os.makedirs(upload_folder, exist_ok=True)
+        path = os.path.join(upload_folder, f"member-import-{uuid.uuid4().hex}.csv")
+        upload.save(path)
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as csv_file:
+                result = import_group_members(org_id, user_id, csv_file)
+        except ValueError as ve:
+            return create_response(data=None, message=str(ve), status=400)
+        finally:
+            os.remove(path)
+
+        return create_response(
+            data=result['data'],
+            message=result['message'],
+            status=200 if result['success'] else 500,
+        )
+    except Exception as e:
+        raise Exception(f"Error importing user group members: {str(e)}")
+
+
 @usergroup_bp.route("/api/usergroups/<usergroup_id>", methods=["PUT"])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "update")
 def update_usergroup(usergroup_id):
     """
     Update User Group
@@ -199,7 +377,7 @@ def update_usergroup(usergroup_id):
 
 @usergroup_bp.route("/api/usergroups/<usergroup_id>", methods=["DELETE"])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "delete")
 def delete_usergroup(usergroup_id):
     """
     Delete User Group
@@ -232,7 +410,7 @@ def delete_usergroup(usergroup_id):
 
 @usergroup_bp.route('/api/massUpdateGroupStatus', methods=['PUT'])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "update")
 def mass_update_groups():
     """
     Mass Update User Group Status
@@ -248,28 +426,32 @@ def mass_update_groups():
     Returns:
         Response:
             {
-                "data": null,
-                "message": "User group statuses updated successfully",
+                "data": {"updated_count": 3},
+                "message": "Successfully updated the status of 3 user groups.",
                 "status": 200
             }
+        400 if groupIds is not a non-empty list of ids or none of the groups exist in the organization.
     """
     try:
         user_id = g.user_id
         org_id = g.org_id
         data = request.get_json()
 
-        if not data or not isinstance(data.get("groupIds"), list) or not data.get("status"):
-            raise ValidationError("Invalid request payload. 'groupIds' must be a list and 'status' is required.")
+        if not isinstance(data, dict) or not data.get("status"):
+            raise ValidationError("Invalid request payload. 'status' is required.")
+        try:
+            group_ids = validate_group_ids(data.get("groupIds"))
+        except ValueError as ve:
+            return create_response(data=None, message=str(ve), status=400)
 
-        group_ids = data.get("groupIds")
         new_status = data.get("status")
 
-        success_message = mass_status_update_groups(org_id, user_id, group_ids, new_status)
+        result = mass_update_group_status(org_id, user_id, group_ids, new_status)
 
         return create_response(
-            data=None,
-            message=success_message,
-            status=200,
+            data=result['data'],
+            message=result['message'],
+            status=200 if result['success'] else 400,
         )
     except ValidationError as ve:
         raise ve
@@ -281,7 +463,7 @@ def mass_update_groups():
 
 @usergroup_bp.route('/api/massDeleteGroups', methods=['POST'])
 @inject_identity
-@jwt_required()
+@require_permission(RESOURCE_NAME, "delete")
 def mass_delete_groups():
     """
     Mass Delete User Groups
@@ -296,27 +478,36 @@ def mass_delete_groups():
     Returns:
         Response:
             {
-                "data": null,
-                "message": "User groups deleted successfully",
+                "data": {"deleted_count": 3},
+                "message": "Successfully deleted 3 user groups.",
                 "status": 200
             }
+        400 if groupIds is not a non-empty list of ids or none of the groups exist in the organization.
+        500 with {"deleted_count": ..., "failedIds": [...]} if some groups could not be deleted;
+        the others stay deleted.
     """
     try:
         user_id = g.user_id
         org_id = g.org_id
         data = request.get_json()
 
-        if not data or not isinstance(data.get("groupIds"), list):
-            raise ValidationError("Invalid request payload. 'groupIds' must be a list.")
-
-        group_ids = data.get("groupIds")
+        if not isinstance(data, dict):
+            raise ValidationError("Invalid request payload. A JSON object is required.")
+        try:
+            group_ids = validate_group_ids(data.get("groupIds"))
+        except ValueError as ve:
+            return create_response(data=None, message=str(ve), status=400)
 
-        success_message = mass_delete_groups(org_id, user_id, group_ids)
+        result = mass_delete_groups_service(org_id, user_id, group_ids)
 
+        if result['success']:
+            status = 200
+        else:
+            status = 500 if result['data'] and result['data'].get('failedIds') else 400
         return create_response(
-            data=None,
-            message=success_message,
-            status=200,
+            data=result['data'],
+            message=result['message'],
+            status=status,
         )
     except ValidationError as ve:
         raise ve
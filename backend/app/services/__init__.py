@@ -6,6 +6,7 @@ from .quiz_service import get_open_quizzes, create_quiz_service
 from .tag_service import get_tags_by_resource, get_tags_by_user_group, create_tag, delete_tag
 from .usergroup_service import (
     get_user_groups,
+    get_user_groups_by_cursor,
     get_user_group_by_id,
     create_user_group,
     update_user_group,
@@ -26,6 +27,7 @@ __all__ = [
     "create_tag",
     "delete_tag",
     "get_user_groups",
+    "get_user_groups_by_cursor",
     "get_user_group_by_id",
     "create_user_group",
     "update_user_group",
@@ -1,6 +1,11 @@
 from flask import current_app
+from sqlalchemy import select, delete
+from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
-from app.models import SecurityRole, Authorization, Resource, Action, user_securityroles, securityrole_authorizations
+from app.models import user_effective_permission, user_securityroles, securityrole_authorizations
+from app.services.effective_permission_service import refresh_users, refresh_roles
+from app.utils.permission_cache import get_permission_version, permission_catalog, mark_effective_permissions_refreshed
+from app.utils.response_utils import compute_etag
 
 def get_user_authorizations(user_id, org_id, resources=None):
     """
@@ -9,52 +14,171 @@ def get_user_authorizations(user_id, org_id, resources=None):
     Args:
         user_id (str): ID of the logged-in user.
         org_id (str): ID of the organization the user belongs to.
-        resources (list, optional): List of resource names to filter the authorizations (e.g., ['StudentGroup', 'Quiz']).
+        resources (list or str, optional): Resource names to filter the authorizations (e.g., ['StudentGroup', 'Quiz']
+            or "StudentGroup,Quiz").
 
     Returns:
         dict: Dictionary with resources as keys and authorization actions as values.
     """
     try:
-        # Fetch the user's roles, explicitly joining the user_securityroles table
-        roles = (
-            db.session.query(SecurityRole)
-            .join(user_securityroles, user_securityroles.c.securityrole_id == SecurityRole.id)
-            .filter(user_securityroles.c.user_id == user_id, SecurityRole.org_id == org_id)
-            .all()
-        )
+        if isinstance(resources, str):
+            resources = [name.strip() for name in resources.split(',') if name.strip()]
 
-        # Fetch the list of resources (filter by provided resources if any)
-        if resources:
-            resource_records = Resource.query.filter(Resource.name.in_(resources)).all()
-        else:
-            resource_records = Resource.query.all()
-
-        # Prepare the result dictionary
-        result = {}
-
-        # Loop through each resource and determine the user's actions (permissions)
-        for resource in resource_records:
-            resource_permissions = {}
-
-            # Fetch authorizations for each resource based on the user's roles
-            authorizations = (
-                Authorization.query
-                .join(securityrole_authorizations, securityrole_authorizations.c.authorization_id == Authorization.id)
-                .join(SecurityRole, SecurityRole.id == securityrole_authorizations.c.securityrole_id)
-                .filter(SecurityRole.id.in_([role.id for role in roles]), Authorization.resource_id == resource.id)
-                .all()
-            )
+        catalog = permission_catalog.ensure_loaded()
+        resource_ids = {
+            name: resource_id for name, resource_id in catalog.resources.items()
+            if not resources or name in resources
+        }
+        resource_names = {resource_id: name for name, resource_id in resource_ids.items()}
+        action_names = {action_id: name for name, action_id in catalog.actions.items()}
 
-            for auth in authorizations:
-                #action = db.session.get(auth.action_id)
-                action = db.session.get(Action, auth.action_id)
-                resource_permissions[action.name] = True
+        # One read of the user's user_effective_permission index range
+        query = select(user_effective_permission.c.resource_id, user_effective_permission.c.action_id).where(
+            user_effective_permission.c.org_id == org_id,
+            user_effective_permission.c.user_id == user_id,
+        )
+        if resources:
+            query = query.where(user_effective_permission.c.resource_id.in_(list(resource_ids.values())))
 
-            # Add the resource's permissions to the result
-            result[resource.name] = resource_permissions
+        result = {name: {} for name in sorted(resource_ids)}
+        for resource_id, action_id in db.session.execute(query):
+            if resource_id in resource_names and action_id in action_names:
+                result[resource_names[resource_id]][action_names[action_id]] = True
 
         return result
     except Exception as e:
         # Log the error and re-raise it to be handled by the caller
         current_app.logger.error(f"Error in get_user_authorizations: {str(e)}")
         raise
+
+
+def get_user_authorizations_etag(user_id, org_id, resources=None):
+    """
+    Builds the ETag for a user's authorization map without querying the database.
+
+    The user's permission version changes whenever their effective permissions do and
+    the catalog layout whenever a resource or action is added or renamed, so the tag is
+    stable exactly as long as the map returned by get_user_authorizations.
+
+    Returns:
+        str: Strong ETag value (unquoted), or None if the permission version is unavailable.
+    """
+    version = get_permission_version(user_id)
+    if version is None:
+        return None
+    layout = permission_catalog.ensure_loaded().layout
+    return compute_etag('authorizations', org_id, user_id, layout.version, version, resources or '*')
+
+
+def _write_grants(write, refresh, description):
+    """
+    Runs `write(conn)` and `refresh(conn)` in one transaction and commits, so
+    user_effective_permission never disagrees with the role tables.
+
+    Returns:
+        int: The row count returned by `write`.
+    """
+    try:
+        conn = db.session.connection()
+        mark_effective_permissions_refreshed(conn)
+        count = write(conn)
+        if count:
+            refresh(conn)
+        db.session.commit()
+        return count
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"{description} error: {str(e)}")
+        raise
+
+
+def assign_user_roles(org_id, user_id, securityrole_ids, created_by):
+    """
+    Assigns the organization's roles to a user (already assigned roles are skipped)
+    and refreshes the user's effective permissions.
+
+    Returns:
+        int: Number of roles newly assigned.
+    """
+    def write(conn):
+        assigned = set(conn.execute(
+            select(user_securityroles.c.securityrole_id)
+            .where(user_securityroles.c.org_id == org_id, user_securityroles.c.user_id == user_id)
+        ).scalars())
+        rows = [
+            {'org_id': org_id, 'user_id': user_id, 'securityrole_id': securityrole_id, 'created_by': created_by}
+            for securityrole_id in dict.fromkeys(securityrole_ids) if securityrole_id not in assigned
+        ]
+        if rows:
+            conn.execute(user_securityroles.insert(), rows)
+        return len(rows)
+
+    return _write_grants(write, lambda conn: refresh_users(conn, org_id, [user_id]), 'assign_user_roles')
+
+
+def remove_user_roles(org_id, user_id, securityrole_ids=None):
+    """
+    Removes the given roles (all of them when None) from a user in the organization
+    and refreshes the user's effective permissions.
+
+    Returns:
+        int: Number of role assignments removed.
+    """
+    def write(conn):
+        statement = delete(user_securityroles).where(
+            user_securityroles.c.org_id == org_id, user_securityroles.c.user_id == user_id
+        )
+        if securityrole_ids is not None:
+            statement = statement.where(user_securityroles.c.securityrole_id.in_(list(securityrole_ids)))
+        return conn.execute(statement).rowcount
+
+    return _write_grants(write, lambda conn: refresh_users(conn, org_id, [user_id]), 'remove_user_roles')
+
+
+def grant_role_authorizations(org_id, securityrole_id, authorization_ids, created_by):
+    """
+    Grants authorizations to one of the organization's roles (already granted ones are
+    skipped) and refreshes the effective permissions of the role's users.
+
+    Returns:
+        int: Number of authorizations newly granted.
+    """
+    def write(conn):
+        granted = set(conn.execute(
+            select(securityrole_authorizations.c.authorization_id).where(
+                securityrole_authorizations.c.org_id == org_id,
+                securityrole_authorizations.c.securityrole_id == securityrole_id,
+            )
+        ).scalars())
+        rows = [
+            {'org_id': org_id, 'securityrole_id': securityrole_id, 'authorization_id': authorization_id,
+             'created_by': created_by}
+            for authorization_id in dict.fromkeys(authorization_ids) if authorization_id not in granted
+        ]
+        if rows:
+            conn.execute(securityrole_authorizations.insert(), rows)
+        return len(rows)
+
+    return _write_grants(write, lambda conn: refresh_roles(conn, org_id, [securityrole_id]),
+                         'grant_role_authorizations')
+
+
+def revoke_role_authorizations(org_id, securityrole_id, authorization_ids=None):
+    """
+    Revokes the given authorizations (all of them when None) from one of the
+    organization's roles and refreshes the effective permissions of the role's users.
+
+    Returns:
+        int: Number of authorizations revoked.
+    """
+    def write(conn):
+        statement = delete(securityrole_authorizations).where(
+            securityrole_authorizations.c.org_id == org_id,
+            securityrole_authorizations.c.securityrole_id == securityrole_id,
+        )
+        if authorization_ids is not None:
+            statement = statement.where(securityrole_authorizations.c.authorization_id.in_(list(authorization_ids)))
+        return conn.execute(statement).rowcount
+
+    return _write_grants(write, lambda conn: refresh_roles(conn, org_id, [securityrole_id]),
+                         'revoke_role_authorizations')
@@ -0,0 +1,190 @@
+from flask import current_app
+from sqlalchemy import select, delete, update, and_, exists, union
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models import Authorization, User, user_securityroles, securityrole_authorizations, user_effective_permission
+from app.utils.permission_cache import (
+    mark_permission_versions_changed,
+    mark_effective_permissions_refreshed,
+    stale_organizations,
+)
+
+# IN-list size when bumping permission versions, kept below SQLite's bound-parameter limit
+VERSION_BUMP_CHUNK_SIZE = 500
+
+# user_effective_permission is derived from user_securityroles -> securityrole_authorizations
+# -> authorization. The role services in authorization_service refresh the affected users in
+# the same transaction; after writing those tables any other way, run rebuild_effective_permissions
+# (`flask rebuild-permissions`). Such writes are also detected when they commit (permission_cache)
+# and their organizations rebuilt at the end of the request.
+
+
+def _grants_select():
+    """
+    SELECT DISTINCT org_id, user_id, resource_id, action_id for every role grant.
+    """
+    authorization = Authorization.__table__
+    return (
+        select(
+            user_securityroles.c.org_id,
+            user_securityroles.c.user_id,
+            authorization.c.resource_id,
+            authorization.c.action_id,
+        )
+        .select_from(user_securityroles)
+        .join(securityrole_authorizations, and_(
+            securityrole_authorizations.c.securityrole_id == user_securityroles.c.securityrole_id,
+            securityrole_authorizations.c.org_id == user_securityroles.c.org_id,
+        ))
+        .join(authorization, authorization.c.id == securityrole_authorizations.c.authorization_id)
+        .distinct()
+    )
+
+
+def _insert_grants(conn, grants):
+    columns = ['org_id', 'user_id', 'resource_id', 'action_id']
+    conn.execute(user_effective_permission.insert().from_select(columns, grants))
+
+
+def _bump_permission_versions(conn, user_ids):
+    """
+    Increments the users' permission_version so JWT claims issued before this transaction
+    are recognised as stale. updated_at is left alone: it reflects profile edits.
+    """
+    user = User.__table__
+    user_ids = list(dict.fromkeys(user_ids))
+    for start in range(0, len(user_ids), VERSION_BUMP_CHUNK_SIZE):
+        conn.execute(
+            update(user)
+            .where(user.c.id.in_(user_ids[start:start + VERSION_BUMP_CHUNK_SIZE]))
+            .values(permission_version=user.c.permission_version + 1, updated_at=user.c.updated_at)
+        )
+    mark_permission_versions_changed(conn, user_ids)
+
+
+def refresh_users(conn, org_id, user_ids):
+    """
+    Recomputes the organization's effective permissions of the given users.
+
+    Args:
+        conn (Connection): Connection of the transaction that changed their grants.
+        org_id (str): ID of the organization the grants belong to.
+        user_ids (iterable): IDs of the affected users.
+    """
+    user_ids = list(user_ids)
+    conn.execute(delete(user_effective_permission).where(
+        user_effective_permission.c.org_id == org_id, user_effective_permission.c.user_id.in_(user_ids)
+    ))
+    _insert_grants(conn, _grants_select().where(
+        user_securityroles.c.org_id == org_id, user_securityroles.c.user_id.in_(user_ids)
+    ))
+    _bump_permission_versions(conn, user_ids)
+
+
+def refresh_roles(conn, org_id, securityrole_ids):
+    """
+    Recomputes the effective permissions of every user holding one of the organization's given roles.
+    """
+    user_ids = conn.execute(
+        select(user_securityroles.c.user_id.distinct()).where(
+            user_securityroles.c.org_id == org_id,
+            user_securityroles.c.securityrole_id.in_(list(securityrole_ids)),
+        )
+    ).scalars().all()
+    if user_ids:
+        refresh_users(conn, org_id, user_ids)
+
+
+def rebuild_effective_permissions(org_id=None, conn=None):
+    """
+    Rebuilds user_effective_permission from the role tables, for one organization or all.
+
+    Args:
+        org_id (str, optional): Restrict the rebuild to this organization.
+        conn (Connection, optional): Connection to use; defaults to the session's, committed here.
+
+    Returns:
+        int: Number of effective permission rows after the rebuild.
+    """
+    own_transaction = conn is None
+    if own_transaction:
+        conn = db.session.connection()
+    mark_effective_permissions_refreshed(conn)
+
+    clear = delete(user_effective_permission)
+    grants = _grants_select()
+    # Users holding permissions before or after the rebuild
+    had_permissions = select(user_effective_permission.c.user_id)
+    have_roles = select(user_securityroles.c.user_id)
+    if org_id:
+        clear = clear.where(user_effective_permission.c.org_id == org_id)
+        grants = grants.where(user_securityroles.c.org_id == org_id)
+        had_permissions = had_permissions.where(user_effective_permission.c.org_id == org_id)
+        have_roles = have_roles.where(user_securityroles.c.org_id == org_id)
+    affected_user_ids = conn.execute(union(had_permissions, have_roles)).scalars().all()
+    conn.execute(clear)
+    _insert_grants(conn, grants)
+    _bump_permission_versions(conn, affected_user_ids)
+
+    count_query = select(db.func.count()).select_from(user_effective_permission)
+    if org_id:
+        count_query = count_query.where(user_effective_permission.c.org_id == org_id)
+    count = conn.execute(count_query).scalar()
+
+    if own_transaction:
+        db.session.commit()
+    stale_organizations.discard(org_id)
+    return count
+
+
+def rebuild_stale_effective_permissions(response=None):
+    """
+    after_request hook: rebuilds the organizations whose role tables were written without
+    a refresh (see permission_cache.stale_organizations). Failures are logged and retried
+    after the next request.
+    """
+    if not stale_organizations:
+        return response
+    org_ids = stale_organizations.take()
+    # Whatever the request left uncommitted would be rolled back at teardown anyway
+    db.session.rollback()
+    for org_id in ([None] if None in org_ids else sorted(org_ids)):
+        try:
+            count = rebuild_effective_permissions(org_id)
+            current_app.logger.warning(f'Rebuilt user_effective_permission for org {org_id or "(all)"}: {count} rows.')
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            stale_organizations.add({org_id})
+            current_app.logger.error(f'Rebuilding user_effective_permission for org {org_id} failed: {e}')
+    return response
+
+
+def init_effective_permissions(app):
+    """
+    Backfills user_effective_permission at startup when it is empty but roles are assigned
+    (a database created before the table existed, or seeded without the role services), and
+    registers the hook rebuilding organizations whose role tables were written directly.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        None
+    """
+    if rebuild_stale_effective_permissions not in app.after_request_funcs.get(None, []):
+        app.after_request(rebuild_stale_effective_permissions)
+    with app.app_context():
+        try:
+            if db.session.scalar(select(exists(select(user_effective_permission.c.user_id)))):
+                return
+            if not db.session.scalar(select(exists(select(user_securityroles.c.user_id)))):
+                return
+            count = rebuild_effective_permissions()
+            current_app.logger.warning(f'Backfilled user_effective_permission: {count} rows.')
+        except SQLAlchemyError as e:
+            # Tables may not exist yet (fresh database, migrations pending), or another
+            # worker backfilled concurrently
+            db.session.rollback()
+            current_app.logger.debug(f'user_effective_permission not backfilled at startup: {e}')
+        finally:
+            db.session.remove()
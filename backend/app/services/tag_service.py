@@ -2,7 +2,22 @@ from app.extensions import db
 from flask import current_app
 from app.models.usergroup_models import UserGroup, usergroup_tag
 from app.models.tag_models import Tag
+from sqlalchemy import select, delete, update, func
 from sqlalchemy.exc import SQLAlchemyError
+from app.utils.serialization_utils import serialize_rows
+from app.utils.response_utils import compute_etag
+from app.utils.tag_index import OrgTagIndex, tag_index_cache, get_tag_generation, bump_tag_generation
+from app.services.usergroup_service import (
+    bump_usergroup_generation,
+    invalidate_tag_id_map,
+    touch_user_groups,
+)
+
+# Columns of a tag in a user group's tag list, in serialized order
+TAG_FIELDS = ('id', 'name', 'created_at', 'updated_at')
+# Columns of a standalone tag (serialize_tags), in serialized order
+TAG_DETAIL_FIELDS = ('id', 'resource_id', 'name', 'created_at', 'updated_at')
+TAG_DATE_FIELDS = ('created_at', 'updated_at')
 
 def get_tags_by_resource(resource_id):
     """
@@ -39,23 +54,15 @@ def get_tags_by_user_group(org_id, user_id, group_id):
             current_app.app_logger.warning(f"User group {group_id} not found in org {org_id}")
             return []
 
-        # Fetch all associated tags for the user group using the many-to-many relationship
-        tags = (
-            Tag.query.join(usergroup_tag, Tag.id == usergroup_tag.c.tag_id)
+        # Fetch the serialized columns of the associated tags through usergroup_tag
+        tag_rows = db.session.execute(
+            select(Tag.id, Tag.name, Tag.created_at, Tag.updated_at)
+            .join(usergroup_tag, Tag.id == usergroup_tag.c.tag_id)
             .filter(usergroup_tag.c.usergroup_id == group_id)
-            .all()
-        )
+        ).all()
 
         # Serialize the tags for response
-        serialized_tags = [
-            {
-                "id": tag.id,
-                "name": tag.name,
-                "created_at": tag.created_at.strftime('%Y-%m-%d'),
-                "updated_at": tag.updated_at.strftime('%Y-%m-%d'),
-            }
-            for tag in tags
-        ]
+        serialized_tags = serialize_rows(tag_rows, TAG_FIELDS, TAG_DATE_FIELDS)
 
         current_app.app_logger.info(f"Fetched {len(serialized_tags)} tags for group {group_id} in org {org_id}")
         return serialized_tags
@@ -69,6 +76,129 @@ def get_tags_by_user_group(org_id, user_id, group_id):
         current_app.app_logger.error(f"Unexpected error fetching tags for group {group_id}: {e}")
         return []
 
+def get_user_group_tags_etag(org_id, group_id):
+    """
+    Builds the ETag and Last-Modified of a user group's tag list from its revision,
+    with one single-row SELECT.
+
+    Returns:
+        tuple: (ETag value (unquoted), Last-Modified datetime), or (None, None) if
+               the group does not exist in the organization.
+    """
+    row = db.session.execute(
+        select(UserGroup.updated_at, UserGroup.revision).where(UserGroup.org_id == org_id, UserGroup.id == group_id)
+    ).first()
+    if row is None:
+        return None, None
+    return compute_etag('usergroup-tags', org_id, group_id, row.revision, row.updated_at), row.updated_at
+
+def _load_tag_index(org_id, generation):
+    """Builds the organization's tag prefix index, ranked by Tag.usage_count, in one query."""
+    rows = db.session.execute(
+        select(Tag.id, Tag.name, Tag.usage_count).where(Tag.org_id == org_id)
+    ).all()
+    return OrgTagIndex(generation, rows)
+
+def get_popular_tags(org_id, limit=10):
+    """
+    Lists the organization's most used tags from the denormalized usage counters,
+    read in (org_id, usage_count) index order without touching usergroup_tag.
+
+    Args:
+        org_id (str): ID of the organization.
+        limit (int, optional): Maximum number of tags. Defaults to 10.
+
+    Returns:
+        list: [{"id": ..., "name": ..., "usage": ...}], or None on a database error.
+    """
+    try:
+        rows = db.session.execute(
+            select(Tag.id, Tag.name, Tag.usage_count)
+            .where(Tag.org_id == org_id, Tag.usage_count > 0)
+            .order_by(Tag.usage_count.desc(), Tag.name)
+            .limit(limit)
+        ).all()
+        return [{'id': tag_id, 'name': name, 'usage': usage} for tag_id, name, usage in rows]
+    except SQLAlchemyError as e:
+        current_app.app_logger.error(f"get_popular_tags error: {str(e)}")
+        return None
+
+def reconcile_tag_usage(org_id=None):
+    """
+    Repairs Tag.usage_count wherever it drifted from the usergroup_tag rows (e.g. after
+    writes that bypassed the service layer), with one set-based UPDATE.
+
+    Args:
+        org_id (str, optional): Only reconcile this organization's tags.
+
+    Returns:
+        int: Number of tags whose count was corrected.
+    """
+    tag_table = Tag.__table__
+    actual = select(func.count()).select_from(usergroup_tag).where(
+        usergroup_tag.c.org_id == tag_table.c.org_id, usergroup_tag.c.tag_id == tag_table.c.id
+    ).scalar_subquery()
+    drifted = [tag_table.c.usage_count != actual]
+    if org_id is not None:
+        drifted.append(tag_table.c.org_id == org_id)
+
+    try:
+        org_ids = db.session.scalars(select(tag_table.c.org_id).where(*drifted).distinct()).all()
+        if not org_ids:
+            return 0
+        result = db.session.execute(update(tag_table).where(*drifted).values(usage_count=actual))
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.app_logger.error(f"reconcile_tag_usage error: {str(e)}")
+        raise
+    # Suggestion rankings are rebuilt from the corrected counts
+    for drifted_org_id in org_ids:
+        bump_tag_generation(drifted_org_id)
+    current_app.app_logger.warning(f"reconcile_tag_usage: corrected {result.rowcount} tag counts in {len(org_ids)} orgs")
+    return result.rowcount
+
+def suggest_tags(org_id, prefix, limit=10):
+    """
+    Suggests the organization's tags whose names start with `prefix` (case-insensitive),
+    most used (Tag.usage_count) first.
+
+    Served from the in-process prefix index, which is built on first use and whenever
+    the organization's tag generation has moved on (tag or tag-assignment writes by
+    any worker); this worker's own tag creates and deletes update it in place.
+
+    Args:
+        org_id (str): ID of the organization.
+        prefix (str): Typed prefix; '' suggests the most used tags.
+        limit (int, optional): Maximum number of suggestions. Defaults to 10.
+
+    Returns:
+        list: [{"id": ..., "name": ..., "usage": ...}], or None on a database error.
+    """
+    try:
+        generation = get_tag_generation(org_id)
+        # Without a generation (cache down) a cached index cannot be trusted
+        suggestions = None if generation is None else tag_index_cache.suggest(org_id, generation, prefix, limit)
+        if suggestions is None:
+            index = _load_tag_index(org_id, generation)
+            suggestions = index.suggest(prefix, limit)
+            if generation is not None:
+                tag_index_cache.put(org_id, index)
+        return [{'id': tag_id, 'name': name, 'usage': usage} for tag_id, name, usage in suggestions]
+    except SQLAlchemyError as e:
+        current_app.app_logger.error(f"suggest_tags error: {str(e)}")
+        return None
+
+def _after_tag_write(org_id, apply):
+    """
+    Bumps the organization's user group and tag generations after a committed tag
+    write and applies the write to this worker's tag index, so it stays current
+    without a reload.
+    """
+    bump_usergroup_generation(org_id)
+    generation = get_tag_generation(org_id)
+    tag_index_cache.update(org_id, generation, bump_tag_generation(org_id), apply)
+
 def create_tag(resource_id, org_id, name, user_id):
     """Create a new tag for a resource."""
     try:
@@ -81,20 +211,34 @@ def create_tag(resource_id, org_id, name, user_id):
         )
         db.session.add(tag)
         db.session.commit()
+        invalidate_tag_id_map(org_id)
+        tag_id, tag_name = tag.id, tag.name
+        _after_tag_write(org_id, lambda index: index.add(tag_id, tag_name))
         return serialize_tag(tag)
     except SQLAlchemyError as e:
         db.session.rollback()
         current_app.app_logger.error(f"create_tag error: {str(e)}")
         return None
 
-def delete_tag(tag_id):
-    """Delete a tag."""
+def delete_tag(org_id, tag_id):
+    """Delete one of the organization's tags; False if it has no tag `tag_id`."""
     try:
-        tag = Tag.query.get(tag_id)
+        tag = Tag.query.filter_by(id=tag_id, org_id=org_id).first()
         if not tag:
             return False
+        # The tag lists of the groups carrying it change with it
+        group_ids = db.session.scalars(
+            select(usergroup_tag.c.usergroup_id).where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.tag_id == tag_id)
+        ).all()
+        db.session.execute(
+            delete(usergroup_tag).where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.tag_id == tag_id)
+        )
+        touch_user_groups(org_id, group_ids)
         db.session.delete(tag)
         db.session.commit()
+        # Tag-filtered user group listings change with the tag
+        invalidate_tag_id_map(org_id)
+        _after_tag_write(org_id, lambda index: index.remove(tag_id))
         return True
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -104,14 +248,9 @@ def delete_tag(tag_id):
 # Utility Functions
 def serialize_tag(tag):
     """Serialize a single tag object into JSON format."""
-    return {
-        "id": tag.id,
-        "resource_id": tag.resource_id,
-        "name": tag.name,
-        "created_at": tag.created_at.strftime('%Y-%m-%d'),
-        "updated_at": tag.updated_at.strftime('%Y-%m-%d'),
-    }
+    return serialize_tags([tag])[0]
 
 def serialize_tags(tags):
-    """Serialize a list of tag objects into JSON format."""
-    return [serialize_tag(tag) for tag in tags]
+    """Serialize a list of tag objects into JSON format, formatting the date columns in bulk."""
+    rows = [tuple(getattr(tag, field) for field in TAG_DETAIL_FIELDS) for tag in tags]
+    return serialize_rows(rows, TAG_DETAIL_FIELDS, TAG_DATE_FIELDS)
@@ -10,17 +10,25 @@ from app.constants import USER_ROUTES
 from app.config.message_config import send_email
 from app.schemas.user_schemas import LoginSchema, ForgotPasswordSchema
 from app.utils.response_utils import create_response
+from app.utils.token_revocation import revoke_token
+from app.utils.password_hasher import password_hasher
+from app.utils.login_throttle import login_throttle
 
-def user_service_login(userId, password):
+def user_service_login(userId, password, ip=None):
     """
     Handles user login logic, including credential validation, account locking, and logging.
 
     Args:
         email (str): The user's email address.
         password (str): The user's password.
+        ip (str, optional): Client address, throttled alongside the email.
 
     Returns:
         tuple: A boolean indicating success, and either JWT tokens (on success) or an error response (on failure).
+
+    Raises:
+        LoginThrottled: If the email or IP has too many recent failures (answer 429).
+        PasswordHasherBusy: If the worker is at its concurrent-login cap (answer 503).
     """
     schema = LoginSchema()
     # current_app.app_logger.debug(f"Login attempt with userId: {userId}, password: {password}")
@@ -29,17 +37,25 @@ def user_service_login(userId, password):
         # current_app.app_logger.debug(f"Validation errors: {errors}")
         return False, create_response(message="Failure to pass LoginSchema validation.", status=400)
     
+    # Reject abusive traffic before it reaches the database or bcrypt
+    login_throttle.check(userId, ip)
+
     # current_app.app_logger.debug(f"Database URI: {current_app.config['SQLALCHEMY_DATABASE_URI']}")
     # current_app.app_logger.debug(f"userId:**{userId}**")
     user = User.query.filter_by(email=userId).first()
     # current_app.app_logger.debug(f"user:**{user}**")
     if user and not user.locked:
-        if user.check_password(password):
+        verified, new_hash = password_hasher.check(user.password_hash, password)
+        if verified:
+            if new_hash:
+                # Upgrade to the configured bcrypt cost while the plaintext is at hand
+                user.password_hash = new_hash
 
             user.last_logon = datetime.now(timezone.utc)
             user.logon_attempt = 0
 
             db.session.commit()
+            login_throttle.record_success(userId, user)
             current_app.security_logger.info(f'User logged in: {user.username}')
 
             # Store user data in g
@@ -50,32 +66,38 @@ def user_service_login(userId, password):
             user_data = {"id":user.id, "org_id":user.org_id}
             return True, user_data, "Login successful"
         else:
-            handle_failed_login(user)
+            handle_failed_login(user, userId, ip)
             return False, None, "Invalid credentials."
     elif user and user.locked:
+        login_throttle.record_failure(userId, ip)
         current_app.security_logger.critical(f'Attempted login to locked account: {user.id}')
         return False, None, "Your account is locked due to too many attempted logins. Please contact the system administrator."
     else:
+        login_throttle.record_failure(userId, ip)
         current_app.security_logger.critical(f'Login attempt with unknown email: {userId}')
         return False, None,"No credentials match."
 
 
 # user_service_login helper
-def handle_failed_login(user):
-    user.logon_attempt += 1
-    if user.logon_attempt > 5:
-        user.locked = True
-        db.session.commit()
-        current_app.security_logger.critical(f'Account locked for user: {user.id}')
+def handle_failed_login(user, email=None, ip=None):
+    # Counted in memory; logon_attempt is written back in batches, the lock immediately
+    if login_throttle.record_failure(email or user.email, ip, user):
         return 'Too many login attempts. Your account is now locked.'
     else:
-        db.session.commit()
         current_app.security_logger.warning(f'Invalid login attempt for user: {user.id}')
 
 
-def user_service_logout(user_id):
+def user_service_logout(user_id, tokens=()):
+    """
+    Logs the user out by revoking the given decoded tokens until they expire.
+
+    Args:
+        user_id (str): ID of the user logging out.
+        tokens (iterable): Decoded JWTs (access and, if presented, refresh) to revoke.
+    """
+    for jwt_data in tokens:
+        revoke_token(jwt_data)
     current_app.security_logger.info(f'User logged out: {user_id}')
-    #localStorage.removeItem("access_token");
     return True
 
 
@@ -1,13 +1,236 @@
-from app.extensions import db
+import csv
+import io
+import re
+from datetime import datetime
+from app.extensions import db, cache
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import or_
+from sqlalchemy import or_, tuple_, literal, literal_column, select, update, delete, func, text, table, column, exists, false
 from app.models import UserGroup, User, Tag, usergroup_user, usergroup_tag
-from app.utils.rbac_utils import has_permission, has_permission_db
+from app.utils.rbac_utils import has_permission, get_permission_fingerprint
+from app.utils.pagination_utils import encode_cursor, decode_cursor
+from app.utils.cache_utils import get_generation, bump_generation, cache_get, cache_set, make_cache_key, CacheStats
+from app.utils.tag_index import bump_tag_generation
+from app.utils.serialization_utils import serialize_rows, csv_safe_cell
+from app.utils.response_utils import compute_etag
 
 RESOURCE_NAME = 'usergroup'
+CURSOR_SORT_KEYS = ('title', 'created_at')  # Each is backed by an (org_id, key, id) index
+COUNT_MODES = ('exact', 'estimate')
+TAG_MATCH_MODES = ('any', 'all')
+EXPORT_FORMATS = ('csv', 'ndjson')
 
-def filter_user_groups(query, org_id, search_term=None, tags=None):
+# Columns selected by the list endpoints, in serialized order; see serialize_user_group_rows
+USERGROUP_LIST_FIELDS = ('id', 'title', 'description', 'status', 'created_at', 'created_by', 'updated_at', 'updated_by')
+USERGROUP_LIST_COLUMNS = tuple(getattr(UserGroup, field) for field in USERGROUP_LIST_FIELDS)
+USERGROUP_DATE_FIELDS = ('created_at', 'updated_at')
+
+# Shared (flask_caching) key of an organization's user group generation
+USERGROUP_GENERATION_KEY = 'usergroups:generation:{org_id}'
+# Shared (flask_caching) key of an organization's tag name -> tag id map
+TAG_ID_MAP_KEY = 'usergroups:tag_ids:{org_id}'
+
+# Hit/miss counters of the list page cache (see get_user_groups), reported by /api/metrics
+list_cache_stats = CacheStats()
+
+
+def get_usergroup_generation(org_id):
+    """Returns the organization's user group generation, which changes on every group write; None if the cache is down."""
+    return get_generation(USERGROUP_GENERATION_KEY.format(org_id=org_id))
+
+
+def bump_usergroup_generation(org_id):
+    """Invalidates every cached listing result of the organization. Call after commit; returns the new generation."""
+    return bump_generation(USERGROUP_GENERATION_KEY.format(org_id=org_id))
+
+
+def get_tag_id_map(org_id):
+    """Returns the organization's {tag name: tag id} map, loading it into the cache on a miss."""
+    key = TAG_ID_MAP_KEY.format(org_id=org_id)
+    tag_ids = cache_get(key)
+    if tag_ids is None:
+        tag_ids = dict(db.session.execute(select(Tag.name, Tag.id).where(Tag.org_id == org_id)).all())
+        cache_set(key, tag_ids, timeout=current_app.config.get('CACHE_TIMEOUT', 600))
+    return tag_ids
+
+
+def invalidate_tag_id_map(org_id):
+    """Drops the cached tag name map of the organization. Call after a tag is created or deleted."""
+    try:
+        cache.delete(TAG_ID_MAP_KEY.format(org_id=org_id))
+    except Exception as e:
+        # Never fail the committed write over a cache outage
+        current_app.logger.error(f'invalidate_tag_id_map failed for {org_id}: {e}')
+
+
+def _planner_row_estimate(query):
+    """
+    Returns the query planner's row estimate on PostgreSQL, or None where unavailable.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    try:
+        sql = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+        plan = db.session.execute(text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (SQLAlchemyError, KeyError, IndexError, TypeError, ValueError) as e:
+        current_app.app_logger.warning(f"Planner row estimate failed: {str(e)}")
+        return None
+
+
+def count_user_groups(query, org_id, search_term=None, tags=None, count_mode='exact', match='any'):
+    """
+    Counts the rows of a filtered user group query, caching exact counts per
+    (org_id, search, tags) until the organization's user group generation changes.
+
+    In 'estimate' mode the count stops at USERGROUP_COUNT_ESTIMATE_THRESHOLD rows.
+    Larger results report the planner's estimate (PostgreSQL) or the threshold as
+    a lower bound, flagged as inexact.
+
+    Args:
+        query (SQLAlchemy Query): Filtered user group query (from filter_user_groups).
+        org_id (str): ID of the organization.
+        search_term (str, optional): Search term the query was filtered by.
+        tags (str, optional): Tags the query was filtered by.
+        count_mode (str, optional): 'exact' (default) or 'estimate'.
+        match (str, optional): Tag match mode the query was filtered with.
+
+    Returns:
+        tuple: (total, exact)
+    """
+    normalized_tags = ','.join(sorted(_parse_tag_names(tags))) if tags else None
+    generation = get_usergroup_generation(org_id)
+    # Without a generation (cache down) nothing is read from or written to the cache
+    key = None if generation is None else make_cache_key('usergroups:count', org_id, generation, search_term,
+                                                         normalized_tags, match if normalized_tags else None)
+    total = cache_get(key) if key else None
+    if total is not None:
+        return total, True
+
+    count_query = query.order_by(None)
+    if count_mode == 'estimate':
+        threshold = current_app.config.get('USERGROUP_COUNT_ESTIMATE_THRESHOLD', 10000)
+        bounded = count_query.with_entities(UserGroup.id).limit(threshold + 1).subquery()
+        total = db.session.scalar(select(func.count()).select_from(bounded))
+        if total > threshold:
+            return max(_planner_row_estimate(count_query) or 0, threshold), False
+    else:
+        total = count_query.count()
+
+    if key:
+        cache_set(key, total, timeout=current_app.config.get('CACHE_TIMEOUT', 600))
+    return total, True
+
+def search_user_groups(query, search_term, org_id=None):
+    """
+    Restricts a user group query to groups whose title or description contains a
+    word starting with each word of `search_term`, using the full-text index.
+
+    Args:
+        query (SQLAlchemy Query): The user group query to filter.
+        search_term (str): Words to prefix-match; punctuation is ignored.
+        org_id (str, optional): Organization the query is scoped to; limits the
+            full-text match to its groups.
+
+    Returns:
+        tuple: (filtered query, ORDER BY clause ranking best matches first, or None)
+    """
+    words = re.findall(r'\w+', search_term)
+    if not words:
+        return query, None
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        # FTS5 query: every word as a quoted prefix term in title/description, implicitly ANDed
+        fts_query = '{title description} : (' + ' '.join(f'"{word}"*' for word in words) + ')'
+        org_tokens = re.findall(r'\w+', org_id or '')
+        if org_tokens:
+            # Prune to the organization by the most selective token of its id (a uuid's
+            # longest group); usergroup.org_id is still filtered exactly
+            fts_query = f'org_id : "{max(org_tokens, key=len)}" AND {fts_query}'
+        fts = table('usergroup_fts', column('rowid'))
+        # Materialized so SQLite runs the MATCH once and joins usergroup by rowid; a plain
+        # join lets the planner probe the index once per org row when there is no ORDER BY
+        matches = (
+            select(
+                fts.c.rowid.label('rowid'),
+                # bm25: lower is better; title matches weigh ten times description matches
+                func.bm25(literal_column('usergroup_fts'), 0.0, 10.0, 1.0).label('rank'),
+            )
+            .where(literal_column('usergroup_fts').op('MATCH')(fts_query))
+            .cte('usergroup_search')
+            .prefix_with('MATERIALIZED')
+        )
+        query = query.join(matches, matches.c.rowid == literal_column('usergroup.rowid'))
+        return query, matches.c.rank.asc()
+
+    if dialect == 'postgresql':
+        ts_query = func.to_tsquery('simple', ' & '.join(f'{word}:*' for word in words))
+        search_vector = literal_column('usergroup.search_vector')
+        query = query.filter(search_vector.op('@@')(ts_query))
+        return query, func.ts_rank(search_vector, ts_query).desc()
+
+    # No text index on this database: substring match on the whole term
+    search_pattern = f"%{search_term}%"
+    query = query.filter(or_(UserGroup.title.ilike(search_pattern), UserGroup.description.ilike(search_pattern)))
+    return query, None
+
+
+def _parse_tag_names(tags):
+    """Splits a comma-separated tag list into distinct, non-empty names."""
+    return sorted({name.strip() for name in tags.split(',') if name.strip()})
+
+
+def filter_user_groups_by_tags(query, org_id, tags, match='any'):
+    """
+    Restricts a user group query to groups carrying the named tags.
+
+    Each group is returned at most once: 'any' is an EXISTS semi-join on
+    usergroup_tag and 'all' keeps the groups whose tag rows for the requested
+    tags number as many as the tags (GROUP BY ... HAVING COUNT). Both are served
+    by the (org_id, tag_id, usergroup_id) index. Names are resolved through the
+    cached tag map; unknown names match nothing.
+
+    Args:
+        query (SQLAlchemy Query): The user group query to filter.
+        org_id (str): ID of the organization.
+        tags (str): Comma-separated tag names.
+        match (str, optional): 'any' (default) or 'all'.
+
+    Returns:
+        SQLAlchemy Query: The filtered query object.
+
+    Raises:
+        ValueError: If the match mode is unsupported.
+    """
+    if match not in TAG_MATCH_MODES:
+        raise ValueError(f'Unsupported tag match mode: {match}')
+    names = _parse_tag_names(tags)
+    if not names:
+        return query
+
+    tag_map = get_tag_id_map(org_id)
+    tag_ids = [tag_map[name] for name in names if name in tag_map]
+    if not tag_ids or (match == 'all' and len(tag_ids) < len(names)):
+        return query.filter(false())
+
+    if match == 'any':
+        return query.filter(exists().where(
+            usergroup_tag.c.org_id == org_id,
+            usergroup_tag.c.tag_id.in_(tag_ids),
+            usergroup_tag.c.usergroup_id == UserGroup.id,
+        ))
+
+    tagged_with_all = (
+        select(usergroup_tag.c.usergroup_id)
+        .where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.tag_id.in_(tag_ids))
+        .group_by(usergroup_tag.c.usergroup_id)
+        .having(func.count() == len(tag_ids))
+    )
+    return query.filter(UserGroup.id.in_(tagged_with_all))
+
+
+def filter_user_groups(query, org_id, search_term=None, tags=None, match='any'):
     """
     Filters user groups based on search criteria such as search term or tags.
 
@@ -16,6 +239,7 @@ def filter_user_groups(query, org_id, search_term=None, tags=None):
         org_id (int): ID of the organization.
         search_term (str, optional): Term to filter groups by name or description.
         tags (list, optional): List of tags to filter groups.
+        match (str, optional): 'any' (default) or 'all' of the tags; see filter_user_groups_by_tags.
 
     Returns:
         SQLAlchemy Query: The filtered query object.
@@ -23,20 +247,15 @@ def filter_user_groups(query, org_id, search_term=None, tags=None):
     # Filter by organization ID
     query = query.filter_by(org_id=org_id)
 
-    # Apply filtering if a search term is provided
+    # Apply full-text filtering (and relevance order) if a search term is provided
     if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.filter(
-            or_(
-                UserGroup.title.ilike(search_pattern),
-                UserGroup.description.ilike(search_pattern)
-            )
-        )
+        query, rank_order = search_user_groups(query, search_term, org_id)
+        if rank_order is not None:
+            query = query.order_by(rank_order)
 
     # Apply tag filtering if tags are provided
     if tags:
-        tag_list = tags.split(',')
-        query = query.join(UserGroup.tags).filter(Tag.name.in_(tag_list))
+        query = filter_user_groups_by_tags(query, org_id, tags, match)
 
     return {
         'success': True,
@@ -44,7 +263,7 @@ def filter_user_groups(query, org_id, search_term=None, tags=None):
         'message': 'User groups filtered successfully.'
     }
 
-def get_user_groups(org_id, user_id, search_term=None, tags=None, page=1, per_page=25):
+def get_user_groups(org_id, user_id, search_term=None, tags=None, page=1, per_page=25, count_mode='exact', match='any'):
     """
     Retrieves a paginated list of user groups for the specified organization and user.
 
@@ -55,33 +274,62 @@ def get_user_groups(org_id, user_id, search_term=None, tags=None, page=1, per_pa
         tags (list, optional): List of tags to filter groups.
         page (int, optional): Page number for pagination. Defaults to 1.
         per_page (int, optional): Number of items per page. Defaults to 25.
+        count_mode (str, optional): 'exact' (default) or 'estimate'; see count_user_groups.
+        match (str, optional): 'any' (default) or 'all' of the tags.
+
+    Pages are served from the shared cache for USERGROUP_LIST_CACHE_TIMEOUT seconds
+    (0 disables it), keyed by the caller's permission fingerprint and the filters.
 
     Returns:
         dict: A dictionary containing rows of user groups and pagination information.
+
+    Raises:
+        ValueError: If the tag match mode is unsupported.
     """
     current_app.app_logger.debug(f'===== calling get_user_groups =====')
     try:
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'read'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'read'):
             raise PermissionError(f'User {user_id} is not authorized to read user groups.')
 
+        # Pages are cached per permission set and filters under the org's generation,
+        # which every group and tag write bumps; if the cache is down it is bypassed
+        timeout = current_app.config.get('USERGROUP_LIST_CACHE_TIMEOUT', 300)
+        generation = get_usergroup_generation(org_id) if timeout else None
+        if generation is not None:
+            normalized_tags = ','.join(sorted(_parse_tag_names(tags))) if tags else None
+            key = make_cache_key('usergroups:list', org_id, generation,
+                                 get_permission_fingerprint(org_id, user_id, RESOURCE_NAME), search_term,
+                                 normalized_tags, match if normalized_tags else None, page, per_page, count_mode)
+            cached = cache_get(key)
+            if cached is not None:
+                list_cache_stats.hit()
+                return {'success': True, 'data': cached, 'message': 'User groups retrieved successfully.'}
+            list_cache_stats.miss()
+
         # Base query for user groups
         query = UserGroup.query
-        query = filter_user_groups(query, org_id, search_term, tags)
+        query = filter_user_groups(query, org_id, search_term, tags, match)['data']
 
-        # Apply pagination to the query
-        paginated_result = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Apply pagination to the query; the total comes from the count cache
+        paginated_result = query.with_entities(*USERGROUP_LIST_COLUMNS) \
+            .paginate(page=page, per_page=per_page, error_out=False, count=False)
+        total, exact = count_user_groups(query, org_id, search_term, tags, count_mode, match)
 
-        # Serialize the user group data for the response
-        user_groups_data = [serialize_user_group(group) for group in paginated_result.items]
+        # Serialize the user group rows for the response
+        user_groups_data = serialize_user_group_rows(paginated_result.items)
         page_info = {
             'currentPage': paginated_result.page,
             'rowsPerPage': paginated_result.per_page,
-            'totalRows': paginated_result.total,
+            'totalRows': total,
+            'exact': exact,
         }
+        data = {'rows': user_groups_data, 'pageInfo': page_info}
+        if generation is not None:
+            cache_set(key, data, timeout=timeout)
 
         return {
             'success': True,
-            'data': {'rows': user_groups_data, 'pageInfo': page_info},
+            'data': data,
             'message': 'User groups retrieved successfully.'
         }
     
@@ -97,6 +345,175 @@ def get_user_groups(org_id, user_id, search_term=None, tags=None, page=1, per_pa
         }
 
 
+def _cursor_bound(column, value):
+    """
+    Binds a cursor value for comparison with `column`.
+
+    SQLite stores DateTime as text. Rows defaulted by CURRENT_TIMESTAMP carry no
+    fractional seconds, so a whole-second value is bound in that form, or equal
+    timestamps would compare as unequal.
+    """
+    if isinstance(column.type, db.DateTime) and db.engine.dialect.name == 'sqlite' and value.microsecond == 0:
+        return literal(value.strftime('%Y-%m-%d %H:%M:%S'), db.String)
+    return literal(value, column.type)
+
+
+def get_user_groups_by_cursor(org_id, user_id, search_term=None, tags=None, cursor=None, per_page=25, sort='title',
+                              match='any'):
+    """
+    Retrieves one page of user groups using keyset (cursor) pagination.
+
+    Rows are ordered by (sort key, id) and each page seeks past the previous one
+    through the (org_id, sort key, id) index, so deep pages cost the same as the
+    first and no COUNT(*) is issued.
+
+    Args:
+        org_id (int): ID of the organization.
+        user_id (int): ID of the user.
+        search_term (str, optional): Term to filter groups by name or description.
+        tags (list, optional): List of tags to filter groups.
+        cursor (str, optional): `next`/`prev` cursor from a previous page; None for the first page.
+        per_page (int, optional): Number of items per page. Defaults to 25.
+        sort (str, optional): 'title' or 'created_at'. Defaults to 'title'.
+        match (str, optional): 'any' (default) or 'all' of the tags.
+
+    Returns:
+        dict: A dictionary containing rows of user groups and `next`/`prev` cursors.
+
+    Raises:
+        ValueError: If the sort key, cursor or tag match mode is invalid.
+    """
+    current_app.app_logger.debug(f'===== calling get_user_groups_by_cursor =====')
+    try:
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'read'):
+            raise PermissionError(f'User {user_id} is not authorized to read user groups.')
+
+        if sort not in CURSOR_SORT_KEYS:
+            raise ValueError(f'Unsupported sort key: {sort}')
+        sort_column = getattr(UserGroup, sort)
+
+        query = filter_user_groups(UserGroup.query, org_id, search_term, tags, match)['data']
+
+        direction = 'next'
+        if cursor:
+            position = decode_cursor(cursor)
+            direction = position.get('direction')
+            value = position.get('value')
+            # Cursors come back from clients, so every field is checked before it is bound
+            if (position.get('sort') != sort or direction not in ('next', 'prev')
+                    or not isinstance(position.get('id'), str) or not isinstance(value, str)):
+                raise ValueError(f'Invalid cursor: {cursor}')
+            if sort == 'created_at':
+                try:
+                    value = datetime.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f'Invalid cursor: {cursor}')
+            key = tuple_(sort_column, UserGroup.id)
+            bound = tuple_(_cursor_bound(sort_column, value), literal(position['id']))
+            query = query.filter(key > bound if direction == 'next' else key < bound)
+
+        # Keyset order replaces the relevance order a search applies
+        query = query.order_by(None)
+        if direction == 'next':
+            query = query.order_by(sort_column.asc(), UserGroup.id.asc())
+        else:
+            query = query.order_by(sort_column.desc(), UserGroup.id.desc())
+
+        # One extra row tells whether another page follows in this direction
+        groups = query.with_entities(*USERGROUP_LIST_COLUMNS).limit(per_page + 1).all()
+        has_more = len(groups) > per_page
+        groups = groups[:per_page]
+        if direction == 'prev':
+            groups.reverse()
+
+        has_next = has_more if direction == 'next' else True
+        has_prev = (cursor is not None) if direction == 'next' else has_more
+
+        def cursor_for(group, cursor_direction):
+            value = getattr(group, sort)
+            return encode_cursor({
+                'sort': sort,
+                'value': value.isoformat() if isinstance(value, datetime) else value,
+                'id': group.id,
+                'direction': cursor_direction,
+            })
+
+        page_info = {
+            'rowsPerPage': per_page,
+            'next': cursor_for(groups[-1], 'next') if groups and has_next else None,
+            'prev': cursor_for(groups[0], 'prev') if groups and has_prev else None,
+        }
+
+        return {
+            'success': True,
+            'data': {'rows': serialize_user_group_rows(groups), 'pageInfo': page_info},
+            'message': 'User groups retrieved successfully.'
+        }
+
+    except PermissionError as pe:
+        current_app.app_logger.warning(f"Permission error: {str(pe)}")
+        raise pe
+    except SQLAlchemyError as e:
+        current_app.app_logger.warning(f"get_user_groups_by_cursor error: {str(e)}")
+        return {
+            'success': False,
+            'data': None,
+            'message': f'Error retrieving user groups: {str(e)}'
+        }
+
+
+def get_member_user_groups(org_id, user_id, page=1, per_page=25):
+    """
+    Retrieves a page of the user groups the user belongs to, ordered by title.
+
+    Memberships are read through the (org_id, user_id, group_id) index of
+    usergroup_user, so the cost follows the user's own group count, not the
+    size of the organization.
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the member.
+        page (int, optional): Page number for pagination. Defaults to 1.
+        per_page (int, optional): Number of items per page. Defaults to 25.
+
+    Returns:
+        dict: A dictionary containing rows of user groups and pagination information.
+    """
+    current_app.app_logger.debug(f'===== calling get_member_user_groups =====')
+    try:
+        page, per_page = max(page, 1), max(per_page, 1)
+        membership = (usergroup_user.c.org_id == org_id) & (usergroup_user.c.user_id == user_id)
+        total = db.session.scalar(select(func.count()).select_from(usergroup_user).where(membership))
+
+        rows = db.session.execute(
+            select(*USERGROUP_LIST_COLUMNS)
+            .join(usergroup_user, (usergroup_user.c.group_id == UserGroup.id) & (usergroup_user.c.org_id == UserGroup.org_id))
+            .where(membership)
+            .order_by(UserGroup.title, UserGroup.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).all()
+
+        page_info = {
+            'currentPage': page,
+            'rowsPerPage': per_page,
+            'totalRows': total,
+        }
+        return {
+            'success': True,
+            'data': {'rows': serialize_user_group_rows(rows), 'pageInfo': page_info},
+            'message': 'User groups retrieved successfully.'
+        }
+
+    except SQLAlchemyError as e:
+        current_app.app_logger.warning(f"get_member_user_groups error: {str(e)}")
+        return {
+            'success': False,
+            'data': None,
+            'message': f'Error retrieving user groups: {str(e)}'
+        }
+
+
 def get_user_group_by_id(org_id, user_id, group_id, include_students=False, include_tags=False):
     """
     Retrieves detailed information about a specific user group, optionally including students and tags.
@@ -114,33 +531,43 @@ def get_user_group_by_id(org_id, user_id, group_id, include_students=False, incl
     try:
         current_app.app_logger.debug(f'===== get_user_group: {group_id} include_students:{include_students} include_tags:{include_tags}')
 
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'read'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'read'):
             raise PermissionError(f'User {user_id} is not authorized to read user groups.')
 
         # Fetch the user group from the database
         query = UserGroup.query.filter_by(id=group_id)
-        query = filter_user_groups(query, org_id)  # Apply common filtering logic
+        query = filter_user_groups(query, org_id)['data']  # Apply common filtering logic
         user_group = query.first()
 
         if not user_group:
             return None
 
-        # Fetch associated students if required
+        # Fetch associated students if required; only the serialized columns, in one statement
         students = []
         if include_students:
+            student_rows = db.session.execute(
+                select(User.id, User.firstname, User.lastname, User.locked)
+                .join(usergroup_user, (usergroup_user.c.user_id == User.id) & (usergroup_user.c.org_id == User.org_id))
+                .where(usergroup_user.c.org_id == org_id, usergroup_user.c.group_id == group_id)
+            )
             students = [
                 {
                     "id": student.id,
                     "name": f"{student.firstname} {student.lastname}",
                     "locked": student.locked
-                } 
-                for student in user_group.users
+                }
+                for student in student_rows
             ]
 
-        # Fetch associated tags if required
+        # Fetch associated tags if required, likewise in one statement
         tags = []
         if include_tags:
-            tags = [{"id": tag.id, "name": tag.name} for tag in user_group.tags]
+            tag_rows = db.session.execute(
+                select(Tag.id, Tag.name)
+                .join(usergroup_tag, (usergroup_tag.c.tag_id == Tag.id) & (usergroup_tag.c.org_id == Tag.org_id))
+                .where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.usergroup_id == group_id)
+            )
+            tags = [{"id": tag.id, "name": tag.name} for tag in tag_rows]
 
         return {
             'success': True,
@@ -159,6 +586,252 @@ def get_user_group_by_id(org_id, user_id, group_id, include_students=False, incl
             'message': f'Error to retrieve user group: {str(e)}'
         }
 
+def _group_members(org_id, group_ids):
+    """Returns {group id: [{id, name, locked}]} for the given groups in one statement."""
+    members = {group_id: [] for group_id in group_ids}
+    rows = db.session.execute(
+        select(usergroup_user.c.group_id, User.id, User.firstname, User.lastname, User.locked)
+        .join(User, (usergroup_user.c.user_id == User.id) & (usergroup_user.c.org_id == User.org_id))
+        .where(usergroup_user.c.org_id == org_id, usergroup_user.c.group_id.in_(group_ids))
+    )
+    for group_id, student_id, firstname, lastname, locked in rows:
+        members[group_id].append({"id": student_id, "name": f"{firstname} {lastname}", "locked": locked})
+    return members
+
+
+def _group_tags(org_id, group_ids):
+    """Returns {group id: [{id, name}]} for the given groups in one statement."""
+    tags = {group_id: [] for group_id in group_ids}
+    rows = db.session.execute(
+        select(usergroup_tag.c.usergroup_id, Tag.id, Tag.name)
+        .join(Tag, (usergroup_tag.c.tag_id == Tag.id) & (usergroup_tag.c.org_id == Tag.org_id))
+        .where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.usergroup_id.in_(group_ids))
+    )
+    for group_id, tag_id, name in rows:
+        tags[group_id].append({"id": tag_id, "name": name})
+    return tags
+
+
+def export_user_groups(org_id, user_id, search_term=None, tags=None, match='any', export_format='csv',
+                       include_students=False, include_tags=False):
+    """
+    Streams every user group matching the filters of filter_user_groups as CSV or NDJSON.
+
+    Rows are read through a server-side cursor (yield_per) in batches of
+    USERGROUP_EXPORT_BATCH_SIZE and each batch is encoded and yielded before the
+    next is fetched, so memory stays flat however many groups the org has.
+    Members and tags, when requested, are fetched with one statement per batch.
+    In CSV they are joined with '; ' (student names, tag names).
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the user.
+        search_term (str, optional): Term to filter groups by name or description.
+        tags (str, optional): Comma-separated tag names to filter groups.
+        match (str, optional): 'any' (default) or 'all' of the tags.
+        export_format (str, optional): 'csv' (default) or 'ndjson'.
+        include_students (bool, optional): Add a studentsInGroup column.
+        include_tags (bool, optional): Add a tags column.
+
+    Returns:
+        generator: Chunks of the export body (str). The permission check and
+                   argument validation happen before it is returned.
+
+    Raises:
+        ValueError: If the format or tag match mode is unsupported.
+    """
+    current_app.app_logger.debug(f'===== calling export_user_groups =====')
+    if not has_permission(org_id, user_id, RESOURCE_NAME, 'read'):
+        raise PermissionError(f'User {user_id} is not authorized to read user groups.')
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported export format: {export_format}')
+
+    query = filter_user_groups(UserGroup.query, org_id, search_term, tags, match)['data']
+    statement = query.with_entities(*USERGROUP_LIST_COLUMNS).statement
+    batch_size = current_app.config.get('USERGROUP_EXPORT_BATCH_SIZE', 1000)
+    fields = USERGROUP_LIST_FIELDS + (('studentsInGroup',) if include_students else ()) \
+        + (('tags',) if include_tags else ())
+
+    def encode_csv(records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            if include_students:
+                record['studentsInGroup'] = '; '.join(student['name'] for student in record['studentsInGroup'])
+            if include_tags:
+                record['tags'] = '; '.join(tag['name'] for tag in record['tags'])
+            # Titles, descriptions and names are user input; never let them run as formulas
+            writer.writerow([csv_safe_cell(record[field]) for field in fields])
+        return buffer.getvalue()
+
+    def encode_ndjson(records):
+        return ''.join(current_app.json.dumps(record) + '\n' for record in records)
+
+    encode = encode_csv if export_format == 'csv' else encode_ndjson
+
+    def generate():
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(fields)
+            yield buffer.getvalue()
+
+        result = db.session.execute(statement, execution_options={'yield_per': batch_size})
+        try:
+            for batch in result.partitions():
+                records = serialize_user_group_rows(batch)
+                group_ids = [record['id'] for record in records]
+                if include_students:
+                    members = _group_members(org_id, group_ids)
+                    for record in records:
+                        record['studentsInGroup'] = members[record['id']]
+                if include_tags:
+                    group_tags = _group_tags(org_id, group_ids)
+                    for record in records:
+                        record['tags'] = group_tags[record['id']]
+                yield encode(records)
+        finally:
+            result.close()
+
+    return generate()
+
+
+def _import_member_batch(org_id, user_id, batch, known_groups, seen, report, add_error):
+    """
+    Resolves and inserts one batch of (row number, group id, email) membership rows:
+    one statement each for unknown group ids, the emails and the existing
+    memberships, then an executemany INSERT of the new pairs.
+    """
+    unresolved = {group_id for _, group_id, _ in batch if group_id not in known_groups}
+    if unresolved:
+        found = set(db.session.scalars(
+            select(UserGroup.id).where(UserGroup.org_id == org_id, UserGroup.id.in_(unresolved))
+        ))
+        known_groups.update((group_id, group_id in found) for group_id in unresolved)
+
+    emails = {email for _, _, email in batch}
+    user_ids = dict(db.session.execute(
+        select(User.email, User.id).where(User.org_id == org_id, User.email.in_(emails))
+    ).all())
+
+    candidates = []
+    for row_number, group_id, email in batch:
+        if not known_groups[group_id]:
+            add_error(row_number, group_id, email, f'Unknown group: {group_id}')
+        elif email not in user_ids:
+            add_error(row_number, group_id, email, f'Unknown email: {email}')
+        elif (group_id, user_ids[email]) in seen:
+            report['skipped'] += 1  # repeated in the file
+        else:
+            seen.add((group_id, user_ids[email]))
+            candidates.append((group_id, user_ids[email]))
+    if not candidates:
+        return
+
+    existing = set(db.session.execute(
+        # Row-value IN probes the (org_id, group_id, user_id) index once per pair
+        select(usergroup_user.c.group_id, usergroup_user.c.user_id).where(
+            usergroup_user.c.org_id == org_id,
+            tuple_(usergroup_user.c.group_id, usergroup_user.c.user_id).in_(candidates),
+        )
+    ).all())
+    new_members = [
+        {'org_id': org_id, 'group_id': group_id, 'user_id': member_id, 'created_by': user_id}
+        for group_id, member_id in candidates if (group_id, member_id) not in existing
+    ]
+    report['skipped'] += len(candidates) - len(new_members)
+    if new_members:
+        db.session.execute(usergroup_user.insert(), new_members)
+        touch_user_groups(org_id, {member['group_id'] for member in new_members})
+        report['imported'] += len(new_members)
+
+
+def import_group_members(org_id, user_id, lines):
+    """
+    Adds students to user groups from CSV text with a header row naming a `group`
+    (group id) column and an `email` column.
+
+    The CSV is parsed as a stream and handled in batches of
+    USERGROUP_IMPORT_BATCH_SIZE rows. Each batch resolves its group ids and
+    emails with one statement each, skips pairs that are already members or
+    repeated in the file, inserts the rest with one executemany INSERT and
+    commits. Rows that fail are reported (up to USERGROUP_IMPORT_MAX_ERRORS)
+    and do not stop the import.
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the user performing the import.
+        lines (iterable): Lines of CSV text, e.g. a file opened with newline=''.
+
+    Returns:
+        dict: A dictionary whose data is {'imported', 'skipped', 'errorCount', 'errors'};
+              each error is {'row', 'group', 'email', 'error'} with the 1-based line number.
+
+    Raises:
+        ValueError: If the header lacks the group or email column.
+    """
+    current_app.app_logger.debug(f"===== import_group_members called =====")
+    if not has_permission(org_id, user_id, RESOURCE_NAME, 'update'):
+        raise PermissionError(f"User {user_id} is not authorized to update user groups.")
+
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    group_column = next((header.index(name) for name in ('group', 'group_id') if name in header), None)
+    if group_column is None or 'email' not in header:
+        raise ValueError("The CSV header must name a 'group' column and an 'email' column.")
+    email_column = header.index('email')
+
+    batch_size = current_app.config.get('USERGROUP_IMPORT_BATCH_SIZE', 5000)
+    max_errors = current_app.config.get('USERGROUP_IMPORT_MAX_ERRORS', 1000)
+    report = {'imported': 0, 'skipped': 0, 'errorCount': 0, 'errors': []}
+
+    def add_error(row_number, group_id, email, message):
+        report['errorCount'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'row': row_number, 'group': group_id, 'email': email, 'error': message})
+
+    known_groups, seen, batch = {}, set(), []
+    try:
+        for row_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            group_id = row[group_column].strip() if len(row) > group_column else ''
+            email = row[email_column].strip() if len(row) > email_column else ''
+            if not group_id or not email:
+                add_error(row_number, group_id, email, 'Both group and email are required.')
+                continue
+            batch.append((row_number, group_id, email))
+            if len(batch) >= batch_size:
+                _import_member_batch(org_id, user_id, batch, known_groups, seen, report, add_error)
+                db.session.commit()
+                batch = []
+        if batch:
+            _import_member_batch(org_id, user_id, batch, known_groups, seen, report, add_error)
+            db.session.commit()
+        if report['imported']:
+            # Touched groups list a new updated_at
+            bump_usergroup_generation(org_id)
+        report['errors'].sort(key=lambda error: error['row'])
+
+        return {
+            'success': True,
+            'data': report,
+            'message': f"Imported {report['imported']} memberships; {report['skipped']} skipped, "
+                       f"{report['errorCount']} rows with errors."
+        }
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        if report['imported']:
+            # Batches committed before the failure
+            bump_usergroup_generation(org_id)
+        current_app.app_logger.warning(f"Database error: {str(e)}")
+        return {
+            'success': False,
+            'data': report,
+            'message': f'Database error importing group members: {str(e)}'
+        }
+
+
 def serialize_user_group(group, students=None, tags=None):
     """Helper function to serialize user group objects into JSON-friendly format."""
     serialized_data = {
@@ -183,63 +856,211 @@ def serialize_user_group(group, students=None, tags=None):
 
     return serialized_data
 
-def mass_status_update_groups(org_id, user_id, group_ids, new_status):
+def serialize_user_group_rows(rows):
+    """
+    Columnar counterpart of serialize_user_group for list pages: serializes rows
+    selected with USERGROUP_LIST_COLUMNS without loading UserGroup objects.
     """
-    Updates the status of multiple user groups in bulk.
+    return serialize_rows(rows, USERGROUP_LIST_FIELDS, USERGROUP_DATE_FIELDS)
+
+def _chunks(group_ids):
+    """Splits distinct group ids into lists of at most USERGROUP_BULK_CHUNK_SIZE."""
+    size = current_app.config.get('USERGROUP_BULK_CHUNK_SIZE', 500)
+    group_ids = list(dict.fromkeys(group_ids))
+    return [group_ids[i:i + size] for i in range(0, len(group_ids), size)]
+
+
+def _adjust_tag_usage(org_id, deltas):
+    """Applies {tag id: delta} to Tag.usage_count, one UPDATE per distinct delta."""
+    tag_table = Tag.__table__
+    by_delta = {}
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        db.session.execute(
+            update(tag_table)
+            .where(tag_table.c.org_id == org_id, tag_table.c.id.in_(tag_ids))
+            .values(usage_count=tag_table.c.usage_count + delta)
+        )
 
-    Args:
-        org_id (int): ID of the organization.
-        user_id (int): ID of the user performing the update.
-        group_ids (list): List of user group IDs to update.
-        new_status (str): New status to apply to the groups.
+
+def set_group_tags(org_id, user_id, group_id, tag_ids):
+    """
+    Makes the group's tags exactly the organization's tags in `tag_ids` (unknown ids
+    are ignored), writing only the difference to usergroup_tag and applying it as
+    +1/-1 deltas to the tags' usage_count. The caller commits.
 
     Returns:
-        dict: A dictionary with a success message and the count of updated groups.
+        bool: True if any tag was added or removed.
     """
-    try:
-        current_app.app_logger.debug(f"===== mass_status_update_groups_service called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'update'):
-            raise PermissionError(f"User {user_id} is not authorized to update user groups.")
+    current = set(db.session.scalars(
+        select(usergroup_tag.c.tag_id).where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.usergroup_id == group_id)
+    ))
+    wanted = set(db.session.scalars(
+        select(Tag.id).where(Tag.org_id == org_id, Tag.id.in_(tag_ids))
+    )) if tag_ids else set()
+    added, removed = wanted - current, current - wanted
+    if added:
+        db.session.execute(usergroup_tag.insert(), [
+            {'org_id': org_id, 'usergroup_id': group_id, 'tag_id': tag_id, 'created_by': user_id}
+            for tag_id in added
+        ])
+    if removed:
+        db.session.execute(
+            delete(usergroup_tag).where(usergroup_tag.c.org_id == org_id, usergroup_tag.c.usergroup_id == group_id,
+                                        usergroup_tag.c.tag_id.in_(removed))
+        )
+    _adjust_tag_usage(org_id, {**{tag_id: 1 for tag_id in added}, **{tag_id: -1 for tag_id in removed}})
+    return bool(added or removed)
 
-        # Fetch the user groups
-        user_groups = UserGroup.query.filter(UserGroup.id.in_(group_ids), UserGroup.org_id == org_id).all()
 
-        if not user_groups:
-            raise ValueError("No matching user groups found.")
+def touch_user_groups(org_id, group_ids):
+    """
+    Marks the groups as changed after a write to their members or tags: bumps
+    revision and sets updated_at, in the caller's transaction.
+    """
+    usergroup_table = UserGroup.__table__
+    for chunk in _chunks(group_ids):
+        db.session.execute(
+            update(usergroup_table)
+            .where(usergroup_table.c.org_id == org_id, usergroup_table.c.id.in_(chunk))
+            .values(revision=usergroup_table.c.revision + 1, updated_at=func.now())
+        )
 
-        # Update the status
-        for group in user_groups:
-            group.status = new_status
-            group.updated_by = user_id
-            group.updated_at = db.func.now()
 
-        db.session.commit()
+def get_user_group_etag(org_id, group_id, include_students=False, include_tags=False):
+    """
+    Builds the ETag and Last-Modified of a user group's detail view with one
+    single-row SELECT; neither the group nor its members or tags are loaded.
 
-        updated_count = len(user_groups)
-        return {
-            'success': True,
-            'data': {'updated_count': updated_count},
-            'message': f'Successfully updated the status of {updated_count} user groups.'
-        }
-    
-    except PermissionError as pe:
-        current_app.security_logger.critical(f"Permission error: {str(pe)}")
-        raise pe
-    except ValueError as ve:
-        current_app.app_logger.warning(f"Value error: {str(ve)}")
-        return {"error": str(ve)}
-    except SQLAlchemyError as e:
-        db.session.rollback()
-        current_app.app_logger.warning(f"Database error: {str(e)}")
-        return {
-            'success': False,
-            'data': None,
-            'message': f'Error performing mass update user group statuses: {str(e)}'
-        }
+    The group's revision covers writes to the group, its memberships and its tags.
+    With students included, their latest updated_at is folded in as well, since
+    the view shows their names and locked state.
+
+    Returns:
+        tuple: (ETag value (unquoted), Last-Modified datetime), or (None, None) if
+               the group does not exist in the organization.
+    """
+    columns = [UserGroup.updated_at, UserGroup.revision]
+    if include_students:
+        columns.append(
+            select(func.max(User.updated_at))
+            .join(usergroup_user, (usergroup_user.c.user_id == User.id) & (usergroup_user.c.org_id == User.org_id))
+            .where(usergroup_user.c.org_id == org_id, usergroup_user.c.group_id == group_id)
+            .scalar_subquery()
+        )
+    row = db.session.execute(select(*columns).where(UserGroup.org_id == org_id, UserGroup.id == group_id)).first()
+    if row is None:
+        return None, None
+
+    updated_at, revision = row[0], row[1]
+    students_updated_at = row[2] if include_students else None
+    etag = compute_etag('usergroup', org_id, group_id, revision, updated_at, include_students,
+                        students_updated_at, include_tags)
+    return etag, max(filter(None, (updated_at, students_updated_at)), default=None)
+
+
+def bulk_update_group_status(org_id, user_id, group_ids, new_status):
+    """
+    Sets status/updated_by/updated_at on the organization's groups in `group_ids`
+    with one set-based UPDATE per chunk of ids. No group is loaded into the
+    session. The caller commits, so all chunks share one transaction.
+
+    Returns:
+        int: Number of groups actually updated (ids not found in the org are not counted).
+    """
+    usergroup_table = UserGroup.__table__
+    updated_count = 0
+    for chunk in _chunks(group_ids):
+        result = db.session.execute(
+            update(usergroup_table)
+            .where(usergroup_table.c.org_id == org_id, usergroup_table.c.id.in_(chunk))
+            .values(status=new_status, updated_by=user_id, updated_at=func.now(),
+                    revision=usergroup_table.c.revision + 1)
+        )
+        updated_count += result.rowcount
+    return updated_count
+
+
+def bulk_delete_groups(org_id, group_ids, progress=None):
+    """
+    Deletes the organization's groups in `group_ids` and their usergroup_user and
+    usergroup_tag rows with set-based DELETEs, chunk by chunk, without loading
+    any group or collection. The tags' usage counts drop by the rows removed.
+
+    Each chunk deletes association rows before the groups and commits on its own,
+    so no transaction holds locks for long. A chunk that fails is rolled back and
+    its ids reported, while the other chunks are still deleted. After every chunk
+    the progress is logged and, when given, `progress(done, total)` is called with
+    the number of ids processed so far.
+
+    Returns:
+        tuple: (number of groups actually deleted, ids of the chunks that failed).
+    """
+    usergroup_table = UserGroup.__table__
+    tag_table = Tag.__table__
+    chunks = _chunks(group_ids)
+    total = sum(len(chunk) for chunk in chunks)
+    deleted_count = done = 0
+    failed_ids = []
+    for chunk in chunks:
+        try:
+            db.session.execute(
+                delete(usergroup_user).where(usergroup_user.c.org_id == org_id, usergroup_user.c.group_id.in_(chunk))
+            )
+            # Release the chunk's tag rows from their tags' usage counts before deleting them
+            chunk_tags = usergroup_tag.c.org_id == org_id, usergroup_tag.c.usergroup_id.in_(chunk)
+            released = db.session.execute(
+                update(tag_table)
+                .where(tag_table.c.org_id == org_id, tag_table.c.id.in_(select(usergroup_tag.c.tag_id).where(*chunk_tags)))
+                .values(usage_count=tag_table.c.usage_count - select(func.count()).select_from(usergroup_tag).where(
+                    *chunk_tags, usergroup_tag.c.tag_id == tag_table.c.id).scalar_subquery())
+            )
+            db.session.execute(delete(usergroup_tag).where(*chunk_tags))
+            result = db.session.execute(
+                delete(usergroup_table).where(usergroup_table.c.org_id == org_id, usergroup_table.c.id.in_(chunk))
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            failed_ids.extend(chunk)
+            current_app.app_logger.error(f'bulk_delete_groups {org_id}: chunk of {len(chunk)} ids failed: {str(e)}')
+        else:
+            deleted_count += result.rowcount
+            if result.rowcount:
+                bump_usergroup_generation(org_id)
+            if released.rowcount:
+                bump_tag_generation(org_id)
+        done += len(chunk)
+        if len(chunks) > 1:
+            current_app.app_logger.info(f'bulk_delete_groups {org_id}: {done}/{total} ids processed, {deleted_count} deleted')
+        if progress:
+            progress(done, total)
+    return deleted_count, failed_ids
+
+
+def validate_group_ids(group_ids):
+    """
+    Checks a client-supplied list of group ids for the mass endpoints.
+
+    Raises:
+        ValueError: If `group_ids` is not a non-empty list of non-empty strings.
+    """
+    if not isinstance(group_ids, list) or not group_ids:
+        raise ValueError("'groupIds' must be a non-empty list.")
+    if not all(isinstance(group_id, str) and group_id for group_id in group_ids):
+        raise ValueError("'groupIds' must contain group id strings.")
+    return group_ids
+
+
+def mass_status_update_groups(org_id, user_id, group_ids, new_status):
+    """Same as mass_update_group_status."""
+    return mass_update_group_status(org_id, user_id, group_ids, new_status)
 
 def mass_delete_groups(org_id, user_id, group_ids):
     """
-    Deletes multiple user groups in bulk.
+    Deletes multiple user groups in bulk, with their member and tag rows; see bulk_delete_groups.
 
     Args:
         org_id (int): ID of the organization.
@@ -247,30 +1068,31 @@ def mass_delete_groups(org_id, user_id, group_ids):
         group_ids (list): List of user group IDs to delete.
 
     Returns:
-        dict: A dictionary with a success message and the count of deleted groups.
+        dict: A dictionary with a success message and the count of deleted groups;
+              ids that do not exist in the organization are not counted. If some
+              chunks failed, success is False and data also lists their `failedIds`.
     """
     try:
         current_app.app_logger.debug(f"===== mass_delete_groups_service called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'delete'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'delete'):
             raise PermissionError(f"User {user_id} is not authorized to delete user groups.")
 
-        # Fetch the user groups
-        user_groups = UserGroup.query.filter(UserGroup.id.in_(group_ids), UserGroup.org_id == org_id).all()
-
-        if not user_groups:
+        validate_group_ids(group_ids)
+        deleted_count, failed_ids = bulk_delete_groups(org_id, group_ids)
+        if failed_ids:
+            # Earlier and later chunks were committed: report what was deleted
+            return {
+                'success': False,
+                'data': {'deleted_count': deleted_count, 'failedIds': failed_ids},
+                'message': f'Deleted {deleted_count} user groups; {len(failed_ids)} ids could not be deleted.'
+            }
+        if not deleted_count:
             raise ValueError("No matching user groups found.")
 
-        # Delete the user groups
-        for group in user_groups:
-            db.session.delete(group)
-
-        db.session.commit()
-
-        updated_count = len(user_groups)
         return {
             'success': True,
-            'data': {'updated_count': updated_count},
-            'message': f'Successfully updated the status of {updated_count} user groups.'
+            'data': {'deleted_count': deleted_count},
+            'message': f'Successfully deleted {deleted_count} user groups.'
         }
     
     except PermissionError as pe:
@@ -278,14 +1100,18 @@ def mass_delete_groups(org_id, user_id, group_ids):
         raise pe
     except ValueError as ve:
         current_app.app_logger.warning(f"Value error: {str(ve)}")
-        return {"error": str(ve)}
+        return {
+            'success': False,
+            'data': None,
+            'message': f'Error deleting user groups: {str(ve)}'
+        }
     except SQLAlchemyError as e:
         db.session.rollback()
         current_app.app_logger.warning(f"Database error: {str(e)}")
         return {
             'success': False,
             'data': None,
-            'message': f'Error updating user group statuses: {str(e)}'
+            'message': f'Error deleting user groups: {str(e)}'
         }
     
 
@@ -306,7 +1132,7 @@ def create_user_group(org_id, user_id, title, description=None, status='1', tags
     """
     try:
         current_app.app_logger.debug(f"===== create_user_group called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'create'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'create'):
             raise PermissionError(f"User {user_id} is not authorized to create user groups.")
 
         # Create the user group
@@ -322,11 +1148,13 @@ def create_user_group(org_id, user_id, title, description=None, status='1', tags
         db.session.flush()  # Get the new group ID
 
         # Associate tags if provided
-        if tags:
-            tag_objects = Tag.query.filter(Tag.id.in_(tags), Tag.org_id == org_id).all()
-            new_group.tags.extend(tag_objects)
+        tags_changed = bool(tags) and set_group_tags(org_id, user_id, new_group.id, tags)
 
         db.session.commit()
+        bump_usergroup_generation(org_id)
+        if tags_changed:
+            # Usage counts rank the tag suggestions
+            bump_tag_generation(org_id)
         return {
             'success': True,
             'data': serialize_user_group(new_group),
@@ -363,7 +1191,7 @@ def update_user_group(org_id, user_id, group_id, title=None, description=None, s
     """
     try:
         current_app.app_logger.debug(f"===== update_user_group called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'update'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'update'):
             raise PermissionError(f"User {user_id} is not authorized to update user groups.")
 
         user_group = UserGroup.query.filter_by(id=group_id, org_id=org_id).first()
@@ -378,13 +1206,16 @@ def update_user_group(org_id, user_id, group_id, title=None, description=None, s
         if status is not None:
             user_group.status = status
         user_group.updated_by = user_id
+        user_group.revision = UserGroup.revision + 1
 
-        # Update tags if provided
-        if tags is not None:
-            tag_objects = Tag.query.filter(Tag.id.in_(tags), Tag.org_id == org_id).all()
-            user_group.tags = tag_objects
+        # Update tags if provided; only the difference is written
+        tags_changed = tags is not None and set_group_tags(org_id, user_id, group_id, tags)
 
         db.session.commit()
+        bump_usergroup_generation(org_id)
+        if tags_changed:
+            # Usage counts rank the tag suggestions
+            bump_tag_generation(org_id)
         return {
             'success': True,
             'data': serialize_user_group(user_group),
@@ -425,16 +1256,15 @@ def delete_user_group(org_id, user_id, group_id):
     """
     try:
         current_app.app_logger.debug(f"===== delete_user_group called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'delete'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'delete'):
             raise PermissionError(f"User {user_id} is not authorized to delete user groups.")
 
-        user_group = UserGroup.query.filter_by(id=group_id, org_id=org_id).first()
-        if not user_group:
+        deleted_count, failed_ids = bulk_delete_groups(org_id, [group_id])
+        if failed_ids:
+            raise SQLAlchemyError(f"User group {group_id} could not be deleted.")
+        if not deleted_count:
             raise ValueError(f"User group with ID {group_id} not found.")
 
-        db.session.delete(user_group)
-        db.session.commit()
-
         return {
             'success': True,
             'data': None,
@@ -449,7 +1279,7 @@ def delete_user_group(org_id, user_id, group_id):
         return {
             'success': False,
             'data': None,
-            'message': f'Error deleting user group: {str(e)}'
+            'message': f'Error deleting user group: {str(ve)}'
         }
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -462,7 +1292,8 @@ def delete_user_group(org_id, user_id, group_id):
 
 def mass_update_group_status(org_id, user_id, group_ids, new_status):
     """
-    Updates the status of multiple user groups in bulk.
+    Updates the status of multiple user groups in bulk, with chunked set-based
+    UPDATEs committed as one transaction.
 
     Args:
         org_id (int): ID of the organization.
@@ -471,24 +1302,22 @@ def mass_update_group_status(org_id, user_id, group_ids, new_status):
         new_status (str): New status to apply to the groups.
 
     Returns:
-        dict: A dictionary with a success message and the count of updated groups.
+        dict: A dictionary with a success message and the count of updated groups;
+              ids that do not exist in the organization are not counted.
     """
     try:
         current_app.app_logger.debug(f"===== mass_update_group_status called =====")
-        if not has_permission_db(org_id, user_id, RESOURCE_NAME, 'update'):
+        if not has_permission(org_id, user_id, RESOURCE_NAME, 'update'):
             raise PermissionError(f"User {user_id} is not authorized to update user groups.")
 
-        user_groups = UserGroup.query.filter(UserGroup.id.in_(group_ids), UserGroup.org_id == org_id).all()
-        if not user_groups:
+        validate_group_ids(group_ids)
+        updated_count = bulk_update_group_status(org_id, user_id, group_ids, new_status)
+        if not updated_count:
             raise ValueError("No matching user groups found.")
 
-        for group in user_groups:
-            group.status = new_status
-            group.updated_by = user_id
-
         db.session.commit()
+        bump_usergroup_generation(org_id)
 
-        updated_count = len(group_ids)
         return {
             'success': True,
             'data': {'updated_count': updated_count},
@@ -499,11 +1328,12 @@ def mass_update_group_status(org_id, user_id, group_ids, new_status):
         current_app.security_logger.critical(f"Permission error: {str(pe)}")
         raise pe
     except ValueError as ve:
+        db.session.rollback()
         current_app.app_logger.warning(f"Value error: {str(ve)}")
         return {
             'success': False,
             'data': None,
-            'message': f'Error updating user group statuses: {str(e)}'
+            'message': f'Error updating user group statuses: {str(ve)}'
         }
     except SQLAlchemyError as e:
         db.session.rollback()
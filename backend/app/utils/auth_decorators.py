@@ -2,20 +2,27 @@ from functools import wraps
 from flask import g, request, jsonify, make_response, current_app
 from flask_jwt_extended import (
     verify_jwt_in_request,
+    get_jwt,
     decode_token,
     set_access_cookies,
     set_refresh_cookies,
 )
 from app.utils.jwt_utils import create_jwt_token
+from app.utils.rbac_utils import has_permission
+from app.utils.response_utils import create_response
 
 def inject_identity(f):
     """
-    Decorator to inject user_id and org_id into the `g` context variable.
+    Decorator that authenticates the request and injects user_id and org_id into `g`.
+
+    The access token is verified exactly once; flask_jwt_extended keeps the decoded
+    claims for the rest of the request (get_jwt()), where has_permission reads them.
+    Replaces stacking `@jwt_required()` under this decorator.
     """
     @wraps(f)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()  # Verify the access token
-        identity = decode_token(request.cookies.get(current_app.config["JWT_ACCESS_COOKIE_NAME"]))  # Decode the JWT
+        identity = get_jwt()
         g.user_id = identity.get("sub")
         g.org_id = identity.get(current_app.config.get("JWT_KEY_ORG_ID", "org_id"))
         current_app.logger.debug(f"Authenticated user: {g.user_id}, org: {g.org_id}")
@@ -23,6 +30,29 @@ def inject_identity(f):
     return wrapper
 
 
+def require_permission(resource_name, action_name):
+    """
+    Decorator to reject the request with 403 unless the caller may perform
+    `action_name` on `resource_name`.
+
+    The caller's full permission set is resolved once and memoized on `g`, so service
+    calls made while handling the request check permissions without further queries.
+    Must be applied below `inject_identity` so `g.user_id`/`g.org_id` are set.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not has_permission(g.org_id, g.user_id, resource_name, action_name):
+                return create_response(
+                    data=None,
+                    message=f"You do not have permission to {action_name} {resource_name}.",
+                    status=403
+                )
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def jwt_required_with_refresh(fn):
     """
     Decorator to handle refreshing tokens if the access token is expired.
@@ -0,0 +1,122 @@
+# utils/cache_utils.py
+import hashlib
+import threading
+import uuid
+from flask import current_app, has_app_context
+
+
+def get_generation(key, timeout=0):
+    """
+    Returns the generation token stored under `key` in the shared cache, creating one if absent.
+
+    Cache entries derived from some data embed its generation in their keys, so
+    bumping the generation orphans them all at once; they simply age out. A non-zero
+    `timeout` makes the token itself expire, so it is replaced even without a bump.
+
+    Returns None if the cache backend fails (e.g. Redis is down); callers then
+    bypass their cached entries and read the database.
+    """
+    from app.extensions import cache
+
+    try:
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, uuid.uuid4().hex[:8], timeout=timeout)
+            generation = cache.get(key)
+        return generation
+    except Exception as e:
+        current_app.logger.error(f'get_generation failed for {key}: {e}')
+        return None
+
+
+def cache_get(key):
+    """Reads `key` from the shared cache; None on a miss or a cache backend failure."""
+    from app.extensions import cache
+
+    try:
+        return cache.get(key)
+    except Exception as e:
+        current_app.logger.error(f'cache_get failed for {key}: {e}')
+        return None
+
+
+def cache_set(key, value, timeout=None):
+    """Stores `value` under `key` in the shared cache; a backend failure is logged and ignored."""
+    from app.extensions import cache
+
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception as e:
+        current_app.logger.error(f'cache_set failed for {key}: {e}')
+
+
+def cache_delete_many(keys):
+    """Removes `keys` from the shared cache; a backend failure is logged and ignored."""
+    from app.extensions import cache
+
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        cache.delete_many(*keys)
+    except Exception as e:
+        current_app.logger.error(f'cache_delete_many failed for {len(keys)} keys: {e}')
+
+
+def bump_generation(key, timeout=0):
+    """
+    Replaces the generation token under `key`. Call after the underlying write commits.
+
+    Returns the new token, or None if it could not be stored.
+    """
+    from app.extensions import cache
+
+    if not has_app_context():
+        return None
+    generation = uuid.uuid4().hex[:8]
+    try:
+        cache.set(key, generation, timeout=timeout)
+        return generation
+    except Exception as e:
+        # Never fail the committed write over a cache outage
+        current_app.logger.error(f'bump_generation failed for {key}: {e}')
+        return None
+
+
+def make_cache_key(prefix, *parts):
+    """Builds a bounded-length cache key from arbitrary (e.g. user-supplied) parts."""
+    digest = hashlib.sha1('\x1f'.join('' if part is None else str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss counters of one cache, per worker process.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits_total': hits,
+            'misses_total': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
@@ -8,6 +8,7 @@ from flask_jwt_extended import (
 from jwt import decode as jwt_decode, ExpiredSignatureError, InvalidTokenError
 from datetime import timedelta
 from app.utils.response_utils import create_response
+from app.utils.permission_claims import build_permission_claims
 
 # Constants for token expiration
 ACCESS_TOKEN_EXPIRES = timedelta(minutes=30)
@@ -34,7 +35,8 @@ def create_jwt_token(org_id, user_id, access_expires_delta=None):
         access_token = create_token(
             identity=user_id,
             expires_delta=access_expires_delta or ACCESS_TOKEN_EXPIRES,
-            org_id=org_id
+            org_id=org_id,
+            claims=build_permission_claims(org_id, user_id)
         )
         refresh_token = create_token(
             identity=user_id,
@@ -51,7 +53,7 @@ def create_jwt_token(org_id, user_id, access_expires_delta=None):
         return create_response(message="Failed to create tokens.", status=500)
 
 
-def create_token(identity, expires_delta, org_id=None):
+def create_token(identity, expires_delta, org_id=None, claims=None):
     """
     Generates a JWT token with optional organization ID claims.
 
@@ -59,11 +61,14 @@ def create_token(identity, expires_delta, org_id=None):
         identity (str): The identity to include in the token (e.g., user ID).
         expires_delta (timedelta): The expiration duration for the token.
         org_id (str, optional): The organization ID to include as an additional claim.
+        claims (dict, optional): Further claims, e.g. the `perms`/`pv` permission claims.
 
     Returns:
         str: The generated JWT token.
     """
     additional_claims = {JWT_KEY_ORG_ID: org_id} if org_id else {}
+    if claims:
+        additional_claims.update(claims)
     return create_access_token(identity=identity, additional_claims=additional_claims, expires_delta=expires_delta)
 
 
@@ -152,17 +157,8 @@ def set_tokens_in_cookies(response, access_token, refresh_token):
         access_token (str): The JWT access token.
         refresh_token (str): The JWT refresh token.
     """
-    # Access token cookie
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=current_app.config.get("JWT_COOKIE_SECURE", True),
-        samesite=current_app.config.get("JWT_COOKIE_SAMESITE", "Lax"),
-        max_age=current_app.config.get("JWT_ACCESS_TOKEN_EXPIRES", 900),
-        path="/api"
-    )
-    
+    set_access_token_cookie(response, access_token)
+
     # Refresh token cookie
     response.set_cookie(
         key="refresh_token",
@@ -172,4 +168,23 @@ def set_tokens_in_cookies(response, access_token, refresh_token):
         samesite=current_app.config.get("JWT_COOKIE_SAMESITE", "Lax"),
         max_age=current_app.config.get("JWT_REFRESH_TOKEN_EXPIRES", 86400),
         path="/api/token"
-    )
\ No newline at end of file
+    )
+
+def set_access_token_cookie(response, access_token, max_age=None):
+    """
+    Set the access token as an HttpOnly cookie on the response.
+
+    Args:
+        response (Response): Flask Response object to modify.
+        access_token (str): The JWT access token.
+        max_age (int or timedelta, optional): Cookie lifetime; defaults to JWT_ACCESS_TOKEN_EXPIRES.
+    """
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        secure=current_app.config.get("JWT_COOKIE_SECURE", True),
+        samesite=current_app.config.get("JWT_COOKIE_SAMESITE", "Lax"),
+        max_age=max_age if max_age is not None else current_app.config.get("JWT_ACCESS_TOKEN_EXPIRES", 900),
+        path="/api"
+    )
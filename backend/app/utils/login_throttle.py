@@ -0,0 +1,294 @@
+# utils/login_throttle.py
+import math
+import threading
+import time
+from collections import deque
+from flask import current_app
+from sqlalchemy import update, bindparam, case
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Key prefixes of the sliding-window counters
+EMAIL_KEY = 'login:email:'
+IP_KEY = 'login:ip:'
+# Key prefix of the consecutive-failure counter of one account
+ACCOUNT_KEY = 'login:account:'
+
+
+class LoginThrottled(Exception):
+    """Raised when an email or client IP has too many recent failed logins; answer 429."""
+
+    def __init__(self, retry_after):
+        super().__init__('Too many failed logins')
+        self.retry_after = retry_after
+
+
+class MemoryAttemptBackend:
+    """Per-process sliding windows of failure timestamps."""
+
+    # Drop empty windows every this many hits so abandoned keys do not accumulate
+    SWEEP_EVERY = 1024
+
+    def __init__(self):
+        self._windows = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+
+    @staticmethod
+    def _prune(window, now, seconds):
+        while window and window[0] <= now - seconds:
+            window.popleft()
+
+    def get(self, key, now, seconds):
+        with self._lock:
+            window = self._windows.get(key)
+            if not window:
+                return []
+            self._prune(window, now, seconds)
+            return list(window)
+
+    def add(self, key, now, seconds):
+        with self._lock:
+            window = self._windows.setdefault(key, deque())
+            self._prune(window, now, seconds)
+            window.append(now)
+            self._hits += 1
+            if self._hits % self.SWEEP_EVERY == 0:
+                for stale in [k for k, w in self._windows.items() if not w or w[-1] <= now - seconds]:
+                    del self._windows[stale]
+            return list(window)
+
+    def increment(self, key, seconds):
+        with self._lock:
+            count, _ = self._counters.get(key, (0, None))
+            now = time.time()
+            self._counters[key] = (count + 1, now + seconds)
+            self._hits += 1
+            if self._hits % self.SWEEP_EVERY == 0:
+                for stale in [k for k, (_, expires) in self._counters.items() if expires <= now]:
+                    del self._counters[stale]
+            return count + 1
+
+    def count(self, key):
+        with self._lock:
+            count, expires = self._counters.get(key, (0, None))
+            return count if expires is not None and expires > time.time() else 0
+
+    def clear(self, key):
+        with self._lock:
+            self._windows.pop(key, None)
+            self._counters.pop(key, None)
+
+
+class CacheAttemptBackend:
+    """
+    Sliding windows and account counters kept in the Flask-Caching backend, shared
+    by every worker when CACHE_TYPE is a shared cache (e.g. Redis). Window updates
+    are read-modify-write, so concurrent failures may undercount by a few; counters
+    use the backend's increment.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, key, now, seconds):
+        return [ts for ts in (self.cache.get(key) or []) if ts > now - seconds]
+
+    def add(self, key, now, seconds):
+        window = self.get(key, now, seconds)
+        window.append(now)
+        self.cache.set(key, window, timeout=int(seconds) + 1)
+        return window
+
+    def increment(self, key, seconds):
+        self.cache.add(key, 0, timeout=int(seconds))
+        # The underlying client's inc is atomic on Redis
+        return self.cache.cache.inc(key) or 0
+
+    def count(self, key):
+        return self.cache.get(key) or 0
+
+    def clear(self, key):
+        self.cache.delete(key)
+
+
+class LoginThrottle:
+    """
+    Failed-login bookkeeping that keeps abusive traffic away from the database and bcrypt.
+
+    - Per-email and per-IP sliding windows reject further attempts with LoginThrottled
+      before the user is looked up.
+    - Consecutive failures per account are counted in the backend, so every worker
+      sharing it sees the same count. The account is locked (and written) as soon as
+      it exceeds `max_attempts`. Lower counts reach user.logon_attempt in batched
+      UPDATEs, run on their own connection so the request's session is not committed.
+    """
+
+    def __init__(self, backend=None, window_seconds=900, max_per_email=10, max_per_ip=50,
+                 max_attempts=5, flush_size=50, flush_seconds=5):
+        self.backend = backend or MemoryAttemptBackend()
+        self._pending = set()  # (user_id, org_id) whose count this worker has not written yet
+        self._pending_since = None
+        self._lock = threading.Lock()
+        self.configure(self.backend, window_seconds, max_per_email, max_per_ip, max_attempts, flush_size, flush_seconds)
+
+    def configure(self, backend, window_seconds, max_per_email, max_per_ip, max_attempts, flush_size, flush_seconds):
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.max_attempts = max_attempts
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+
+    @staticmethod
+    def _account_key(user_id, org_id):
+        return f'{ACCOUNT_KEY}{org_id}:{user_id}'
+
+    def _keys(self, email, ip):
+        keys = [(EMAIL_KEY + (email or '').strip().lower(), self.max_per_email)]
+        if ip:
+            keys.append((IP_KEY + ip, self.max_per_ip))
+        return keys
+
+    def check(self, email, ip=None):
+        """
+        Raises LoginThrottled if the email or IP has reached its failure limit in the window.
+        Also writes back pending failure counts that have waited long enough.
+        """
+        if self.flush_due():
+            self.flush()
+        now = time.time()
+        for key, limit in self._keys(email, ip):
+            window = self.backend.get(key, now, self.window_seconds)
+            if len(window) >= limit:
+                retry_after = max(int(math.ceil(window[-limit] + self.window_seconds - now)), 1)
+                current_app.security_logger.warning(f'Login throttled: {key}')
+                raise LoginThrottled(retry_after)
+
+    def record_failure(self, email, ip=None, user=None):
+        """
+        Counts a failed login against the email and IP windows and, for a known user,
+        against the account.
+
+        Returns:
+            bool: True if this failure locked the account.
+        """
+        now = time.time()
+        for key, _ in self._keys(email, ip):
+            self.backend.add(key, now, self.window_seconds)
+        if user is None:
+            return False
+
+        account = (user.id, user.org_id)
+        key = self._account_key(*account)
+        # The counter may have expired while an older count is already written
+        attempts = max(self.backend.increment(key, self.window_seconds), (user.logon_attempt or 0) + 1)
+        with self._lock:
+            if attempts > self.max_attempts:
+                self._pending.discard(account)
+            else:
+                self._pending.add(account)
+                if self._pending_since is None:
+                    self._pending_since = time.monotonic()
+
+        if attempts > self.max_attempts:
+            self._lock_account(user, attempts)
+            self.backend.clear(key)
+            return True
+        if self.flush_due():
+            self.flush()
+        return False
+
+    def record_success(self, email, user):
+        """Forgets the account's unflushed failures and resets the email window."""
+        with self._lock:
+            self._pending.discard((user.id, user.org_id))
+        self.backend.clear(self._account_key(user.id, user.org_id))
+        self.backend.clear(EMAIL_KEY + (email or '').strip().lower())
+
+    def flush_due(self):
+        with self._lock:
+            if not self._pending:
+                return False
+            return (len(self._pending) >= self.flush_size
+                    or time.monotonic() - self._pending_since >= self.flush_seconds)
+
+    def flush(self):
+        """
+        Writes the current count of every pending account in one executemany UPDATE.
+
+        Returns:
+            int: Number of accounts written.
+        """
+        from app import db
+        from app.models import User
+
+        with self._lock:
+            pending, self._pending, self._pending_since = self._pending, set(), None
+        counts = {account: self.backend.count(self._account_key(*account)) for account in pending}
+        counts = {account: attempts for account, attempts in counts.items() if attempts}
+        if not counts:
+            return 0
+
+        user_table = User.__table__
+        statement = (
+            update(user_table)
+            .where(user_table.c.id == bindparam('b_id'), user_table.c.org_id == bindparam('b_org_id'))
+            # Never lower a count another worker already wrote
+            .values(logon_attempt=case(
+                (user_table.c.logon_attempt < bindparam('b_attempts'), bindparam('b_attempts')),
+                else_=user_table.c.logon_attempt,
+            ))
+        )
+        with db.engine.begin() as connection:
+            connection.execute(statement, [
+                {'b_id': user_id, 'b_org_id': org_id, 'b_attempts': attempts}
+                for (user_id, org_id), attempts in counts.items()
+            ])
+        return len(counts)
+
+    def _lock_account(self, user, attempts):
+        from app import db
+        from app.models import User
+
+        user_table = User.__table__
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(user_table)
+                .where(user_table.c.id == user.id, user_table.c.org_id == user.org_id)
+                .values(logon_attempt=attempts, locked=True)
+            )
+        # Reflect the write without flushing anything else pending on the session
+        set_committed_value(user, 'logon_attempt', attempts)
+        set_committed_value(user, 'locked', True)
+        current_app.security_logger.critical(f'Account locked for user: {user.id}')
+
+
+login_throttle = LoginThrottle()
+
+
+def init_login_throttle(app):
+    """
+    Configures login throttling from app config. LOGIN_THROTTLE_BACKEND 'cache' keeps
+    the sliding windows in the Flask-Caching backend; 'memory' keeps them per process.
+    """
+    from app.extensions import cache
+
+    backend_name = app.config.get('LOGIN_THROTTLE_BACKEND', 'memory')
+    if backend_name == 'cache':
+        backend = CacheAttemptBackend(cache)
+    elif backend_name == 'memory':
+        backend = MemoryAttemptBackend()
+    else:
+        raise ValueError(f'Unknown LOGIN_THROTTLE_BACKEND: {backend_name}')
+
+    login_throttle.configure(
+        backend=backend,
+        window_seconds=app.config.get('LOGIN_THROTTLE_WINDOW_SECONDS', 900),
+        max_per_email=app.config.get('LOGIN_THROTTLE_MAX_PER_EMAIL', 10),
+        max_per_ip=app.config.get('LOGIN_THROTTLE_MAX_PER_IP', 50),
+        max_attempts=app.config.get('LOGIN_MAX_ATTEMPTS', 5),
+        flush_size=app.config.get('LOGIN_ATTEMPT_FLUSH_SIZE', 50),
+        flush_seconds=app.config.get('LOGIN_ATTEMPT_FLUSH_SECONDS', 5),
+    )
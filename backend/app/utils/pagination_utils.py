@@ -1,12 +1,55 @@
-from flask import request
+import base64
+import json
+from flask import request, current_app
+
+def _get_per_page():
+    """Reads `per_page` from the query string, clamped to 1..MAX_PER_PAGE."""
+    per_page = request.args.get('per_page', default=10, type=int)
+    return max(1, min(per_page, current_app.config.get('MAX_PER_PAGE', 100)))
+
 
 def get_pagination_params():
     """
     Extracts pagination parameters from the request query string.
     
     Returns:
-        dict: Pagination parameters with defaults.
+        dict: Pagination parameters with defaults; per_page is clamped to MAX_PER_PAGE.
     """
-    page = request.args.get('page', default=1, type=int)
-    per_page = request.args.get('per_page', default=10, type=int)
-    return {"page": page, "per_page": per_page}
+    page = max(request.args.get('page', default=1, type=int), 1)
+    return {"page": page, "per_page": _get_per_page()}
+
+
+def get_cursor_params(default_sort='title'):
+    """
+    Extracts keyset (cursor) pagination parameters from the request query string.
+
+    Returns:
+        dict: cursor (None for the first page), per_page (clamped to MAX_PER_PAGE) and sort key.
+    """
+    cursor = request.args.get('cursor') or None
+    sort = request.args.get('sort', default=default_sort)
+    return {"cursor": cursor, "per_page": _get_per_page(), "sort": sort}
+
+
+def encode_cursor(position):
+    """
+    Encodes a keyset position (a JSON-serializable dict) as an opaque URL-safe cursor.
+    """
+    raw = json.dumps(position, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+    if not isinstance(position, dict):
+        raise ValueError(f'Invalid cursor: {cursor}')
+    return position
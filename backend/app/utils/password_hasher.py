@@ -0,0 +1,156 @@
+# utils/password_hasher.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the login concurrency cap is reached; the caller should answer 503."""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing pool is at capacity')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool.
+
+    check() still waits for its result, so each admitted login holds its request thread
+    for the whole verification (queue wait + bcrypt). Admission is therefore capped at
+    `max_in_flight`: `max_workers + max_queue`, but never more than `max_concurrent_logins`,
+    which is sized below the WSGI server's threads per worker so a login burst cannot take
+    every thread. Beyond the cap check() raises PasswordHasherBusy immediately.
+    """
+
+    def __init__(self, max_workers=4, max_queue=32, retry_after=2, rounds=12, latency_samples=1024,
+                 max_concurrent_logins=None):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._latencies = deque(maxlen=latency_samples)
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self.configure(max_workers, max_queue, retry_after, rounds, max_concurrent_logins)
+
+    def configure(self, max_workers, max_queue, retry_after, rounds, max_concurrent_logins=None):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.max_workers = max_workers
+            self.max_queue = max_queue
+            self.retry_after = retry_after
+            self.rounds = rounds
+            self.max_in_flight = max_workers + max_queue
+            if max_concurrent_logins:
+                self.max_in_flight = min(self.max_in_flight, max_concurrent_logins)
+
+    def _get_executor(self):
+        # Created on first use so pre-forking servers start their threads per worker
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with a bcrypt cost other than the configured one."""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _check(self, password_hash, password):
+        from app.models.authorization_models import bcrypt
+
+        with self._lock:
+            self._running += 1
+        try:
+            if not bcrypt.check_password_hash(password_hash, password):
+                return False, None
+            if self.needs_rehash(password_hash):
+                return True, bcrypt.generate_password_hash(password, self.rounds).decode('utf-8')
+            return True, None
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def check(self, password_hash, password):
+        """
+        Verifies `password` against `password_hash` on the pool, blocking until it is done.
+
+        Returns:
+            tuple: (verified, new_hash). new_hash is set when the password matched and
+                   the stored hash should be replaced to reach the configured cost.
+
+        Raises:
+            PasswordHasherBusy: If `max_in_flight` logins are already being verified.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                raise PasswordHasherBusy(self.retry_after)
+            self._in_flight += 1
+            executor = self._get_executor()
+
+        start = time.perf_counter()
+        try:
+            verified, new_hash = executor.submit(self._check, password_hash, password).result()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._latencies.append(elapsed_ms)
+        if new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return verified, new_hash
+
+    def metrics(self):
+        """Snapshot of pool load and verification latency (queue wait + bcrypt) in milliseconds."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+            running = self._running
+            snapshot = {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': in_flight,
+                'queue_depth': max(in_flight - running, 0),
+                'completed_total': self._completed,
+                'rejected_total': self._rejected,
+                'rehashed_total': self._rehashed,
+            }
+
+        def percentile(p):
+            return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)], 2) if latencies else None
+
+        snapshot['latency_ms'] = {
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'max': round(latencies[-1], 2) if latencies else None,
+        }
+        return snapshot
+
+
+password_hasher = PasswordHasher()
+
+
+def init_password_hasher(app):
+    """
+    Sizes the hashing pool from app config and applies BCRYPT_LOG_ROUNDS to new hashes.
+    """
+    from app.models.authorization_models import bcrypt
+
+    bcrypt.init_app(app)
+    password_hasher.configure(
+        max_workers=app.config.get('PASSWORD_HASH_WORKERS', 4),
+        max_queue=app.config.get('PASSWORD_HASH_MAX_QUEUE', 32),
+        retry_after=app.config.get('PASSWORD_HASH_RETRY_AFTER', 2),
+        rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12),
+        max_concurrent_logins=app.config.get('PASSWORD_HASH_MAX_CONCURRENT_LOGINS'),
+    )
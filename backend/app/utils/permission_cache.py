@@ -0,0 +1,360 @@
+# utils/permission_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase, Insert
+from app.utils.cache_utils import get_generation, bump_generation, cache_get, cache_set, cache_delete_many
+
+# Tables whose rows feed into a user's effective permissions
+PERMISSION_TABLES = frozenset({
+    'user_securityroles',
+    'securityrole_authorizations',
+    'authorization',
+    'resource',
+    'action',
+})
+# Tables mirrored by the in-memory name->id catalog
+CATALOG_TABLES = frozenset({'resource', 'action'})
+# Tables user_effective_permission is derived from (see effective_permission_service)
+ROLE_TABLES = frozenset({'user_securityroles', 'securityrole_authorizations', 'authorization'})
+_PENDING_KEY = 'permission_cache_pending'
+_VERSIONS_PENDING_KEY = 'permission_versions_pending'
+_ROLE_WRITES_KEY = 'permission_role_writes'
+_REFRESHED_KEY = 'effective_permissions_refreshed'
+# Shared (flask_caching) key holding the RBAC generation the permission LRU syncs with
+RBAC_GENERATION_KEY = 'rbac:generation'
+# Shared (flask_caching) key prefix caching a user's durable permission version (user.permission_version)
+PERMISSION_VERSION_KEY_PREFIX = 'rbac:pv'
+# Cache backends that live in one worker's memory and so cannot carry other workers' bumps
+PROCESS_LOCAL_CACHE_TYPES = frozenset({'SimpleCache', 'simple', 'NullCache', 'null'})
+
+CatalogLayout = namedtuple('CatalogLayout', ['version', 'resource_index', 'action_index'])
+
+
+class PermissionCache:
+    """
+    Bounded LRU cache of compiled permission sets keyed by (org_id, user_id).
+
+    Every clear() bumps `generation`; a set compiled under an older generation is
+    dropped by put() so a load racing with an invalidation cannot re-cache stale data.
+    Entries expire after `ttl` seconds (0 keeps them until evicted), which bounds how
+    long a write made by another worker can go unseen.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.shared_generation = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value, generation=None):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def sync(self, shared_generation):
+        """
+        Clears the cache when the shared RBAC generation differs from the one last
+        seen, i.e. a permission write was committed by another worker. An unknown
+        generation (cache down) is ignored; entries then live out their TTL.
+        """
+        if shared_generation is None or shared_generation == self.shared_generation:
+            return
+        with self._lock:
+            if shared_generation != self.shared_generation:
+                self._data.clear()
+                self.generation += 1
+                self.shared_generation = shared_generation
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+class PermissionCatalog:
+    """
+    Immutable name->id maps for the small `resource` and `action` tables.
+
+    Loaded at app start and lazily reloaded after a write to either table. Names are
+    also given a stable sorted position (`layout`) that defines
+    the bit layout of JWT permission claims, fingerprinted by `layout.version`.
+    """
+
+    def __init__(self):
+        self.resources = MappingProxyType({})
+        self.actions = MappingProxyType({})
+        self.layout = CatalogLayout(None, MappingProxyType({}), MappingProxyType({}))
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        from app import db
+        from app.models import Resource, Action
+
+        resources = dict(db.session.query(Resource.name, Resource.id).all())
+        actions = dict(db.session.query(Action.name, Action.id).all())
+        resource_names = sorted(resources)
+        action_names = sorted(actions)
+        fingerprint = '|'.join(resource_names) + '#' + '|'.join(action_names)
+        with self._lock:
+            self.resources = MappingProxyType(resources)
+            self.actions = MappingProxyType(actions)
+            self.layout = CatalogLayout(
+                hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:8],
+                MappingProxyType({name: i for i, name in enumerate(resource_names)}),
+                MappingProxyType({name: i for i, name in enumerate(action_names)}),
+            )
+            self.loaded = True
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.refresh()
+        return self
+
+    def invalidate(self):
+        self.loaded = False
+
+    def resolve(self, resource_name, action_name):
+        """
+        Returns (resource_id, action_id); either is None when the name is unknown.
+        """
+        self.ensure_loaded()
+        return self.resources.get(resource_name), self.actions.get(action_name)
+
+
+permission_cache = PermissionCache()
+permission_catalog = PermissionCatalog()
+
+
+def _rbac_generation_timeout():
+    """
+    Returns how long an RBAC generation token may live in the cache.
+
+    With a process-local CACHE_TYPE other workers never see a bump, so the token
+    expires after PERMISSION_CACHE_TTL and the LRU synced with it is dropped at least
+    that often. A shared backend (RedisCache) keeps it until bumped.
+    """
+    if has_app_context() and current_app.config.get('CACHE_TYPE') in PROCESS_LOCAL_CACHE_TYPES:
+        return current_app.config.get('PERMISSION_CACHE_TTL', 60)
+    return 0
+
+
+def get_rbac_generation():
+    """
+    Returns the current RBAC generation token from the shared cache, creating one if absent.
+
+    Every committed permission write replaces it, so each worker's LRU can tell that
+    another worker wrote. Multi-worker deployments need CACHE_TYPE=RedisCache for writes
+    to be seen at once; otherwise see _rbac_generation_timeout. JWT claims and ETags use
+    the per-user get_permission_version instead.
+    """
+    return get_generation(RBAC_GENERATION_KEY, _rbac_generation_timeout())
+
+
+def bump_rbac_generation():
+    bump_generation(RBAC_GENERATION_KEY, _rbac_generation_timeout())
+
+
+def _permission_version_key(user_id):
+    return f'{PERMISSION_VERSION_KEY_PREFIX}:{user_id}'
+
+
+def get_permission_version(user_id):
+    """
+    Returns the user's permission version (user.permission_version), read through the shared cache.
+
+    The column is bumped in the transaction that changes the user's effective permissions
+    and the cached copy is dropped once it commits (mark_permission_versions_changed), so
+    the version is the same in every worker and unaffected by other users' or orgs' writes.
+    Cached copies also expire after PERMISSION_CACHE_TTL, which bounds how long a process-local
+    CACHE_TYPE can serve a version another worker changed. Returns None if it cannot be read.
+    """
+    from app import db
+    from app.models import User
+
+    key = _permission_version_key(user_id)
+    version = cache_get(key)
+    if version is not None:
+        return version
+    try:
+        version = db.session.scalar(select(User.permission_version).where(User.id == user_id))
+    except SQLAlchemyError as e:
+        current_app.logger.error(f'get_permission_version failed for user {user_id}: {e}')
+        return None
+    if version is None:
+        return None
+    cache_set(key, version, timeout=current_app.config.get('PERMISSION_CACHE_TTL', 60))
+    return version
+
+
+def mark_permission_versions_changed(conn, user_ids):
+    """
+    Records that `conn`'s transaction bumped these users' permission versions; their
+    cached copies are dropped when it commits.
+    """
+    conn.info.setdefault(_VERSIONS_PENDING_KEY, set()).update(user_ids)
+
+
+class StaleOrganizations:
+    """
+    Organizations whose role tables were written without refreshing user_effective_permission,
+    awaiting rebuild_stale_effective_permissions. None stands for "unknown, rebuild all".
+    """
+
+    def __init__(self):
+        self._orgs = set()
+        self._lock = threading.Lock()
+
+    def add(self, org_ids):
+        with self._lock:
+            self._orgs.update(org_ids)
+
+    def discard(self, org_id):
+        with self._lock:
+            if org_id is None:
+                self._orgs.clear()
+            else:
+                self._orgs.discard(org_id)
+
+    def take(self):
+        with self._lock:
+            orgs, self._orgs = self._orgs, set()
+            return orgs
+
+    def __bool__(self):
+        return bool(self._orgs)
+
+
+stale_organizations = StaleOrganizations()
+
+
+def mark_effective_permissions_refreshed(conn):
+    """
+    Records that `conn`'s transaction refreshes user_effective_permission for its role-table
+    writes (the authorization_service helpers, rebuild_effective_permissions).
+    """
+    conn.info[_REFRESHED_KEY] = True
+
+
+def _bound_org_ids(clauseelement, multiparams, params):
+    """Returns the org_id values a role-table statement binds, or {None} if it binds none."""
+    rows = list(multiparams or []) + ([params] if params else [])
+    org_ids = {row['org_id'] for row in rows if isinstance(row, dict) and row.get('org_id')}
+    if not org_ids:
+        bound = clauseelement.compile().params
+        org_ids = {value for key, value in bound.items() if value and (key == 'org_id' or key.startswith('org_id_'))}
+    return org_ids or {None}
+
+
+def _written_table(clauseelement):
+    if not isinstance(clauseelement, UpdateBase):
+        return None
+    table = getattr(clauseelement, 'table', None)
+    name = getattr(table, 'name', None)
+    return name if name in PERMISSION_TABLES else None
+
+
+def _invalidate(tables):
+    permission_cache.clear()
+    if tables & CATALOG_TABLES:
+        permission_catalog.invalidate()
+
+
+def _on_before_execute(conn, clauseelement, multiparams, params, execution_options):
+    # Covers ORM flushes (including secondary/association rows) and Core DML alike.
+    table_name = _written_table(clauseelement)
+    if table_name:
+        conn.info.setdefault(_PENDING_KEY, set()).add(table_name)
+        _invalidate({table_name})
+        # New authorization rows are not granted to any role yet, so only their updates/deletes count
+        if table_name in ROLE_TABLES and not (table_name == 'authorization' and isinstance(clauseelement, Insert)):
+            conn.info.setdefault(_ROLE_WRITES_KEY, set()).update(_bound_org_ids(clauseelement, multiparams, params))
+
+
+def _on_commit(conn):
+    # Clear again once the write is committed so nothing loaded mid-transaction survives.
+    tables = conn.info.pop(_PENDING_KEY, None)
+    if tables:
+        _invalidate(tables)
+        bump_rbac_generation()
+    user_ids = conn.info.pop(_VERSIONS_PENDING_KEY, None)
+    if user_ids and has_app_context():
+        cache_delete_many(_permission_version_key(user_id) for user_id in user_ids)
+    role_orgs = conn.info.pop(_ROLE_WRITES_KEY, None)
+    refreshed = conn.info.pop(_REFRESHED_KEY, False)
+    if role_orgs and not refreshed:
+        stale_organizations.add(role_orgs)
+        if has_app_context():
+            orgs = ', '.join(sorted(org_id or 'all' for org_id in role_orgs))
+            current_app.logger.warning(
+                f'Role tables written without refreshing user_effective_permission (orgs: {orgs}); '
+                f'flagged for rebuild after the current request. Use the authorization_service '
+                f'helpers, or run `flask rebuild-permissions` after scripted writes.'
+            )
+
+
+def _on_rollback(conn):
+    conn.info.pop(_PENDING_KEY, None)
+    conn.info.pop(_VERSIONS_PENDING_KEY, None)
+    conn.info.pop(_ROLE_WRITES_KEY, None)
+    conn.info.pop(_REFRESHED_KEY, None)
+
+
+def init_permission_cache(app):
+    """
+    Sizes the permission cache and sets its TTL, registers the write listeners and loads the catalog.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        None
+    """
+    permission_cache.maxsize = app.config.get('PERMISSION_CACHE_MAXSIZE', 1024)
+    permission_cache.ttl = app.config.get('PERMISSION_CACHE_TTL', 60)
+    permission_cache.shared_generation = None
+    permission_cache.clear()
+
+    if not event.contains(Engine, 'before_execute', _on_before_execute):
+        event.listen(Engine, 'before_execute', _on_before_execute)
+        event.listen(Engine, 'commit', _on_commit)
+        event.listen(Engine, 'rollback', _on_rollback)
+
+    permission_catalog.invalidate()
+    with app.app_context():
+        try:
+            permission_catalog.refresh()
+        except SQLAlchemyError as e:
+            # Tables may not exist yet (fresh database, migrations pending); load on first check.
+            current_app.logger.debug(f'Permission catalog not loaded at startup: {e}')
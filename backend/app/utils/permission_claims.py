@@ -0,0 +1,223 @@
+# utils/permission_claims.py
+import base64
+import time
+from datetime import timedelta
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import get_jwt
+from app.utils.permission_cache import permission_catalog, get_permission_version
+
+JWT_KEY_PERMISSIONS = 'perms'
+JWT_KEY_PERMISSION_VERSION = 'pv'
+
+# Response header set when stale claims were replaced, telling clients to refetch /api/authorizations
+PERMISSIONS_STALE_HEADER = 'X-Permissions-Stale'
+
+# Bump when the bit layout itself changes so old tokens are never misread
+PERMISSION_CLAIMS_FORMAT = 1
+
+
+class PermissionClaims:
+    """
+    Decoded resource x action bit matrix carried in a JWT.
+
+    Bit `r * len(actions) + a` is set when the action at sorted position `a` is
+    granted on the resource at sorted position `r` (see PermissionCatalog.layout).
+    """
+    __slots__ = ('mask', 'resource_index', 'action_index', 'width')
+
+    def __init__(self, mask, layout):
+        self.mask = mask
+        self.resource_index = layout.resource_index
+        self.action_index = layout.action_index
+        self.width = len(layout.action_index)
+
+    def allows(self, resource_name, action_name):
+        resource_pos = self.resource_index.get(resource_name)
+        action_pos = self.action_index.get(action_name)
+        if resource_pos is None or action_pos is None:
+            return False
+        bit = resource_pos * self.width + action_pos
+        byte = bit >> 3
+        return byte < len(self.mask) and bool(self.mask[byte] & (1 << (bit & 7)))
+
+
+def permission_version(layout, user_id):
+    """
+    Returns the user's permission-claims version: claims format, catalog layout and the
+    user's durable permission version. None if the latter cannot be read, so no claims
+    are issued or trusted.
+    """
+    user_version = get_permission_version(user_id)
+    if user_version is None:
+        return None
+    return f'{PERMISSION_CLAIMS_FORMAT}.{layout.version}.{user_version}'
+
+
+def encode_permission_mask(permissions, layout):
+    """
+    Packs (resource_name, action_name) pairs into a base64url bit matrix.
+
+    Args:
+        permissions (iterable): Pairs of resource and action names.
+        layout (CatalogLayout): Catalog positions defining the bit order.
+
+    Returns:
+        str: Unpadded base64url string.
+    """
+    width = len(layout.action_index)
+    mask = bytearray((len(layout.resource_index) * width + 7) // 8)
+    for resource_name, action_name in permissions:
+        resource_pos = layout.resource_index.get(resource_name)
+        action_pos = layout.action_index.get(action_name)
+        if resource_pos is None or action_pos is None:
+            continue
+        bit = resource_pos * width + action_pos
+        mask[bit >> 3] |= 1 << (bit & 7)
+    return base64.urlsafe_b64encode(bytes(mask)).rstrip(b'=').decode('ascii')
+
+
+def decode_permission_mask(encoded):
+    return base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+
+
+def build_permission_claims(org_id, user_id):
+    """
+    Builds the `perms`/`pv` claims for an access token at login and refresh.
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the user.
+
+    Returns:
+        dict: Additional JWT claims, or an empty dict if they could not be built
+              (checks for such tokens fall back to the database).
+    """
+    from app.utils.rbac_utils import load_permission_set
+
+    try:
+        catalog = permission_catalog.ensure_loaded()
+        layout = catalog.layout
+        # Stamp the version before reading grants so a concurrent change leaves the token stale;
+        # grants come from the database, not the LRU, which may lag the version
+        version = permission_version(layout, user_id)
+        if version is None:
+            return {}
+        resource_names = {resource_id: name for name, resource_id in catalog.resources.items()}
+        action_names = {action_id: name for name, action_id in catalog.actions.items()}
+        pairs = (
+            (resource_names.get(resource_id), action_names.get(action_id))
+            for resource_id, action_id in load_permission_set(org_id, user_id)
+        )
+        return {
+            JWT_KEY_PERMISSIONS: encode_permission_mask(pairs, layout),
+            JWT_KEY_PERMISSION_VERSION: version,
+        }
+    except Exception as e:
+        current_app.app_logger.error(f'build_permission_claims error: user_id: {user_id} org_id: {org_id}: {str(e)}')
+        return {}
+
+
+def decode_permission_claims(jwt_data):
+    """
+    Returns PermissionClaims for decoded JWT data, or None when the token carries no
+    claims or was issued under an older permission-schema version (the access token is then reissued after the request).
+    """
+    encoded = jwt_data.get(JWT_KEY_PERMISSIONS)
+    version = jwt_data.get(JWT_KEY_PERMISSION_VERSION)
+    if encoded is None or not version:
+        return None
+
+    layout = permission_catalog.ensure_loaded().layout
+    if version != permission_version(layout, jwt_data.get('sub')):
+        current_app.security_logger.info(f'Stale permission claims for user {jwt_data.get("sub")}: {version}')
+        return None
+    return PermissionClaims(decode_permission_mask(encoded), layout)
+
+
+def get_verified_jwt():
+    """Returns the decoded JWT verified for the current request, or None."""
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt()
+    except RuntimeError:
+        # verify_jwt_in_request() has not run for this request
+        return None
+
+
+def token_memo_key(jwt_data):
+    """Identifies a token for per-request memos; a reissued token keeps its jti but not its pv."""
+    return jwt_data.get('jti'), jwt_data.get(JWT_KEY_PERMISSION_VERSION)
+
+
+def current_permission_claims():
+    """
+    Decodes the current request's permission claims once and memoizes them on `g`,
+    keyed by the token (see token_memo_key) so an app context spanning requests never reuses them.
+    """
+    if not has_request_context():
+        return None
+    jwt_data = get_verified_jwt()
+    if not jwt_data:
+        return None
+    memo = g.get('_permission_claims')
+    if memo is not None and memo[0] == token_memo_key(jwt_data):
+        return memo[1]
+    claims = decode_permission_claims(jwt_data)
+    g._permission_claims = (token_memo_key(jwt_data), claims)
+    if claims is None and jwt_data.get(JWT_KEY_PERMISSIONS) is not None:
+        # Checks fall back to the database; reissue_stale_access_token replaces the token
+        g._stale_permission_jwt = jwt_data
+    return claims
+
+
+def reissue_stale_access_token(response):
+    """
+    after_request hook: when the request's permission claims were stale, sets a new access
+    cookie carrying current claims, so later requests stop falling back to the database.
+
+    The new token keeps the old one's jti, CSRF value and expiry: logout still revokes it and
+    the client's X-CSRF-TOKEN header stays valid. Responses that set the access cookie
+    themselves (login, logout) are left alone.
+    """
+    from app.utils.jwt_utils import create_token, set_access_token_cookie
+
+    # The request's permission memos end with it, even when its app context lives on
+    g.pop('_permission_claims', None)
+    g.pop('_request_permissions', None)
+    jwt_data = g.pop('_stale_permission_jwt', None)
+    if jwt_data is None:
+        return response
+    cookie_name = current_app.config.get('JWT_ACCESS_COOKIE_NAME', 'access_token')
+    if any(cookie.startswith(f'{cookie_name}=') for cookie in response.headers.getlist('Set-Cookie')):
+        return response
+    remaining = int(jwt_data.get('exp', 0) - time.time())
+    if remaining <= 0:
+        return response
+
+    user_id = jwt_data.get('sub')
+    org_id = jwt_data.get('org_id')
+    claims = build_permission_claims(org_id, user_id)
+    if not claims:
+        return response
+    claims['jti'] = jwt_data['jti']
+    if 'csrf' in jwt_data:
+        claims['csrf'] = jwt_data['csrf']
+    access_token = create_token(user_id, timedelta(seconds=remaining), org_id=org_id, claims=claims)
+    set_access_token_cookie(response, access_token, max_age=remaining)
+    response.headers[PERMISSIONS_STALE_HEADER] = '1'
+    current_app.security_logger.info(f'Reissued access token with current permission claims for user {user_id}')
+    return response
+
+
+def init_permission_claims(app):
+    """
+    Registers the hook that replaces access tokens whose permission claims went stale.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        None
+    """
+    app.after_request(reissue_stale_access_token)
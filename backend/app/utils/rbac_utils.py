@@ -1,58 +1,103 @@
 # utils/rbac_utils.py
 #from app.utils.logging_config import app_logger, security_logger
-from flask import current_app
-from flask_jwt_extended import get_jwt
+import hashlib
+from flask import current_app, g, has_request_context
+from sqlalchemy import select, exists, literal
+from app.utils.permission_cache import permission_cache, permission_catalog, get_rbac_generation
+from app.utils.permission_claims import current_permission_claims, get_verified_jwt, token_memo_key
 
 JWT_KEY_ORG_ID = 'org_id'
 JWT_KEY_ROLES = 'roles'
 JWT_KEY_SUB = 'sub'
-JWT_KEY_PERMISSIONS = 'permissions'
 
-def get_user_permissions(org_id, user_id):
-    from app import db
-    from app.models import Authorization, Resource, Action, SecurityRole, User, Organization, user_securityroles, securityrole_authorizations
-    # A function to fetch all authorizations/permissions the user has.
+def get_user_permissions(org_id, user_id, raise_errors=False):
+    """
+    Lists all authorizations/permissions the user has, from the compiled permission set.
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the user.
+        raise_errors (bool, optional): Re-raise database errors instead of returning [].
+
+    Returns:
+        list: Permissions as [{"resource": ..., "action": ...}].
+    """
     try:
-        user_permissions_query = db.session.query(Action.name.label('action'), Resource.name.label('resource')) \
-            .join(Authorization, Action.id == Authorization.action_id) \
-            .join(Resource, Authorization.resource_id == Resource.id) \
-            .join(securityrole_authorizations, Authorization.id == securityrole_authorizations.c.authorization_id) \
-            .join(SecurityRole, securityrole_authorizations.c.securityrole_id == SecurityRole.id) \
-            .join(user_securityroles, SecurityRole.id == user_securityroles.c.securityrole_id) \
-            .join(User, (User.id == user_securityroles.c.user_id) & (User.org_id == user_securityroles.c.org_id)) \
-            .filter(User.id == user_id, User.org_id == org_id) \
-            .all()
-        # Map the permissions as a list of dicts
-        permissions = [{"resource": permission.resource, "action": permission.action} for permission in user_permissions_query]
-        return permissions
+        resource_names = {resource_id: name for name, resource_id in permission_catalog.ensure_loaded().resources.items()}
+        action_names = {action_id: name for name, action_id in permission_catalog.actions.items()}
+        return [
+            {"resource": resource_names[resource_id], "action": action_names[action_id]}
+            for resource_id, action_id in get_permission_set(org_id, user_id)
+            if resource_id in resource_names and action_id in action_names
+        ]
 
     except Exception as e:
         current_app.app_logger.error(f'Error fetching user permissions: {str(e)}')
+        if raise_errors:
+            raise
         return []
 
+class CompiledPermissions:
+    """
+    Gives a compiled (resource_id, action_id) set the same `allows` interface as PermissionClaims.
+    """
+    __slots__ = ('permissions', 'resources', 'actions')
+
+    def __init__(self, permissions, catalog):
+        self.permissions = permissions
+        self.resources = catalog.resources
+        self.actions = catalog.actions
+
+    def allows(self, resource_name, action_name):
+        return (self.resources.get(resource_name), self.actions.get(action_name)) in self.permissions
+
+def get_request_permissions(org_id, user_id):
+    """
+    Resolves the caller's full permission set once per request and memoizes it on `g`.
+
+    Current JWT permission claims are used as-is; otherwise the compiled set is read
+    from the permission cache/database once. Returns None outside a request context.
+    """
+    if not has_request_context():
+        return None
+
+    # Keyed by the token too: an app context spanning requests must not reuse the set
+    jwt_data = get_verified_jwt()
+    memo_key = (org_id, user_id, token_memo_key(jwt_data) if jwt_data else None)
+    memo = g.get('_request_permissions')
+    if memo is not None and memo[0] == memo_key:
+        return memo[1]
+
+    permissions = current_permission_claims()
+    if permissions is None:
+        permissions = CompiledPermissions(get_permission_set(org_id, user_id), permission_catalog.ensure_loaded())
+    g._request_permissions = (memo_key, permissions)
+    return permissions
+
 def has_permission(org_id, user_id, resource_name, action_name):
-    print(f'has_permission - org_id: {org_id} /// user_id:{user_id} /// resource_name:{resource_name} /// action_name:{action_name}')
+    """
+    Checks a permission against the request's memoized permission set.
 
+    The set comes from the bitmask claims of the request's JWT when they are current,
+    else from the compiled database set. Outside a request (e.g. service calls from
+    scripts) this is has_permission_db.
+    """
     try:
-        # Extract JWT claims (org_id and permissions)
-        jwt_data = get_jwt()
-        
-        # Extract permissions from the JWT claims
-        jwt_org_id = jwt_data.get(JWT_KEY_ORG_ID)
-        jwt_user_id = jwt_data.get(JWT_KEY_SUB)  # 'sub' is the standard claim for user identity (user_id)
-        permissions = jwt_data.get(JWT_KEY_PERMISSIONS, [])
-        # Check if the token contains the correct org_id and user_id
-        if jwt_org_id != org_id or jwt_user_id != user_id:
-            current_app.security_logger.critical(f'JWT org_id/user_id mismatch: Expected org_id {org_id}, user_id {user_id}, but found org_id {jwt_org_id}, user_id {jwt_user_id}')
-            return False
+        jwt_data = get_verified_jwt()
+        if jwt_data:
+            jwt_org_id = jwt_data.get(JWT_KEY_ORG_ID)
+            jwt_user_id = jwt_data.get(JWT_KEY_SUB)  # 'sub' is the standard claim for user identity (user_id)
+            # Check if the token contains the correct org_id and user_id
+            if jwt_org_id != org_id or jwt_user_id != user_id:
+                current_app.security_logger.critical(f'JWT org_id/user_id mismatch: Expected org_id {org_id}, user_id {user_id}, but found org_id {jwt_org_id}, user_id {jwt_user_id}')
+                return False
 
-        # Check if the required permission exists in the JWT permissions
-        for permission in permissions:
-            if permission['resource'] == resource_name and permission['action'] == action_name:
-                print(f'[SUCCESS] JWT authorization found for user {user_id}')
-                return True
+        permissions = get_request_permissions(org_id, user_id)
+        if permissions is None:
+            return has_permission_db(org_id, user_id, resource_name, action_name)
 
-        # If no matching permission is found
+        if permissions.allows(resource_name, action_name):
+            return True
         current_app.security_logger.critical(f'Permission error: User: {user_id} Resource: {resource_name} Action: {action_name}')
         return False
 
@@ -60,54 +105,92 @@ def has_permission(org_id, user_id, resource_name, action_name):
         current_app.app_logger.critical(f'has_permission: Exception occurred: {str(e)}')
         return False
 
-def has_permission_db(org_id, user_id, resource_name, action_name):
+def get_permission_fingerprint(org_id, user_id, resource_name):
+    """
+    Returns a short hash of the actions the user is granted on `resource_name`.
+
+    Users whose grants on the resource are identical share the fingerprint, so it can
+    key cached results whose content depends on those grants.
+    """
+    permissions = get_request_permissions(org_id, user_id)
+    if permissions is None:
+        permissions = CompiledPermissions(get_permission_set(org_id, user_id), permission_catalog.ensure_loaded())
+    actions = sorted(action for action in permission_catalog.ensure_loaded().actions
+                     if permissions.allows(resource_name, action))
+    return hashlib.sha1(','.join(actions).encode('utf-8')).hexdigest()[:12]
+
+def load_permission_set(org_id, user_id):
+    """
+    Reads every (resource_id, action_id) pair granted to the user from user_effective_permission.
+
+    Args:
+        org_id (str): ID of the organization.
+        user_id (str): ID of the user.
+
+    Returns:
+        frozenset: Set of (resource_id, action_id) tuples.
+    """
     from app import db
-    from app.models import User, Resource, Action, Authorization, SecurityRole, user_securityroles, securityrole_authorizations
-    print(f'has_permission_db - org_id: {org_id} /// user_id:{user_id} /// resource_name:{resource_name} /// action_name:{action_name}')
-    
-    try:
-        # query parameter follow the sequence defined in model 
-        user = User.query.get((user_id, org_id))
-        if not user:
-            print(f'user NOT found: {user_id}')
-            current_app.security_logger.critical(f'has_permission: User not found - org_id: {org_id} user_id: {user_id} trying to access resource: {resource_name} to actoin {action_name}.')
-            return False 
-        else:
-            print(f'user found: {user.firstname}')
-        
-        # Query the Resource and Action from the database
-        resource = Resource.query.filter_by(name=resource_name).first()
-        action = Action.query.filter_by(name=action_name).first()
+    from app.models import user_effective_permission
 
-        if not resource:
+    rows = db.session.execute(
+        select(user_effective_permission.c.resource_id, user_effective_permission.c.action_id)
+        .where(user_effective_permission.c.org_id == org_id, user_effective_permission.c.user_id == user_id)
+    ).all()
+    return frozenset((resource_id, action_id) for resource_id, action_id in rows)
+
+def get_permission_set(org_id, user_id):
+    """
+    Returns the user's compiled permission set, loading it into the LRU cache on a miss.
+
+    The LRU is first synced with the shared RBAC generation so permission writes
+    committed by other workers drop its entries.
+    """
+    permission_cache.sync(get_rbac_generation())
+    key = (org_id, user_id)
+    permissions = permission_cache.get(key)
+    if permissions is None:
+        generation = permission_cache.generation
+        permissions = load_permission_set(org_id, user_id)
+        permission_cache.put(key, permissions, generation)
+    return permissions
+
+def permission_exists(org_id, user_id, resource_id, action_id):
+    """
+    Answers a single permission check with one EXISTS probe of the
+    user_effective_permission primary key.
+    """
+    from app import db
+    from app.models import user_effective_permission
+
+    grant = select(literal(1)).where(
+        user_effective_permission.c.org_id == org_id,
+        user_effective_permission.c.user_id == user_id,
+        user_effective_permission.c.resource_id == resource_id,
+        user_effective_permission.c.action_id == action_id,
+    )
+    return bool(db.session.scalar(select(exists(grant))))
+
+def has_permission_db(org_id, user_id, resource_name, action_name):
+    try:
+        resource_id, action_id = permission_catalog.resolve(resource_name, action_name)
+        if not resource_id:
             current_app.app_logger.critical(f'has_permission: Resource not found: {resource_name}')
             return False
-        if not action:
+        if not action_id:
             current_app.app_logger.critical(f'has_permission: Action not found: {action_name}')
             return False
-        
-        query = db.session.query(User.username) \
-            .join(user_securityroles, (User.id == user_securityroles.c.user_id) & (User.org_id == user_securityroles.c.org_id)) \
-            .join(SecurityRole, (user_securityroles.c.securityrole_id == SecurityRole.id) & (user_securityroles.c.org_id == SecurityRole.org_id)) \
-            .join(securityrole_authorizations, (SecurityRole.id == securityrole_authorizations.c.securityrole_id) & (SecurityRole.org_id == securityrole_authorizations.c.org_id)) \
-            .join(Authorization, securityrole_authorizations.c.authorization_id == Authorization.id) \
-            .join(Action, Authorization.action_id == action.id) \
-            .join(Resource, Authorization.resource_id == resource.id) \
-            .filter(Resource.name == resource_name) \
-            .filter(Action.name == action_name) \
-            .filter(User.org_id == org_id)
-        #print(str(query.statement))
-        authorizations = query.all()
-        #print(f'[INFO] authorizations returned from query: {authorizations}')
-
-        # Return True if the user has at least one authorization for the resource and action
-        if len(authorizations) > 0:
-            #print(f'[SUCCESS] Authorization found for user {user_id}')
-            return True
+
+        # With the LRU disabled every check is one EXISTS round trip
+        if permission_cache.maxsize > 0:
+            allowed = (resource_id, action_id) in get_permission_set(org_id, user_id)
         else:
-            #print(f'[FAILURE] No authorization found for user {user_id}')
-            return False
-    
+            allowed = permission_exists(org_id, user_id, resource_id, action_id)
+
+        if not allowed:
+            current_app.security_logger.warning(f'has_permission_db: denied - org_id: {org_id} user_id: {user_id} resource: {resource_name} action: {action_name}')
+        return allowed
+
     except Exception as e:
         current_app.app_logger.critical(f'has_permission: Exception occurred: {str(e)}')
         return False
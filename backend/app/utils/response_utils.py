@@ -1,6 +1,7 @@
-from flask import jsonify, make_response
+import hashlib
+from flask import jsonify, make_response, request
 
-def create_response(data=None, message="", status=200, headers=None):
+def create_response(data=None, message="", status=200, headers=None, etag=None, last_modified=None):
     """
     Creates a standardized Flask Response object.
     
@@ -9,6 +10,8 @@ def create_response(data=None, message="", status=200, headers=None):
         message (str): Message describing the response.
         status (int): HTTP status code.
         headers (dict): Additional headers to include.
+        etag (str): Strong ETag to attach; clients must revalidate before reuse.
+        last_modified (datetime): Last-Modified value to attach (naive values are UTC).
     
     Returns:
         Response: Flask Response object.
@@ -22,4 +25,32 @@ def create_response(data=None, message="", status=200, headers=None):
     if headers:
         for key, value in headers.items():
             response.headers[key] = value
+    if etag:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+def compute_etag(*parts):
+    """
+    Derives a strong ETag value from version components (ids, timestamps, counters).
+    """
+    return hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+def is_not_modified(etag):
+    """
+    Returns True when the request's If-None-Match already names `etag`.
+    """
+    return etag in request.if_none_match
+
+def create_not_modified_response(etag, last_modified=None):
+    """
+    Creates an empty 304 response carrying the current ETag (and Last-Modified, if given).
+    """
+    response = make_response("", 304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    if last_modified:
+        response.last_modified = last_modified
     return response
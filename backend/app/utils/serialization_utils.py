@@ -0,0 +1,92 @@
+# utils/serialization_utils.py
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: responses fall back to the stdlib encoder
+    orjson = None
+
+
+def format_dates(values):
+    """
+    Formats a column of dates/datetimes as 'YYYY-MM-DD'. Each distinct day is
+    formatted once, so a page of rows created on a few days costs a few calls.
+    """
+    formatted = {}
+    result = []
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        day = value.date() if isinstance(value, datetime) else value
+        text = formatted.get(day)
+        if text is None:
+            text = formatted[day] = day.isoformat()
+        result.append(text)
+    return result
+
+
+def serialize_rows(rows, fields, date_fields=()):
+    """
+    Serializes row tuples from a column-projected query into dicts.
+
+    Works column by column: the rows are transposed once, every date column is
+    formatted in bulk with format_dates, and the dicts are zipped back together.
+
+    Args:
+        rows (list): Row tuples whose values follow `fields`.
+        fields (tuple): Output key of each column.
+        date_fields (tuple, optional): Keys of the columns to format as 'YYYY-MM-DD'.
+
+    Returns:
+        list: One dict per row.
+    """
+    if not rows:
+        return []
+    columns = list(zip(*rows))
+    for index, field in enumerate(fields):
+        if field in date_fields:
+            columns[index] = format_dates(columns[index])
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+# Leading characters that make spreadsheet applications evaluate a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_safe_cell(value):
+    """
+    Neutralizes a CSV cell that a spreadsheet would run as a formula by prefixing
+    it with a single quote. Non-string values are returned unchanged.
+    """
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Encodes responses with orjson. Types orjson leaves alone (and datetimes, which
+    keep Flask's HTTP-date format) go through the default provider's `default`.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+
+def init_json_provider(app):
+    """
+    Installs the JSON_BACKEND encoder: 'orjson' (used when the package is installed)
+    or 'stdlib'.
+    """
+    backend = app.config.get('JSON_BACKEND', 'orjson')
+    if backend not in ('orjson', 'stdlib'):
+        raise ValueError(f'Unknown JSON_BACKEND: {backend}')
+    if backend == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,130 @@
+# utils/tag_index.py
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from app.utils.cache_utils import get_generation, bump_generation
+
+# Shared (flask_caching) key of an organization's tag generation
+TAG_GENERATION_KEY = 'tags:generation:{org_id}'
+
+
+def get_tag_generation(org_id):
+    """Returns the organization's tag generation; it changes on tag and tag-assignment writes only."""
+    return get_generation(TAG_GENERATION_KEY.format(org_id=org_id))
+
+
+def bump_tag_generation(org_id):
+    """Marks every worker's tag index of the organization stale. Call after commit; returns the new generation."""
+    return bump_generation(TAG_GENERATION_KEY.format(org_id=org_id))
+
+
+class OrgTagIndex:
+    """
+    Sorted prefix index of one organization's tag names.
+
+    `keys` holds (casefolded name, tag id) in order, so the tags starting with a
+    prefix are one contiguous slice found with two bisects. `tags` maps a tag id to
+    its [name, usage] entry; usage ranks the suggestions.
+    """
+    __slots__ = ('generation', 'keys', 'tags')
+
+    def __init__(self, generation, rows=()):
+        self.generation = generation
+        self.tags = {tag_id: [name, usage] for tag_id, name, usage in rows}
+        self.keys = sorted((name.casefold(), tag_id) for tag_id, (name, _) in self.tags.items())
+
+    def add(self, tag_id, name, usage=0):
+        if tag_id in self.tags:
+            return
+        self.tags[tag_id] = [name, usage]
+        insort(self.keys, (name.casefold(), tag_id))
+
+    def remove(self, tag_id):
+        entry = self.tags.pop(tag_id, None)
+        if entry is None:
+            return
+        key = (entry[0].casefold(), tag_id)
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+
+    def suggest(self, prefix, limit):
+        """Returns up to `limit` (id, name, usage) tuples whose name starts with `prefix`, most used first."""
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, (prefix,))
+        end = bisect_left(self.keys, (prefix + '\U0010ffff',), start)
+        # Ties on usage keep alphabetical order
+        ranked = heapq.nsmallest(limit, range(start, end), key=lambda i: (-self.tags[self.keys[i][1]][1], i))
+        return [(tag_id, *self.tags[tag_id]) for tag_id in (self.keys[i][1] for i in ranked)]
+
+
+class TagIndexCache:
+    """
+    Bounded LRU of per-organization tag indexes, kept in process memory.
+
+    Each index is stamped with the shared tag generation it was loaded under; get()
+    ignores an index whose stamp differs, so tag writes made by other workers are
+    picked up by rebuilding it.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, org_id, generation):
+        with self._lock:
+            index = self._data.get(org_id)
+            if index is None or index.generation != generation:
+                return None
+            self._data.move_to_end(org_id)
+            return index
+
+    def put(self, org_id, index):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[org_id] = index
+            self._data.move_to_end(org_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def suggest(self, org_id, generation, prefix, limit):
+        """Runs OrgTagIndex.suggest under the lock; None if no current index is cached."""
+        with self._lock:
+            index = self.get(org_id, generation)
+            return None if index is None else index.suggest(prefix, limit)
+
+    def update(self, org_id, old_generation, new_generation, apply):
+        """
+        Applies `apply(index)` to the organization's index if it is current as of
+        `old_generation` and restamps it with `new_generation`; otherwise drops it.
+        """
+        with self._lock:
+            index = self._data.get(org_id)
+            if index is None:
+                return
+            if index.generation != old_generation or new_generation is None:
+                del self._data[org_id]
+                return
+            apply(index)
+            index.generation = new_generation
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+tag_index_cache = TagIndexCache()
+
+
+def init_tag_index(app):
+    """
+    Sizes the tag index cache from TAG_INDEX_MAXSIZE (organizations kept; 0 disables).
+    """
+    tag_index_cache.maxsize = app.config.get('TAG_INDEX_MAXSIZE', 256)
+    tag_index_cache.clear()
@@ -0,0 +1,249 @@
+# utils/token_revocation.py
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import select, exists, delete
+from sqlalchemy.exc import SQLAlchemyError
+from app.utils.cache_utils import get_generation, bump_generation
+from app.utils.rbac_utils import JWT_KEY_ORG_ID, JWT_KEY_SUB
+
+# Shared (flask_caching) key bumped on every revocation so all workers resync their filters
+REVOCATION_GENERATION_KEY = 'token_revocation:generation'
+
+
+def _utcnow():
+    # revoked_token.expires_at is stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    `in` never reports a false negative; false positives occur at roughly
+    `error_rate` while no more than `capacity` items have been added.
+    """
+    __slots__ = ('size', 'hash_count', 'bits')
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(int(capacity), 1)
+        self.size = max(int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: two 64-bit halves of one digest give every probe position
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenRevocationList:
+    """
+    Revoked JWT ids: an in-process Bloom filter in front of the revoked_token table.
+
+    A token whose jti is not in the filter is answered from memory. Only filter
+    hits (revoked tokens and rare false positives) query the table. The filter is
+    rebuilt from the table when the shared revocation generation changes, i.e.
+    another worker revoked a token, and at least every `sync_seconds` (the only
+    trigger with a process-local CACHE_TYPE). Until a rebuild has succeeded every
+    check queries the table. Expired rows are pruned by `flask prune-revoked-tokens`.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001, sync_seconds=60):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._synced_at = None
+        self._generation = None
+        self._syncing = False
+        self._added_during_sync = None
+        self._lock = threading.Lock()
+
+    def configure(self, capacity, error_rate, sync_seconds):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        with self._lock:
+            self._bloom = BloomFilter(capacity, error_rate)
+            self._synced_at = None
+            self._generation = None
+
+    def add(self, jti):
+        with self._lock:
+            self._bloom.add(jti)
+            if self._added_during_sync is not None:
+                self._added_during_sync.append(jti)
+
+    def might_contain(self, jti):
+        return jti in self._bloom
+
+    def is_revoked(self, jti):
+        """
+        Returns True if the token with this jti has been revoked and has not yet expired.
+        """
+        if not jti:
+            return False
+        if not self.sync_if_due():
+            # The filter has never been loaded, so a miss proves nothing: ask the table
+            return self._denylisted(jti)
+        if jti not in self._bloom:
+            return False
+        return self._denylisted(jti)
+
+    def _denylisted(self, jti):
+        from app import db
+        from app.models import RevokedToken
+
+        try:
+            return bool(db.session.scalar(select(exists().where(
+                RevokedToken.jti == jti,
+                RevokedToken.expires_at > _utcnow(),
+            ))))
+        except SQLAlchemyError as e:
+            # Fail closed: the filter says this token may be revoked (or was never loaded)
+            current_app.security_logger.error(f'Revocation lookup failed for jti {jti}: {str(e)}')
+            return True
+
+    def sync_if_due(self):
+        """
+        Rebuilds the filter if it was never loaded, another worker revoked a token
+        since the last rebuild, or `sync_seconds` have passed.
+
+        Returns:
+            bool: True if the filter has been loaded successfully at least once.
+        """
+        generation = get_generation(REVOCATION_GENERATION_KEY)
+        synced_at = self._synced_at
+        if (synced_at is None
+                or (generation is not None and generation != self._generation)
+                or time.monotonic() - synced_at >= self.sync_seconds):
+            self.sync(generation)
+        return self._synced_at is not None
+
+    def sync(self, generation=None):
+        """
+        Rebuilds the filter from the unexpired denylist rows. Runs in its own
+        transaction so it never commits the caller's session; only one thread
+        rebuilds at a time while the others keep using the current filter.
+
+        Args:
+            generation (str, optional): Revocation generation read before the rebuild;
+                read here when omitted.
+
+        Returns:
+            bool: True if the filter was rebuilt.
+        """
+        from app import db
+        from app.models import RevokedToken
+
+        if generation is None:
+            generation = get_generation(REVOCATION_GENERATION_KEY)
+        with self._lock:
+            if self._syncing:
+                return False
+            self._syncing = True
+            self._added_during_sync = []
+        try:
+            with db.engine.begin() as conn:
+                jtis = conn.execute(
+                    select(RevokedToken.jti).where(RevokedToken.expires_at > _utcnow())
+                ).scalars().all()
+        except SQLAlchemyError as e:
+            # Leave _synced_at alone so the next check retries (and, before a first success, asks the table)
+            current_app.security_logger.error(f'Token revocation sync failed: {str(e)}')
+            with self._lock:
+                self._added_during_sync = None
+                self._syncing = False
+            return False
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            # Keep anything revoked in this process while the table was being read
+            for jti in self._added_during_sync:
+                bloom.add(jti)
+            self._added_during_sync = None
+            self._bloom = bloom
+            self._generation = generation
+            self._synced_at = time.monotonic()
+            self._syncing = False
+        return True
+
+
+token_revocation_list = TokenRevocationList()
+
+
+def revoke_token(jwt_data):
+    """
+    Adds a decoded JWT to the denylist until it expires.
+
+    Args:
+        jwt_data (dict): Decoded token (get_jwt() or decode_token()).
+
+    Returns:
+        bool: True if the token was revoked, False if it carries no jti/exp.
+    """
+    from app import db
+    from app.models import RevokedToken
+
+    jti = jwt_data.get('jti')
+    exp = jwt_data.get('exp')
+    if not jti or not exp:
+        return False
+
+    if db.session.get(RevokedToken, jti) is None:
+        db.session.add(RevokedToken(
+            jti=jti,
+            user_id=jwt_data.get(JWT_KEY_SUB),
+            org_id=jwt_data.get(JWT_KEY_ORG_ID),
+            token_type=jwt_data.get('type', 'access'),
+            expires_at=datetime.fromtimestamp(exp, timezone.utc).replace(tzinfo=None),
+        ))
+        db.session.commit()
+    token_revocation_list.add(jti)
+    bump_generation(REVOCATION_GENERATION_KEY)
+    current_app.security_logger.info(f'Token revoked: jti: {jti} user_id: {jwt_data.get(JWT_KEY_SUB)}')
+    return True
+
+
+def prune_revoked_tokens():
+    """Deletes denylist rows for tokens that have expired. Returns the number removed."""
+    from app import db
+    from app.models import RevokedToken
+
+    result = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow()))
+    db.session.commit()
+    return result.rowcount
+
+
+def _token_in_blocklist(jwt_header, jwt_payload):
+    return token_revocation_list.is_revoked(jwt_payload.get('jti'))
+
+
+def init_token_revocation(app):
+    """
+    Configures the revocation list from app config and registers it as
+    flask_jwt_extended's blocklist check.
+    """
+    from app.extensions import jwt
+
+    token_revocation_list.configure(
+        capacity=app.config.get('TOKEN_REVOCATION_BLOOM_CAPACITY', 100000),
+        error_rate=app.config.get('TOKEN_REVOCATION_BLOOM_ERROR_RATE', 0.001),
+        sync_seconds=app.config.get('TOKEN_REVOCATION_SYNC_SECONDS', 60),
+    )
+    jwt.token_in_blocklist_loader(_token_in_blocklist)
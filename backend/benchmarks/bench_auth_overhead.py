@@ -0,0 +1,77 @@
+# benchmarks/bench_auth_overhead.py
+"""
+Per-request authentication overhead of a protected route.
+
+    stacked      - the original `@inject_identity` + `@jwt_required()` pair:
+                   verify_jwt_in_request, decode_token of the cookie, then
+                   verify_jwt_in_request again (three signature checks)
+    single-pass  - the current `@inject_identity`: one verification, claims
+                   read back with get_jwt()
+
+Each iteration builds a request context carrying the access cookie and calls a
+view that only reads g.user_id / g.org_id, so the numbers are auth cost alone.
+
+Run from backend/:  python -m benchmarks.bench_auth_overhead
+"""
+from functools import wraps
+from unittest import mock
+from flask import g, request, current_app
+from flask_jwt_extended import jwt_required, verify_jwt_in_request, decode_token
+from flask_jwt_extended import jwt_manager
+from app.utils.auth_decorators import inject_identity
+from app.utils.jwt_utils import create_jwt_token
+from benchmarks.common import (
+    BENCH_ORG_ID, BENCH_USER_ID, create_bench_app, teardown_bench_app, seed_rbac, timed, print_table,
+)
+
+ITERATIONS = 5000
+
+
+def legacy_inject_identity(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        identity = decode_token(request.cookies.get(current_app.config["JWT_ACCESS_COOKIE_NAME"]))
+        g.user_id = identity.get("sub")
+        g.org_id = identity.get(current_app.config.get("JWT_KEY_ORG_ID", "org_id"))
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def view():
+    return g.user_id, g.org_id
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        seed_rbac()
+        token = create_jwt_token(BENCH_ORG_ID, BENCH_USER_ID).get_json()["data"]["access_token"]
+        headers = {"Cookie": f"{app.config['JWT_ACCESS_COOKIE_NAME']}={token}"}
+
+        rows = []
+        for label, protected in (
+            ("stacked", legacy_inject_identity(jwt_required()(view))),
+            ("single-pass", inject_identity(view)),
+        ):
+            def _request(i):
+                with app.test_request_context(headers=headers):
+                    protected()
+
+            _request(0)
+            # _decode_jwt is the signature-verifying decode behind every verification
+            with mock.patch.object(jwt_manager, "_decode_jwt", wraps=jwt_manager._decode_jwt) as decode:
+                micros = timed(_request, ITERATIONS)
+            rows.append((label, f"{decode.call_count / ITERATIONS:.2f}", f"{micros:.1f}"))
+
+        print_table(
+            f"Protected route auth: {ITERATIONS} requests",
+            ("path", "signature checks/request", "us/request"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
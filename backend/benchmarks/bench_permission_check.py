@@ -0,0 +1,83 @@
+# benchmarks/bench_permission_check.py
+"""
+Round trips and latency per has_permission_db check.
+
+    legacy  - the original implementation: User, Resource and Action lookups by
+              primary key/name followed by the six-way join (four statements)
+    exists  - catalog name->id resolution plus one EXISTS (LRU disabled)
+    cached  - compiled permission set served from the LRU
+
+Run from backend/:  python -m benchmarks.bench_permission_check
+"""
+from app import db
+from app.models import User, Resource, Action, Authorization, SecurityRole, user_securityroles, securityrole_authorizations
+from app.utils.permission_cache import permission_cache
+from app.utils.rbac_utils import has_permission_db
+from benchmarks.common import (
+    BENCH_ORG_ID, BENCH_USER_ID, create_bench_app, teardown_bench_app, seed_rbac, count_statements, timed, print_table,
+)
+
+ITERATIONS = 2000
+
+
+def legacy_has_permission_db(org_id, user_id, resource_name, action_name):
+    user = db.session.get(User, (user_id, org_id))
+    if not user:
+        return False
+    resource = Resource.query.filter_by(name=resource_name).first()
+    action = Action.query.filter_by(name=action_name).first()
+    if not resource or not action:
+        return False
+    query = db.session.query(User.username) \
+        .join(user_securityroles, (User.id == user_securityroles.c.user_id) & (User.org_id == user_securityroles.c.org_id)) \
+        .join(SecurityRole, (user_securityroles.c.securityrole_id == SecurityRole.id) & (user_securityroles.c.org_id == SecurityRole.org_id)) \
+        .join(securityrole_authorizations, (SecurityRole.id == securityrole_authorizations.c.securityrole_id) & (SecurityRole.org_id == securityrole_authorizations.c.org_id)) \
+        .join(Authorization, securityrole_authorizations.c.authorization_id == Authorization.id) \
+        .join(Action, Authorization.action_id == action.id) \
+        .join(Resource, Authorization.resource_id == resource.id) \
+        .filter(Resource.name == resource_name) \
+        .filter(Action.name == action_name) \
+        .filter(User.org_id == org_id)
+    return len(query.all()) > 0
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        resource_names, action_names = seed_rbac()
+        checks = [(r, a) for r in resource_names for a in action_names]
+
+        def check_with(fn):
+            def _check(i):
+                resource_name, action_name = checks[i % len(checks)]
+                # Expire identity-map state so the legacy User lookup is a real round trip
+                db.session.expire_all()
+                fn(BENCH_ORG_ID, BENCH_USER_ID, resource_name, action_name)
+            return _check
+
+        rows = []
+        original_maxsize = permission_cache.maxsize
+        for label, fn, maxsize in (
+            ("legacy", legacy_has_permission_db, original_maxsize),
+            ("exists", has_permission_db, 0),
+            ("cached", has_permission_db, original_maxsize),
+        ):
+            permission_cache.maxsize = maxsize
+            permission_cache.clear()
+            check_with(fn)(0)  # warm catalog / cache
+            with count_statements() as statements:
+                micros = timed(check_with(fn), ITERATIONS)
+            rows.append((label, f"{len(statements) / ITERATIONS:.2f}", f"{micros:.1f}"))
+        permission_cache.maxsize = original_maxsize
+
+        print_table(
+            f"has_permission_db: {ITERATIONS} checks over {len(checks)} (resource, action) pairs",
+            ("path", "round trips/check", "us/check"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,87 @@
+# benchmarks/bench_usergroup_import.py
+"""
+Bulk membership import: 100k (group, email) CSV rows into usergroup_user.
+
+    per-row - one row at a time: look up the group, the email and the existing
+              membership, INSERT, commit (measured on a sample and extrapolated).
+              Appending to UserGroup.users cannot be used at all: the relationship
+              leaves the NOT NULL created_by column empty.
+    import  - import_group_members: streamed CSV, batched resolution, dedupe,
+              one executemany INSERT per batch
+
+Run from backend/:  python -m benchmarks.bench_usergroup_import
+"""
+import io
+import time
+from app import db
+from app.models import User, UserGroup, usergroup_user
+from app.services.usergroup_service import import_group_members
+from benchmarks.common import (
+    BENCH_ORG_ID, BENCH_USER_ID, create_bench_app, teardown_bench_app, seed_rbac, seed_usergroups, seed_users,
+    count_statements, print_table,
+)
+
+GROUPS = 1_000
+USERS = 10_000
+ROWS = 100_000
+PER_ROW_SAMPLE = 2_000
+
+
+def pairs(count):
+    """Every user joins ROWS / USERS distinct groups."""
+    for n in range(count):
+        user, k = n % USERS, n // USERS
+        yield f"group-{(user * 7 + k * 101) % GROUPS:06d}", f"student{user:06d}@email.com"
+
+
+def csv_text(count):
+    return "group,email\n" + "".join(f"{group},{email}\n" for group, email in pairs(count))
+
+
+def per_row_import(count):
+    for group_id, email in pairs(count):
+        group = UserGroup.query.filter_by(id=group_id, org_id=BENCH_ORG_ID).first()
+        user = User.query.filter_by(email=email, org_id=BENCH_ORG_ID).first()
+        exists = db.session.execute(db.select(usergroup_user.c.user_id).filter_by(
+            org_id=BENCH_ORG_ID, group_id=group.id, user_id=user.id)).first()
+        if not exists:
+            db.session.execute(usergroup_user.insert().values(
+                org_id=BENCH_ORG_ID, group_id=group.id, user_id=user.id, created_by=BENCH_USER_ID))
+        db.session.commit()
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        seed_rbac(resources=["usergroup", "quiz"], actions=["create", "read", "update", "delete"])
+        seed_usergroups(GROUPS)
+        seed_users(USERS)
+        rows = []
+
+        with count_statements() as statements:
+            start = time.perf_counter()
+            per_row_import(PER_ROW_SAMPLE)
+            seconds = (time.perf_counter() - start) * ROWS / PER_ROW_SAMPLE
+        rows.append(("per-row", ROWS, f"{seconds:.2f} (from {PER_ROW_SAMPLE} rows)", len(statements) * ROWS // PER_ROW_SAMPLE))
+        db.session.execute(usergroup_user.delete())
+        db.session.commit()
+
+        text = csv_text(ROWS)
+        with count_statements() as statements:
+            start = time.perf_counter()
+            report = import_group_members(BENCH_ORG_ID, BENCH_USER_ID, io.StringIO(text))["data"]
+            seconds = time.perf_counter() - start
+        rows.append(("import", ROWS, f"{seconds:.2f}", len(statements)))
+        assert report["imported"] == ROWS and report["errorCount"] == 0, report
+
+        print_table(
+            f"Import {ROWS} memberships ({GROUPS} groups, {USERS} students)",
+            ("path", "rows", "seconds", "statements"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+# benchmarks/bench_usergroup_pagination.py
+"""
+Latency of page 1 versus page 1000 of GET /api/usergroups (25 rows per page).
+
+    offset  - get_user_groups: LIMIT/OFFSET plus COUNT(*) on every page
+    cursor  - get_user_groups_by_cursor: seek on the (org_id, title, id) index
+
+Run from backend/:  python -m benchmarks.bench_usergroup_pagination
+"""
+from app.models import UserGroup
+from app.services.usergroup_service import get_user_groups, get_user_groups_by_cursor
+from app.utils.pagination_utils import encode_cursor
+from benchmarks.common import (
+    BENCH_ORG_ID, BENCH_USER_ID, create_bench_app, teardown_bench_app, seed_rbac, seed_usergroups,
+    count_statements, timed, print_table,
+)
+
+PER_PAGE = 25
+DEEP_PAGE = 1000
+GROUPS = PER_PAGE * (DEEP_PAGE + 1)
+ITERATIONS = 50
+
+
+def cursor_for_page(page):
+    """The `next` cursor a client would hold after walking to `page` - 1."""
+    if page == 1:
+        return None
+    last = (UserGroup.query.filter_by(org_id=BENCH_ORG_ID)
+            .order_by(UserGroup.title, UserGroup.id)
+            .offset((page - 1) * PER_PAGE - 1).first())
+    return encode_cursor({"sort": "title", "value": last.title, "id": last.id, "direction": "next"})
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        seed_rbac(resources=["usergroup", "quiz"], actions=["create", "read", "update", "delete"])
+        seed_usergroups(GROUPS)
+
+        rows = []
+        for page in (1, DEEP_PAGE):
+            cursor = cursor_for_page(page)
+            for label, fetch in (
+                ("offset", lambda i, page=page: get_user_groups(BENCH_ORG_ID, BENCH_USER_ID, page=page, per_page=PER_PAGE)),
+                ("cursor", lambda i, cursor=cursor: get_user_groups_by_cursor(BENCH_ORG_ID, BENCH_USER_ID, cursor=cursor, per_page=PER_PAGE)),
+            ):
+                result = fetch(0)
+                assert len(result["data"]["rows"]) == PER_PAGE
+                with count_statements() as statements:
+                    micros = timed(fetch, ITERATIONS)
+                rows.append((label, page, f"{len(statements) / ITERATIONS:.2f}", f"{micros / 1000:.2f}"))
+
+        print_table(
+            f"GET /api/usergroups over {GROUPS} groups, {PER_PAGE} per page",
+            ("mode", "page", "statements/page", "ms/page"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
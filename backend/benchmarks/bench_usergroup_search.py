@@ -0,0 +1,62 @@
+# benchmarks/bench_usergroup_search.py
+"""
+User group search at 100k groups in one organization: first page (25 rows) plus
+the total, as GET /api/usergroups?search= computes them.
+
+    ilike  - the original filter: title/description ILIKE '%term%' (full scan)
+    fts    - filter_user_groups: FTS5 prefix match, ranked by bm25
+
+Run from backend/:  python -m benchmarks.bench_usergroup_search
+"""
+from sqlalchemy import or_
+from app.models import UserGroup
+from app.services.usergroup_service import filter_user_groups
+from benchmarks.common import (
+    BENCH_ORG_ID, create_bench_app, teardown_bench_app, seed_usergroups, timed, print_table,
+)
+
+GROUPS = 100_000
+PER_PAGE = 25
+ITERATIONS = 5
+TERMS = ("Chemistry 250", "Section 4242", "latin")
+
+
+def ilike_query(term):
+    pattern = f"%{term}%"
+    return UserGroup.query.filter_by(org_id=BENCH_ORG_ID).filter(
+        or_(UserGroup.title.ilike(pattern), UserGroup.description.ilike(pattern))
+    )
+
+
+def fts_query(term):
+    return filter_user_groups(UserGroup.query, BENCH_ORG_ID, search_term=term)["data"]
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        seed_usergroups(GROUPS, titles="subjects")
+
+        rows = []
+        for term in TERMS:
+            for label, build in (("ilike", ilike_query), ("fts", fts_query)):
+                def _search(i, build=build):
+                    query = build(term)
+                    query.limit(PER_PAGE).all()
+                    return query.order_by(None).count()
+
+                matches = _search(0)
+                micros = timed(_search, ITERATIONS)
+                rows.append((label, repr(term), matches, f"{micros / 1000:.2f}"))
+
+        print_table(
+            f"Search over {GROUPS} groups: first {PER_PAGE} rows + total",
+            ("filter", "term", "matches", "ms/search"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
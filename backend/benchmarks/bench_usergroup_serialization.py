@@ -0,0 +1,83 @@
+# benchmarks/bench_usergroup_serialization.py
+"""
+CPU time and peak memory to turn 10k user groups into a JSON response body.
+
+    orm+stdlib   - the original path: UserGroup objects -> serialize_user_group
+                   (strftime per date) -> jsonify with the stdlib encoder
+    rows+stdlib  - projected row tuples -> serialize_user_group_rows -> stdlib encoder
+    rows+orjson  - projected row tuples -> serialize_user_group_rows -> orjson encoder
+
+Run from backend/:  python -m benchmarks.bench_usergroup_serialization
+"""
+import time
+import tracemalloc
+from flask import current_app, jsonify
+from flask.json.provider import DefaultJSONProvider
+from app.models import UserGroup
+from app.services.usergroup_service import (
+    USERGROUP_LIST_COLUMNS, serialize_user_group, serialize_user_group_rows,
+)
+from app.utils.serialization_utils import OrjsonProvider, orjson
+from benchmarks.common import BENCH_ORG_ID, create_bench_app, teardown_bench_app, seed_usergroups, print_table
+
+ROWS = 10_000
+ITERATIONS = 5
+
+
+def orm_path():
+    groups = UserGroup.query.filter_by(org_id=BENCH_ORG_ID).all()
+    return jsonify({"rows": [serialize_user_group(group) for group in groups]})
+
+
+def rows_path():
+    rows = UserGroup.query.filter_by(org_id=BENCH_ORG_ID).with_entities(*USERGROUP_LIST_COLUMNS).all()
+    return jsonify({"rows": serialize_user_group_rows(rows)})
+
+
+def measure(fn, provider):
+    """Returns (CPU ms per run, peak traced MiB, body bytes) for fn under the given JSON provider."""
+    from app import db
+
+    current_app.json = provider
+    size = len(fn().get_data())
+    db.session.expunge_all()
+
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn()
+        db.session.expunge_all()
+    cpu_ms = (time.process_time() - start) * 1000 / ITERATIONS
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return cpu_ms, peak / (1024 * 1024), size
+
+
+def run():
+    app, ctx = create_bench_app()
+    try:
+        seed_usergroups(ROWS)
+
+        paths = [("orm+stdlib", orm_path, DefaultJSONProvider(app)), ("rows+stdlib", rows_path, DefaultJSONProvider(app))]
+        if orjson is not None:
+            paths.append(("rows+orjson", rows_path, OrjsonProvider(app)))
+
+        rows = []
+        for label, fn, provider in paths:
+            cpu_ms, peak_mib, size = measure(fn, provider)
+            rows.append((label, f"{cpu_ms:.1f}", f"{peak_mib:.1f}", size))
+
+        print_table(
+            f"Serialize {ROWS} user groups to a JSON response",
+            ("path", "CPU ms/run", "peak MiB", "body bytes"),
+            rows,
+        )
+    finally:
+        teardown_bench_app(ctx)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,151 @@
+# benchmarks/common.py
+"""
+Shared helpers for the micro-benchmarks in this package.
+
+Benchmarks run against the testing configuration (sqlite:///site_test.db) and
+recreate its tables, exactly like the pytest `init_database` fixture.
+
+    cd backend && python -m benchmarks.<module>
+"""
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app, db
+
+BENCH_ORG_ID = "bench-org"
+BENCH_USER_ID = "bench-user"
+
+
+def create_bench_app():
+    """Creates the testing app with freshly created tables and an active app context."""
+    app = create_app("testing")
+    ctx = app.app_context()
+    ctx.push()
+    db.drop_all()
+    db.create_all()
+    return app, ctx
+
+
+def teardown_bench_app(ctx):
+    db.session.remove()
+    db.drop_all()
+    ctx.pop()
+
+
+def seed_rbac(resources=8, actions=6, roles=4, org_id=BENCH_ORG_ID, user_id=BENCH_USER_ID):
+    """
+    Seeds a resource x action catalog and one user holding `roles` roles that
+    together grant every action on every other resource (the first included).
+    `resources` and `actions` are either counts or lists of names.
+
+    Returns:
+        tuple: (resource_names, action_names)
+    """
+    from app.models import Organization, User, SecurityRole, Resource, Action, Authorization, user_securityroles, securityrole_authorizations
+
+    db.session.add(Organization(
+        id=org_id, name="Bench Org", timezone="UTC", smtp_server="localhost", smtp_port=25,
+        smtp_username="smtp", smtp_password="smtp", smtp_sender="noreply@email.com",
+        created_by="bench", updated_by="bench",
+    ))
+    resource_names = [f"resource{i}" for i in range(resources)] if isinstance(resources, int) else list(resources)
+    action_names = [f"action{i}" for i in range(actions)] if isinstance(actions, int) else list(actions)
+    db.session.add_all(Resource(id=f"res-{name}", name=name, created_by="bench", updated_by="bench") for name in resource_names)
+    db.session.add_all(Action(id=f"act-{name}", name=name, created_by="bench", updated_by="bench") for name in action_names)
+    db.session.add_all(
+        Authorization(id=f"auth-{r}-{a}", resource_id=f"res-{r}", action_id=f"act-{a}", created_by="bench", updated_by="bench")
+        for r in resource_names for a in action_names
+    )
+    db.session.add_all(
+        SecurityRole(id=f"role-{i}", org_id=org_id, name=f"role{i}", created_by="bench", updated_by="bench")
+        for i in range(roles)
+    )
+    db.session.add(User(
+        id=user_id, org_id=org_id, username="bench", email="bench@email.com", password_hash="x",
+        firstname="Bench", lastname="User", user_type="admin", created_by="bench", updated_by="bench",
+    ))
+    db.session.flush()
+
+    grants = [
+        {"org_id": org_id, "securityrole_id": f"role-{i % roles}", "authorization_id": f"auth-{r}-{a}", "created_by": "bench"}
+        for i, r in enumerate(resource_names[::2]) for a in action_names
+    ]
+    db.session.execute(securityrole_authorizations.insert(), grants)
+    db.session.execute(user_securityroles.insert(), [
+        {"org_id": org_id, "user_id": user_id, "securityrole_id": f"role-{i}", "created_by": "bench"}
+        for i in range(roles)
+    ])
+    db.session.commit()
+    return resource_names, action_names
+
+
+SUBJECTS = ("Algebra", "Biology", "Chemistry", "Drama", "Economics", "French", "Geography", "History",
+            "Italian", "Journalism", "Kinesiology", "Latin", "Music", "Nutrition", "Optics", "Physics")
+
+
+def seed_usergroups(count, org_id=BENCH_ORG_ID, batch_size=5000, titles=None):
+    """
+    Bulk-inserts `count` user groups into the org. Titles default to "Group 000000"..;
+    titles="subjects" draws them from SUBJECTS with a level and section instead.
+    """
+    from app.models import UserGroup
+
+    def title(n):
+        if titles == "subjects":
+            return f"{SUBJECTS[n % len(SUBJECTS)]} {100 + n // len(SUBJECTS) % 400} Section {n}"
+        return f"Group {n:06d}"
+
+    for start in range(0, count, batch_size):
+        db.session.execute(UserGroup.__table__.insert(), [
+            {"id": f"group-{n:06d}", "org_id": org_id, "title": title(n), "description": f"Benchmark group {n}",
+             "status": "1", "created_by": "bench", "updated_by": "bench"}
+            for n in range(start, min(start + batch_size, count))
+        ])
+    db.session.commit()
+
+
+def seed_users(count, org_id=BENCH_ORG_ID, batch_size=5000):
+    """Bulk-inserts `count` student users "student000000@email.com".. into the org."""
+    from app.models import User
+
+    for start in range(0, count, batch_size):
+        db.session.execute(User.__table__.insert(), [
+            {"id": f"student-{n:06d}", "org_id": org_id, "username": f"student{n:06d}",
+             "email": f"student{n:06d}@email.com", "password_hash": "x", "firstname": "Student",
+             "lastname": f"{n:06d}", "user_type": "student", "locked": False, "logon_attempt": 0,
+             "created_by": "bench", "updated_by": "bench"}
+            for n in range(start, min(start + batch_size, count))
+        ])
+    db.session.commit()
+
+
+@contextmanager
+def count_statements():
+    """Yields a list that collects every SQL statement executed inside the block."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def timed(fn, iterations):
+    """Runs `fn` `iterations` times and returns mean microseconds per call."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def print_table(title, headers, rows):
+    widths = [max(len(str(h)), *(len(str(row[i])) for row in rows)) for i, h in enumerate(headers)]
+    print(f"\n{title}")
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
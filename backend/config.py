@@ -11,7 +11,60 @@ class Config:
     # Flask-Cahce
     CACHE_DEFAULT_TIMEOUT = 300
     CACHE_TIMEOUT = 600  # Timeout in seconds
-    CACHE_TYPE = "SimpleCache"  # Use SimpleCache for development
+    # SimpleCache is per process; set CACHE_TYPE=RedisCache and CACHE_REDIS_URL so all workers share one cache
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # JSON responses: 'orjson' (used when installed) or 'stdlib'
+    JSON_BACKEND = 'orjson'
+
+    # User groups
+    USERGROUP_COUNT_ESTIMATE_THRESHOLD = 10000  # count=estimate stops counting here and reports exact: false
+    USERGROUP_BULK_CHUNK_SIZE = 500  # Group ids per statement in mass status updates and deletes
+    USERGROUP_EXPORT_BATCH_SIZE = 1000  # Rows fetched, encoded and flushed per batch by the export stream
+    USERGROUP_IMPORT_BATCH_SIZE = 5000  # CSV rows resolved and inserted per transaction by the member import
+    USERGROUP_IMPORT_MAX_ERRORS = 1000  # Row errors listed in an import report (all are counted)
+    # Seconds a cached list page is served; 0 disables the list cache. With the per-process SimpleCache
+    # default, other workers' writes do not bump this worker's generation, so with several workers a page
+    # can stay stale for up to this long; use CACHE_TYPE=RedisCache there
+    USERGROUP_LIST_CACHE_TIMEOUT = 300
+
+    # Tags
+    TAG_INDEX_MAXSIZE = 256  # Organizations whose tag prefix index is kept in memory; 0 disables
+    MAX_PER_PAGE = 100  # Largest `per_page` served by paginated list endpoints; larger values are clamped
+    TAG_SUGGEST_MAX_LIMIT = 25  # Largest `limit` accepted by /api/tags/suggest and /api/tags/popular
+
+    # RBAC
+    PERMISSION_CACHE_MAXSIZE = 1024  # Compiled permission sets kept in memory; 0 disables
+    # Seconds a compiled permission set is kept in a worker. With the per-process SimpleCache this also
+    # bounds how long other workers honor revoked permissions (JWT claims, ETags); multi-worker
+    # deployments should use CACHE_TYPE=RedisCache so permission writes are seen everywhere at once
+    PERMISSION_CACHE_TTL = 60
+
+    # Token revocation
+    TOKEN_REVOCATION_BLOOM_CAPACITY = 100000  # Revoked tokens the Bloom filter is sized for
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE = 0.001  # False positives fall through to the denylist table
+    TOKEN_REVOCATION_SYNC_SECONDS = 60  # Reload the filter from the table at least this often (other workers' revocations without a shared cache)
+
+    # Password hashing
+    BCRYPT_LOG_ROUNDS = 12  # bcrypt cost; older hashes are upgraded at the next successful login
+    PASSWORD_HASH_WORKERS = 4  # Threads running bcrypt; caps concurrent hashing (request threads still wait)
+    PASSWORD_HASH_MAX_QUEUE = 32  # Logins waiting for a worker before /api/login answers 503
+    # Each login being verified holds a request thread; cap them below the WSGI server's threads
+    # per worker (e.g. 8 of gunicorn --threads 12) so other requests are still served
+    PASSWORD_HASH_MAX_CONCURRENT_LOGINS = 8
+    PASSWORD_HASH_RETRY_AFTER = 2  # Seconds, sent as Retry-After with the 503
+
+    # Login throttling
+    LOGIN_THROTTLE_BACKEND = 'memory'  # 'memory' (per process) or 'cache' (shared through Flask-Caching)
+    LOGIN_THROTTLE_WINDOW_SECONDS = 900  # Sliding window for failed-login counts
+    LOGIN_THROTTLE_MAX_PER_EMAIL = 10  # Failed logins per email in the window before 429
+    LOGIN_THROTTLE_MAX_PER_IP = 50  # Failed logins per client IP in the window before 429
+    LOGIN_MAX_ATTEMPTS = 5  # Consecutive failures before the account is locked
+    LOGIN_ATTEMPT_FLUSH_SIZE = 50  # Pending logon_attempt updates written per batch
+    LOGIN_ATTEMPT_FLUSH_SECONDS = 5  # Longest a pending count waits before write-back
+    # Number of trusted reverse proxies setting X-Forwarded-For; 0 uses the socket peer address
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
 
     # SQLite
     SQLALCHEMY_DATABASE_URI = 'sqlite:///site.db'
@@ -62,6 +115,9 @@ class TestingConfig(Config):
     CACHE_TIMEOUT = 600  # Timeout in seconds
     CACHE_TYPE = "SimpleCache"  # Use SimpleCache for development
 
+    # Password hashing
+    BCRYPT_LOG_ROUNDS = 4  # Minimum cost keeps the suite fast
+
     # SQLite
     SQLALCHEMY_DATABASE_URI = 'sqlite:///site_test.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # true=dump sql
@@ -52,3 +52,144 @@ def reset_database(init_database, app_instance):
 
     # Optional teardown logic (e.g., clear the database after the test)
     db.session.remove()
+
+@pytest.fixture(scope="function")
+def rbac_data(init_database):
+    """
+    Fixture to seed a minimal organization, RBAC catalog and users without gendefaultdata.py.
+
+    Roles:
+        student    - usergroup:read
+        instructor - usergroup:create/read/update/delete
+    """
+    from app.models import Organization, User, SecurityRole, Resource, Action, Authorization, user_securityroles, securityrole_authorizations
+    from app.utils.permission_cache import permission_cache, permission_catalog
+    from app.services.effective_permission_service import rebuild_effective_permissions
+    from app.extensions import cache
+
+    # Generation-keyed entries must not outlive the tables they describe
+    cache.clear()
+
+    org = Organization(
+        id="org-1", name="Test Org", timezone="UTC", smtp_server="localhost", smtp_port=25,
+        smtp_username="smtp", smtp_password="smtp", smtp_sender="noreply@email.com",
+        created_by="system", updated_by="system",
+    )
+    db.session.add(org)
+
+    resources = {name: Resource(id=f"res-{name}", name=name, created_by="system", updated_by="system") for name in ("usergroup", "quiz")}
+    actions = {name: Action(id=f"act-{name}", name=name, created_by="system", updated_by="system") for name in ("create", "read", "update", "delete")}
+    db.session.add_all(list(resources.values()) + list(actions.values()))
+
+    authorizations = {}
+    for resource_name in resources:
+        for action_name in actions:
+            authorizations[(resource_name, action_name)] = Authorization(
+                id=f"auth-{resource_name}-{action_name}",
+                resource_id=resources[resource_name].id,
+                action_id=actions[action_name].id,
+                created_by="system",
+                updated_by="system",
+            )
+    db.session.add_all(authorizations.values())
+
+    roles = {
+        "student": SecurityRole(id="role-student", org_id=org.id, name="student", created_by="system", updated_by="system"),
+        "instructor": SecurityRole(id="role-instructor", org_id=org.id, name="instructor", created_by="system", updated_by="system"),
+    }
+    db.session.add_all(roles.values())
+
+    users = {}
+    for role_name, email in (("student", "student@email.com"), ("instructor", "instructor@email.com")):
+        user = User(
+            id=f"user-{role_name}", org_id=org.id, username=role_name, email=email,
+            firstname=role_name.title(), lastname="Tester", user_type=role_name,
+            created_by="system", updated_by="system",
+        )
+        user.set_password("123")
+        users[role_name] = user
+    db.session.add_all(users.values())
+    db.session.flush()
+
+    grants = [("student", ("usergroup", "read"))] + [("instructor", ("usergroup", action)) for action in actions]
+    db.session.execute(securityrole_authorizations.insert(), [
+        {"org_id": org.id, "securityrole_id": roles[role].id, "authorization_id": authorizations[key].id, "created_by": "system"}
+        for role, key in grants
+    ])
+    db.session.execute(user_securityroles.insert(), [
+        {"org_id": org.id, "user_id": users[role].id, "securityrole_id": roles[role].id, "created_by": "system"}
+        for role in users
+    ])
+    # Seeded directly, so derive the effective permissions in the same transaction as a seed script would
+    rebuild_effective_permissions(org.id, conn=db.session.connection())
+    db.session.commit()
+    permission_cache.clear()
+    permission_catalog.refresh()  # as loaded at app start
+
+    yield {"org": org, "users": users, "roles": roles, "resources": resources, "actions": actions, "authorizations": authorizations}
+
+    permission_cache.clear()
+
+@pytest.fixture(scope="function")
+def usergroup_data(rbac_data):
+    """
+    Fixture to seed seven user groups ("Group 00".."Group 06") in org-1 with two tags:
+    "math" on even-numbered groups and "science" on multiples of three.
+    """
+    from app.models import UserGroup, Tag, usergroup_tag
+
+    org_id = rbac_data["org"].id
+    tags = {
+        name: Tag(id=f"tag-{name}", org_id=org_id, resource_id="res-usergroup", name=name, created_by="system", updated_by="system",
+                  usage_count=usage_count)
+        for name, usage_count in (("math", 4), ("science", 3))
+    }
+    groups = [
+        UserGroup(
+            id=f"group-{n:02d}", org_id=org_id, title=f"Group {n:02d}", description=f"Description {n:02d}",
+            status="1", created_by="user-instructor", updated_by="user-instructor",
+        )
+        for n in range(7)
+    ]
+    db.session.add_all(list(tags.values()) + groups)
+    db.session.flush()
+    db.session.execute(usergroup_tag.insert(), [
+        {"org_id": org_id, "usergroup_id": f"group-{n:02d}", "tag_id": tags[name].id, "created_by": "system"}
+        for n in range(7) for name in tags
+        if (name == "math" and n % 2 == 0) or (name == "science" and n % 3 == 0)
+    ])
+    db.session.commit()
+
+    yield {**rbac_data, "groups": groups, "tags": tags}
+
+@pytest.fixture(scope="function")
+def metrics_access(rbac_data):
+    """
+    Fixture adding a "metrics" resource and granting metrics:read to the instructor role.
+    """
+    from app.models import Resource, Authorization
+    from app.services.authorization_service import grant_role_authorizations
+
+    resource = Resource(id="res-metrics", name="metrics", created_by="system", updated_by="system")
+    authorization = Authorization(id="auth-metrics-read", resource_id=resource.id, action_id=rbac_data["actions"]["read"].id,
+                                  created_by="system", updated_by="system")
+    db.session.add_all([resource, authorization])
+    db.session.commit()
+    grant_role_authorizations(rbac_data["org"].id, rbac_data["roles"]["instructor"].id, [authorization.id], "system")
+
+    yield rbac_data
+
+@pytest.fixture(scope="function")
+def query_counter(app_instance):
+    """Fixture that records every SQL statement sent to the database while active."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
@@ -0,0 +1,64 @@
+import pytest
+from unittest import mock
+from flask import g
+from flask_jwt_extended import jwt_manager
+from app.utils.auth_decorators import inject_identity, require_permission
+from app.utils.jwt_utils import create_jwt_token
+from app.utils.rbac_utils import has_permission
+
+
+@require_permission("usergroup", "delete")
+def delete_view():
+    # Mimics a route calling several services that each check permissions
+    checks = [has_permission(g.org_id, g.user_id, "usergroup", action) for action in ("read", "update", "delete")]
+    return all(checks)
+
+
+def test_require_permission_rejects_with_403(rbac_data, app_instance):
+    with app_instance.test_request_context():
+        g.org_id = rbac_data["org"].id
+        g.user_id = rbac_data["users"]["student"].id
+
+        response = delete_view()
+
+        assert response.status_code == 403
+        assert response.get_json()["message"] == "You do not have permission to delete usergroup."
+
+
+def test_require_permission_resolves_permissions_once(rbac_data, app_instance, query_counter):
+    """The decorator and every service check in the request share one permission lookup."""
+    org_id = rbac_data["org"].id
+    instructor_id = rbac_data["users"]["instructor"].id
+
+    with app_instance.test_request_context():
+        g.org_id = org_id
+        g.user_id = instructor_id
+        query_counter.clear()
+
+        assert delete_view() is True
+        assert len(query_counter) == 1
+
+
+def test_request_memo_is_per_user(rbac_data, app_instance):
+    org_id = rbac_data["org"].id
+
+    with app_instance.test_request_context():
+        assert has_permission(org_id, rbac_data["users"]["instructor"].id, "usergroup", "delete") is True
+        assert has_permission(org_id, rbac_data["users"]["student"].id, "usergroup", "delete") is False
+
+
+def test_inject_identity_verifies_token_once(rbac_data, app_instance):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    token = create_jwt_token(org_id, student_id).get_json()["data"]["access_token"]
+    cookie_name = app_instance.config["JWT_ACCESS_COOKIE_NAME"]
+
+    @inject_identity
+    @require_permission("usergroup", "read")
+    def read_view():
+        return g.user_id, g.org_id
+
+    with app_instance.test_request_context(headers={"Cookie": f"{cookie_name}={token}"}):
+        with mock.patch.object(jwt_manager, "_decode_jwt", wraps=jwt_manager._decode_jwt) as decode:
+            assert read_view() == (student_id, org_id)
+        assert decode.call_count == 1
@@ -1,6 +1,6 @@
 import pytest
 from app.models import User, SecurityRole, Resource, Authorization, Action
-from app.services.authorization_service import get_user_authorizations
+from app.services.authorization_service import get_user_authorizations, remove_user_roles
 from app import db
 from sqlalchemy.sql import text
 
@@ -57,3 +57,45 @@ def test_get_user_authorizations(reset_database):
         assert class_perms.get("update") is True, "Class should have 'update' permission"
         assert class_perms.get("read") is True, "Class should have 'read' permission"
         assert class_perms.get("delete") is True, "Class should have 'delete' permission"
+
+
+def test_get_user_authorizations_single_query(rbac_data, query_counter):
+    """All resources come back, with granted actions, from one grouped statement."""
+    org_id = rbac_data["org"].id
+    instructor_id = rbac_data["users"]["instructor"].id
+    query_counter.clear()
+
+    result = get_user_authorizations(user_id=instructor_id, org_id=org_id)
+
+    assert len(query_counter) == 1
+    assert result == {
+        "quiz": {},
+        "usergroup": {"create": True, "read": True, "update": True, "delete": True},
+    }
+
+
+def test_get_user_authorizations_resource_filter(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+
+    assert get_user_authorizations(student_id, org_id, "usergroup") == {"usergroup": {"read": True}}
+    assert get_user_authorizations(student_id, org_id, ["quiz"]) == {"quiz": {}}
+
+
+def test_authorizations_route_etag(rbac_data, test_client):
+    """A repeated call with the returned ETag is answered with 304 until roles change."""
+    login = test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+    assert login.status_code == 200
+
+    first = test_client.get("/api/authorizations")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = test_client.get("/api/authorizations", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    remove_user_roles(rbac_data["org"].id, rbac_data["users"]["student"].id)
+
+    changed = test_client.get("/api/authorizations", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["data"]["usergroup"] == {}
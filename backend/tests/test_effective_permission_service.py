@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import select
+from app import db
+from app.models import Organization, securityrole_authorizations, user_effective_permission
+from app.services.authorization_service import (
+    assign_user_roles,
+    remove_user_roles,
+    grant_role_authorizations,
+    revoke_role_authorizations,
+)
+from app.services.effective_permission_service import rebuild_effective_permissions, init_effective_permissions
+from app.utils.permission_cache import stale_organizations
+
+
+def _effective(org_id, user_id):
+    rows = db.session.execute(
+        select(user_effective_permission.c.resource_id, user_effective_permission.c.action_id)
+        .where(user_effective_permission.c.org_id == org_id, user_effective_permission.c.user_id == user_id)
+    ).all()
+    return set(rows)
+
+
+def test_role_assignments_populate_effective_permissions(rbac_data):
+    org_id = rbac_data["org"].id
+
+    assert _effective(org_id, rbac_data["users"]["student"].id) == {("res-usergroup", "act-read")}
+    assert _effective(org_id, rbac_data["users"]["instructor"].id) == {
+        ("res-usergroup", action) for action in ("act-create", "act-read", "act-update", "act-delete")
+    }
+
+
+def test_role_services_refresh_affected_users(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    instructor_id = rbac_data["users"]["instructor"].id
+
+    assert grant_role_authorizations(org_id, "role-student", ["auth-quiz-read", "auth-usergroup-read"], "admin") == 1
+    assert remove_user_roles(org_id, instructor_id) == 1
+
+    assert _effective(org_id, student_id) == {("res-usergroup", "act-read"), ("res-quiz", "act-read")}
+    assert _effective(org_id, instructor_id) == set()
+
+    assert assign_user_roles(org_id, instructor_id, ["role-instructor", "role-student"], "admin") == 2
+    assert revoke_role_authorizations(org_id, "role-student", ["auth-quiz-read"]) == 1
+    assert _effective(org_id, student_id) == {("res-usergroup", "act-read")}
+    assert ("res-usergroup", "act-delete") in _effective(org_id, instructor_id)
+
+
+def test_refresh_keeps_other_organizations_rows(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    db.session.add(Organization(
+        id="org-2", name="Other Org", timezone="UTC", smtp_server="localhost", smtp_port=25,
+        smtp_username="smtp", smtp_password="smtp", smtp_sender="noreply@email.com",
+        created_by="system", updated_by="system",
+    ))
+    db.session.execute(user_effective_permission.insert(), [
+        {"org_id": "org-2", "user_id": student_id, "resource_id": "res-quiz", "action_id": "act-read"}
+    ])
+    db.session.commit()
+
+    remove_user_roles(org_id, student_id)
+
+    assert _effective(org_id, student_id) == set()
+    assert _effective("org-2", student_id) == {("res-quiz", "act-read")}
+
+
+def test_startup_backfills_an_empty_table(rbac_data, app_instance):
+    org_id = rbac_data["org"].id
+    db.session.execute(user_effective_permission.delete())
+    db.session.commit()
+
+    init_effective_permissions(app_instance)
+
+    assert _effective(org_id, rbac_data["users"]["student"].id) == {("res-usergroup", "act-read")}
+
+
+def test_rebuild_effective_permissions_restores_rows(rbac_data):
+    org_id = rbac_data["org"].id
+    db.session.execute(user_effective_permission.delete())
+    db.session.commit()
+
+    assert rebuild_effective_permissions(org_id) == 5
+    assert _effective(org_id, rbac_data["users"]["student"].id) == {("res-usergroup", "act-read")}
+
+
+def test_direct_role_writes_are_rebuilt_after_the_request(rbac_data, test_client, caplog):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    # Bypasses authorization_service, so user_effective_permission is not refreshed in the transaction
+    db.session.execute(securityrole_authorizations.insert(), [
+        {"org_id": org_id, "securityrole_id": "role-student", "authorization_id": "auth-quiz-read", "created_by": "admin"}
+    ])
+    db.session.commit()
+
+    assert "Role tables written without refreshing" in caplog.text
+    assert stale_organizations
+    assert _effective(org_id, student_id) == {("res-usergroup", "act-read")}
+
+    test_client.get("/api/session")
+
+    assert not stale_organizations
+    assert _effective(org_id, student_id) == {("res-usergroup", "act-read"), ("res-quiz", "act-read")}
+
+
+def test_role_services_are_not_flagged(rbac_data, caplog):
+    grant_role_authorizations(rbac_data["org"].id, "role-student", ["auth-quiz-read"], "admin")
+    remove_user_roles(rbac_data["org"].id, "user-nobody")
+
+    assert not stale_organizations
+    assert "Role tables written without refreshing" not in caplog.text
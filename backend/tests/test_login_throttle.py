@@ -0,0 +1,104 @@
+import pytest
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app import db
+from app.extensions import cache
+from app.models import User
+from app.utils.login_throttle import login_throttle, LoginThrottle, MemoryAttemptBackend, CacheAttemptBackend
+
+
+@pytest.fixture
+def throttle(monkeypatch):
+    """Fresh per-test throttle state with time-based write-back disabled."""
+    monkeypatch.setattr(login_throttle, "backend", MemoryAttemptBackend())
+    monkeypatch.setattr(login_throttle, "_pending", set())
+    monkeypatch.setattr(login_throttle, "_pending_since", None)
+    monkeypatch.setattr(login_throttle, "flush_seconds", 3600)
+    return login_throttle
+
+
+def _bad_login(test_client, email="student@email.com"):
+    return test_client.post("/api/login", json={"userId": email, "password": "wrong"})
+
+
+def _student(rbac_data):
+    student = rbac_data["users"]["student"]
+    db.session.expire_all()
+    return db.session.get(User, (student.id, student.org_id))
+
+
+def test_failed_logins_are_written_back_in_batches(rbac_data, test_client, throttle, query_counter):
+    query_counter.clear()
+    for _ in range(3):
+        assert _bad_login(test_client).status_code == 401
+
+    assert not [s for s in query_counter if s.startswith("UPDATE")]
+    assert _student(rbac_data).logon_attempt == 0
+
+    assert throttle.flush() == 1
+    assert _student(rbac_data).logon_attempt == 3
+
+
+def test_account_locked_after_max_attempts(rbac_data, test_client, throttle):
+    for _ in range(throttle.max_attempts + 1):
+        _bad_login(test_client)
+
+    student = _student(rbac_data)
+    assert student.locked is True
+    assert student.logon_attempt == throttle.max_attempts + 1
+
+
+def test_email_throttled_before_database(rbac_data, test_client, throttle, monkeypatch, query_counter):
+    monkeypatch.setattr(throttle, "max_per_email", 2)
+    _bad_login(test_client)
+    _bad_login(test_client)
+
+    query_counter.clear()
+    response = _bad_login(test_client)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert query_counter == []
+
+
+def test_ip_throttled_across_emails(rbac_data, test_client, throttle, monkeypatch):
+    monkeypatch.setattr(throttle, "max_per_ip", 2)
+    _bad_login(test_client, "nobody@email.com")
+    _bad_login(test_client, "someone@email.com")
+
+    assert _bad_login(test_client, "instructor@email.com").status_code == 429
+
+
+def test_account_count_is_shared_between_workers(rbac_data):
+    """Workers sharing a cache backend lock the account at the configured threshold, not a multiple of it."""
+    cache.clear()
+    workers = [LoginThrottle(CacheAttemptBackend(cache), max_attempts=3, flush_seconds=3600) for _ in range(2)]
+    student = _student(rbac_data)
+
+    assert [workers[i % 2].record_failure(student.email, user=student) for i in range(4)] == [False, False, False, True]
+    assert _student(rbac_data).locked is True
+
+
+def test_flush_does_not_commit_the_request_session(rbac_data, throttle):
+    student = _student(rbac_data)
+    throttle.record_failure(student.email, user=student)
+    student.username = "uncommitted"
+
+    assert throttle.flush() == 1
+    db.session.rollback()
+    assert _student(rbac_data).username != "uncommitted"
+    assert _student(rbac_data).logon_attempt == 1
+
+
+def test_ip_throttle_uses_forwarded_client_address(rbac_data, app_instance, test_client, throttle, monkeypatch):
+    monkeypatch.setattr(throttle, "max_per_ip", 2)
+    monkeypatch.setattr(app_instance, "wsgi_app", ProxyFix(app_instance.wsgi_app, x_for=1))
+
+    def bad_login_from(ip, email):
+        return test_client.post("/api/login", json={"userId": email, "password": "wrong"},
+                                headers={"X-Forwarded-For": ip})
+
+    bad_login_from("203.0.113.1", "nobody@email.com")
+    bad_login_from("203.0.113.1", "someone@email.com")
+
+    assert bad_login_from("203.0.113.1", "other@email.com").status_code == 429
+    assert bad_login_from("203.0.113.2", "other@email.com").status_code == 401
@@ -0,0 +1,55 @@
+import pytest
+from app import db
+from app.models import User
+from app.models.authorization_models import bcrypt
+from app.utils.password_hasher import PasswordHasher, PasswordHasherBusy, password_hasher
+
+
+def _login(test_client, email="student@email.com"):
+    return test_client.post("/api/login", json={"userId": email, "password": "123"})
+
+
+def test_login_rehashes_to_configured_cost(rbac_data, test_client):
+    student = rbac_data["users"]["student"]
+    student.password_hash = bcrypt.generate_password_hash("123", 5).decode("utf-8")
+    db.session.commit()
+
+    assert _login(test_client).status_code == 200
+
+    db.session.expire_all()
+    rehashed = db.session.get(User, (student.id, student.org_id)).password_hash
+    assert not password_hasher.needs_rehash(rehashed)
+    assert bcrypt.check_password_hash(rehashed, "123")
+
+
+def test_login_rejected_with_503_when_pool_full(rbac_data, test_client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "_in_flight", password_hasher.max_in_flight)
+
+    response = _login(test_client)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(password_hasher.retry_after)
+
+
+def test_concurrent_logins_capped_below_request_threads(app_instance):
+    hasher = PasswordHasher(max_workers=4, max_queue=32, max_concurrent_logins=6)
+    assert hasher.max_in_flight == 6
+    assert PasswordHasher(max_workers=2, max_queue=1, max_concurrent_logins=6).max_in_flight == 3
+    assert password_hasher.max_in_flight == app_instance.config["PASSWORD_HASH_MAX_CONCURRENT_LOGINS"]
+
+    hasher._in_flight = 6
+    with pytest.raises(PasswordHasherBusy):
+        hasher.check("hash", "password")
+
+
+def test_metrics_report_login_pool(metrics_access, test_client):
+    before = password_hasher.metrics()["completed_total"]
+    assert _login(test_client).status_code == 200
+    assert test_client.get("/api/metrics").status_code == 403  # students lack metrics:read
+    assert _login(test_client, "instructor@email.com").status_code == 200
+
+    metrics = test_client.get("/api/metrics").get_json()["data"]["login"]
+
+    assert metrics["completed_total"] == before + 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["latency_ms"]["p50"] is not None
@@ -0,0 +1,138 @@
+import pytest
+from flask_jwt_extended import verify_jwt_in_request, decode_token
+from app.extensions import cache
+from app.services.authorization_service import assign_user_roles, remove_user_roles
+from app.utils.jwt_utils import create_jwt_token
+from app.utils.permission_cache import permission_catalog
+from app.utils.permission_claims import (
+    JWT_KEY_PERMISSIONS,
+    JWT_KEY_PERMISSION_VERSION,
+    PERMISSIONS_STALE_HEADER,
+    build_permission_claims,
+    decode_permission_claims,
+    encode_permission_mask,
+    decode_permission_mask,
+)
+from app.utils.rbac_utils import has_permission
+
+
+def _access_token(org_id, user_id):
+    return create_jwt_token(org_id, user_id).get_json()["data"]["access_token"]
+
+
+def test_encode_permission_mask_round_trip(rbac_data):
+    layout = permission_catalog.ensure_loaded().layout
+    encoded = encode_permission_mask([("usergroup", "read"), ("quiz", "delete")], layout)
+
+    # 2 resources x 4 actions fit in a single byte
+    assert len(decode_permission_mask(encoded)) == 1
+
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    claims = decode_permission_claims({
+        "sub": student_id,
+        "org_id": org_id,
+        JWT_KEY_PERMISSIONS: encoded,
+        JWT_KEY_PERMISSION_VERSION: build_permission_claims(org_id, student_id)[JWT_KEY_PERMISSION_VERSION],
+    })
+    assert claims.allows("usergroup", "read")
+    assert claims.allows("quiz", "delete")
+    assert not claims.allows("usergroup", "delete")
+    assert not claims.allows("unknown", "read")
+
+
+def test_access_token_carries_permission_claims(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+
+    decoded = decode_token(_access_token(org_id, student_id))
+
+    assert JWT_KEY_PERMISSIONS in decoded
+    assert JWT_KEY_PERMISSION_VERSION in decoded
+    claims = decode_permission_claims(decoded)
+    assert claims.allows("usergroup", "read")
+    assert not claims.allows("usergroup", "create")
+
+
+def test_has_permission_uses_claims_without_queries(rbac_data, app_instance, query_counter):
+    org_id = rbac_data["org"].id
+    instructor_id = rbac_data["users"]["instructor"].id
+    token = _access_token(org_id, instructor_id)
+    cookie_name = app_instance.config["JWT_ACCESS_COOKIE_NAME"]
+
+    with app_instance.test_request_context(headers={"Cookie": f"{cookie_name}={token}"}):
+        verify_jwt_in_request()
+        query_counter.clear()
+
+        assert has_permission(org_id, instructor_id, "usergroup", "delete") is True
+        assert has_permission(org_id, instructor_id, "quiz", "read") is False
+        assert query_counter == []
+
+
+def test_role_change_makes_claims_stale(rbac_data):
+    org_id = rbac_data["org"].id
+    instructor_id = rbac_data["users"]["instructor"].id
+    decoded = decode_token(_access_token(org_id, instructor_id))
+    assert decode_permission_claims(decoded) is not None
+
+    remove_user_roles(org_id, instructor_id)
+
+    assert decode_permission_claims(decoded) is None
+    # A freshly issued token reflects the change
+    fresh = decode_permission_claims(decode_token(_access_token(org_id, instructor_id)))
+    assert not fresh.allows("usergroup", "delete")
+
+
+def test_has_permission_falls_back_to_db_outside_request(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+
+    assert has_permission(org_id, student_id, "usergroup", "read") is True
+    assert has_permission(org_id, student_id, "usergroup", "update") is False
+
+
+def test_other_users_role_change_keeps_claims_current(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    decoded = decode_token(_access_token(org_id, student_id))
+
+    remove_user_roles(org_id, rbac_data["users"]["instructor"].id)
+
+    assert decode_permission_claims(decoded) is not None
+
+
+def test_permission_version_survives_cache_loss(rbac_data):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    decoded = decode_token(_access_token(org_id, student_id))
+
+    cache.clear()  # e.g. a restarted worker with a process-local cache
+
+    assert decode_permission_claims(decoded) is not None
+
+
+def test_stale_access_token_is_reissued(usergroup_data, test_client, app_instance):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+    cookie_name = app_instance.config["JWT_ACCESS_COOKIE_NAME"]
+    test_client.post("/api/login", json={"userId": "instructor@email.com", "password": "123"})
+    old = decode_token(test_client.get_cookie(cookie_name, path="/api").value)
+    assert decode_permission_claims(old).allows("usergroup", "delete")
+
+    remove_user_roles(org_id, instructor_id)
+
+    response = test_client.get("/api/usergroups")
+    assert response.status_code == 403  # checked against the database
+    assert response.headers[PERMISSIONS_STALE_HEADER] == "1"
+    new = decode_token(test_client.get_cookie(cookie_name, path="/api").value)
+    assert (new["jti"], new["csrf"]) == (old["jti"], old["csrf"])
+    assert abs(new["exp"] - old["exp"]) <= 1
+    assert not decode_permission_claims(new).allows("usergroup", "read")
+
+    # The reissued token is current, so the next request is not flagged
+    response = test_client.get("/api/usergroups")
+    assert response.status_code == 403
+    assert PERMISSIONS_STALE_HEADER not in response.headers
+
+    assign_user_roles(org_id, instructor_id, [usergroup_data["roles"]["instructor"].id], "system")
+    assert test_client.get("/api/usergroups").status_code == 200
@@ -0,0 +1,132 @@
+import pytest
+from app import db
+from app.services.authorization_service import remove_user_roles
+from app.utils.rbac_utils import has_permission_db
+from app.utils import permission_cache as permission_cache_module
+from app.utils.permission_cache import PermissionCache, permission_cache, bump_rbac_generation
+
+
+def test_has_permission_db_uses_role_grants(rbac_data):
+    """Student may read user groups only; instructor has full access."""
+    org_id = rbac_data["org"].id
+    student = rbac_data["users"]["student"]
+    instructor = rbac_data["users"]["instructor"]
+
+    assert has_permission_db(org_id, student.id, "usergroup", "read") is True
+    assert has_permission_db(org_id, student.id, "usergroup", "delete") is False
+    assert has_permission_db(org_id, instructor.id, "usergroup", "delete") is True
+    assert has_permission_db(org_id, instructor.id, "quiz", "read") is False
+    assert has_permission_db("other-org", instructor.id, "usergroup", "read") is False
+
+
+def test_has_permission_db_served_from_cache(rbac_data, query_counter):
+    """Repeated checks for the same user are answered without touching the database."""
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    query_counter.clear()
+
+    has_permission_db(org_id, student_id, "usergroup", "read")
+    statements_after_first = len(query_counter)
+    assert statements_after_first == 1
+
+    for action in ("read", "create", "update", "delete"):
+        has_permission_db(org_id, student_id, "usergroup", action)
+    assert len(query_counter) == statements_after_first
+
+
+def test_role_change_invalidates_cache(rbac_data):
+    """Revoking a role assignment is visible to the next check after commit."""
+    org_id = rbac_data["org"].id
+    instructor = rbac_data["users"]["instructor"]
+
+    assert has_permission_db(org_id, instructor.id, "usergroup", "update") is True
+
+    remove_user_roles(org_id, instructor.id)
+
+    assert len(permission_cache) == 0
+    assert has_permission_db(org_id, instructor.id, "usergroup", "update") is False
+
+
+def test_resource_change_through_orm_invalidates_cache(rbac_data):
+    """Renaming a resource via the ORM clears cached sets compiled under the old name."""
+    org_id = rbac_data["org"].id
+    student = rbac_data["users"]["student"]
+
+    assert has_permission_db(org_id, student.id, "usergroup", "read") is True
+
+    rbac_data["resources"]["usergroup"].name = "studentgroup"
+    db.session.commit()
+
+    assert has_permission_db(org_id, student.id, "usergroup", "read") is False
+    assert has_permission_db(org_id, student.id, "studentgroup", "read") is True
+
+
+def test_permission_cache_is_bounded_lru():
+    cache = PermissionCache(maxsize=2)
+    cache.put("a", frozenset())
+    cache.put("b", frozenset())
+    cache.get("a")
+    cache.put("c", frozenset())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+
+
+def test_permission_cache_drops_stale_generation():
+    cache = PermissionCache(maxsize=2)
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", frozenset(), generation)
+
+    assert cache.get("a") is None
+
+
+def test_permission_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(permission_cache_module.time, "monotonic", lambda: now[0])
+    cache = PermissionCache(maxsize=2, ttl=60)
+    cache.put("a", frozenset())
+
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_another_workers_write_invalidates_cache(rbac_data, query_counter):
+    """A generation bump seen only through the shared cache drops the worker's cached sets."""
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    has_permission_db(org_id, student_id, "usergroup", "read")
+
+    bump_rbac_generation()
+    query_counter.clear()
+    assert has_permission_db(org_id, student_id, "usergroup", "read") is True
+    assert len(query_counter) == 1
+
+
+def test_has_permission_db_single_exists_when_cache_disabled(rbac_data, query_counter, monkeypatch):
+    """Without the LRU each check is exactly one EXISTS statement."""
+    monkeypatch.setattr(permission_cache, "maxsize", 0)
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    query_counter.clear()
+
+    assert has_permission_db(org_id, student_id, "usergroup", "read") is True
+    assert has_permission_db(org_id, student_id, "usergroup", "delete") is False
+
+    assert len(query_counter) == 2
+    assert all("EXISTS" in statement for statement in query_counter)
+
+
+def test_unknown_resource_or_action_denied_without_query(rbac_data, query_counter):
+    org_id = rbac_data["org"].id
+    student_id = rbac_data["users"]["student"].id
+    query_counter.clear()
+
+    assert has_permission_db(org_id, student_id, "nonexistent", "read") is False
+    assert has_permission_db(org_id, student_id, "usergroup", "fly") is False
+    assert query_counter == []
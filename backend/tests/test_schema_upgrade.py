@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.schema_upgrade import upgrade_schema
+
+# Tables as created by the models before revision, usage_count and uq_usergroup_user existed
+LEGACY_DDL = [
+    "CREATE TABLE usergroup (id VARCHAR(36) NOT NULL, org_id VARCHAR(36) NOT NULL, title VARCHAR(50) NOT NULL, "
+    "description VARCHAR(150), status VARCHAR(1) NOT NULL, created_at DATETIME, created_by VARCHAR(36) NOT NULL, "
+    "updated_at DATETIME, updated_by VARCHAR(36) NOT NULL, PRIMARY KEY (id, org_id), UNIQUE (id))",
+    "CREATE TABLE tag (id VARCHAR(36) NOT NULL, org_id VARCHAR(36) NOT NULL, resource_id VARCHAR(36) NOT NULL, "
+    "name VARCHAR(50) NOT NULL, created_at DATETIME, created_by VARCHAR(36) NOT NULL, updated_at DATETIME, "
+    "updated_by VARCHAR(36) NOT NULL, PRIMARY KEY (id, org_id), UNIQUE (id), "
+    "CONSTRAINT uq_org_tag_name UNIQUE (org_id, name))",
+    "CREATE TABLE usergroup_tag (org_id VARCHAR(36) NOT NULL, usergroup_id VARCHAR(36) NOT NULL, "
+    "tag_id VARCHAR(36) NOT NULL, created_at DATETIME, created_by VARCHAR(36) NOT NULL, "
+    "PRIMARY KEY (org_id, usergroup_id, tag_id))",
+    "CREATE TABLE usergroup_user (org_id VARCHAR(36) NOT NULL, group_id VARCHAR(36) NOT NULL, "
+    "user_id VARCHAR(36) NOT NULL, created_at DATETIME NOT NULL, created_by VARCHAR(36) NOT NULL)",
+    "CREATE INDEX idx_usergroup_user ON usergroup_user (org_id, group_id, user_id)",
+]
+
+
+@pytest.fixture
+def legacy_engine(app_instance):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for statement in LEGACY_DDL:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO usergroup VALUES ('g1', 'org-1', 'Group 1', NULL, '1', NULL, 'u', NULL, 'u')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO tag VALUES ('t1', 'org-1', 'r', 'math', NULL, 'u', NULL, 'u'), "
+            "('t2', 'org-1', 'r', 'science', NULL, 'u', NULL, 'u')"
+        )
+        connection.exec_driver_sql("INSERT INTO usergroup_tag VALUES ('org-1', 'g1', 't1', NULL, 'u')")
+        connection.exec_driver_sql(
+            "INSERT INTO usergroup_user VALUES ('org-1', 'g1', 'u1', '2024-01-02', 'b'), "
+            "('org-1', 'g1', 'u1', '2024-01-01', 'a'), ('org-1', 'g1', 'u1', '2024-01-03', 'c'), "
+            "('org-1', 'g1', 'u2', '2024-01-01', 'a')"
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_brings_a_legacy_database_to_the_current_schema(legacy_engine):
+    with legacy_engine.begin() as connection:
+        applied = upgrade_schema(connection)
+
+    assert "added column usergroup.revision" in applied
+    assert "added column tag.usage_count" in applied
+    assert "added unique constraint uq_usergroup_user (2 duplicate rows removed)" in applied
+    assert "dropped index idx_usergroup_user" in applied
+
+    inspector = inspect(legacy_engine)
+    assert set(inspector.get_table_names()) >= {table.name for table in db.metadata.sorted_tables}
+    index_names = {index["name"] for index in inspector.get_indexes("usergroup_user")}
+    assert {"uq_usergroup_user", "idx_usergroup_user_member"} <= index_names
+    assert "idx_usergroup_user" not in index_names
+    assert {"idx_tag_org_usage", "idx_usergroup_org_title_id"} <= {
+        index["name"] for table in ("tag", "usergroup") for index in inspector.get_indexes(table)
+    }
+
+    with legacy_engine.connect() as connection:
+        rows = connection.execute(text("SELECT user_id, created_by FROM usergroup_user ORDER BY user_id")).all()
+        assert rows == [("u1", "a"), ("u2", "a")]  # the earliest membership row is kept
+        assert dict(connection.execute(text("SELECT name, usage_count FROM tag")).all()) == {"math": 1, "science": 0}
+        assert connection.execute(text("SELECT revision FROM usergroup")).scalar() == 1
+        with pytest.raises(IntegrityError):
+            connection.exec_driver_sql("INSERT INTO usergroup_user VALUES ('org-1', 'g1', 'u2', '2024-02-01', 'a')")
+
+
+def test_upgrade_is_idempotent(legacy_engine):
+    with legacy_engine.begin() as connection:
+        upgrade_schema(connection)
+    with legacy_engine.begin() as connection:
+        assert upgrade_schema(connection) == []
@@ -0,0 +1,50 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+from app.models import UserGroup, Tag
+from app.services.tag_service import serialize_tag, serialize_tags
+from app.services.usergroup_service import USERGROUP_LIST_COLUMNS, serialize_user_group, serialize_user_group_rows
+from app.utils.serialization_utils import format_dates, serialize_rows
+
+
+def test_format_dates_matches_strftime():
+    values = [datetime(2024, 9, 1, 8, 30), None, date(2024, 9, 1), datetime(2024, 12, 31, 23, 59)]
+
+    assert format_dates(values) == [value and value.strftime("%Y-%m-%d") for value in values]
+    assert serialize_rows([], ("id",)) == []
+
+
+def test_rows_serialize_like_objects(usergroup_data):
+    groups = UserGroup.query.filter_by(org_id=usergroup_data["org"].id).order_by(UserGroup.id).all()
+    rows = UserGroup.query.filter_by(org_id=usergroup_data["org"].id).order_by(UserGroup.id) \
+        .with_entities(*USERGROUP_LIST_COLUMNS).all()
+
+    assert serialize_user_group_rows(rows) == [serialize_user_group(group) for group in groups]
+
+
+def test_tags_serialize_in_bulk(usergroup_data):
+    tags = Tag.query.filter_by(org_id=usergroup_data["org"].id).order_by(Tag.id).all()
+
+    assert serialize_tags(tags) == [{
+        "id": tag.id,
+        "resource_id": tag.resource_id,
+        "name": tag.name,
+        "created_at": tag.created_at.strftime("%Y-%m-%d"),
+        "updated_at": tag.updated_at.strftime("%Y-%m-%d"),
+    } for tag in tags]
+    assert serialize_tag(tags[0]) == serialize_tags(tags)[0]
+    assert serialize_tags([]) == []
+
+
+def test_orjson_provider_matches_stdlib(app_instance):
+    pytest.importorskip("orjson")
+    from app.utils.serialization_utils import OrjsonProvider
+
+    payload = {"b": [1, 2.5, None, True], "a": {"when": datetime(2024, 9, 1, 8, 30), "amount": Decimal("1.50")},
+               "name": "Élève"}
+    stdlib = DefaultJSONProvider(app_instance)
+
+    assert isinstance(app_instance.json, OrjsonProvider)
+    assert stdlib.loads(app_instance.json.dumps(payload)) == stdlib.loads(stdlib.dumps(payload))
+    assert app_instance.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
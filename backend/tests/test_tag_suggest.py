@@ -0,0 +1,73 @@
+from app.services.tag_service import create_tag, delete_tag, suggest_tags
+from app.services.usergroup_service import update_user_group
+from app.utils.tag_index import OrgTagIndex, bump_tag_generation
+
+
+def test_index_ranks_prefix_matches_by_usage():
+    index = OrgTagIndex("g1", [("t1", "Math", 2), ("t2", "maths", 5), ("t3", "Music", 5), ("t4", "mat", 2)])
+
+    assert [name for _, name, _ in index.suggest("MA", 10)] == ["maths", "mat", "Math"]
+    assert [name for _, name, _ in index.suggest("", 2)] == ["maths", "Music"]
+
+    index.remove("t2")
+    index.add("t5", "matrix")
+    assert index.suggest("mat", 10) == [("t4", "mat", 2), ("t1", "Math", 2), ("t5", "matrix", 0)]
+    assert index.suggest("x", 10) == []
+
+
+def test_warm_index_answers_without_queries(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    assert suggest_tags(org_id, "") == [
+        {"id": "tag-math", "name": "math", "usage": 4},
+        {"id": "tag-science", "name": "science", "usage": 3},
+    ]
+
+    query_counter.clear()
+    assert [tag["name"] for tag in suggest_tags(org_id, "SC")] == ["science"]
+    assert query_counter == []
+
+
+def test_tag_writes_update_the_index_in_place(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    suggest_tags(org_id, "m")
+
+    create_tag("res-usergroup", org_id, "mathematics", usergroup_data["users"]["instructor"].id)
+    assert delete_tag(org_id, "tag-science") is True
+
+    query_counter.clear()
+    assert [tag["name"] for tag in suggest_tags(org_id, "")] == ["math", "mathematics"]
+    assert query_counter == []
+
+
+def test_index_reloads_after_another_workers_write(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    suggest_tags(org_id, "m")
+
+    bump_tag_generation(org_id)
+    query_counter.clear()
+    suggest_tags(org_id, "m")
+    assert len([s for s in query_counter if "FROM tag" in s]) == 1
+
+
+def test_only_tag_assignment_writes_reload_the_index(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+    suggest_tags(org_id, "")
+
+    update_user_group(org_id, instructor_id, "group-01", title="Renamed")
+    query_counter.clear()
+    suggest_tags(org_id, "")
+    assert query_counter == []
+
+    update_user_group(org_id, instructor_id, "group-01", tags=["tag-science"])
+    assert suggest_tags(org_id, "")[1] == {"id": "tag-science", "name": "science", "usage": 4}
+
+
+def test_suggest_route_validates_limit(usergroup_data, test_client):
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    response = test_client.get("/api/tags/suggest?q=ma&limit=5")
+    assert response.status_code == 200
+    assert [tag["name"] for tag in response.get_json()["data"]["tags"]] == ["math"]
+    assert test_client.get("/api/tags/suggest?q=ma&limit=0").status_code == 400
+    assert test_client.get("/api/tags/suggest?limit=many").status_code == 400
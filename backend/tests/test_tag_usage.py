@@ -0,0 +1,70 @@
+from app import db
+from app.models import Tag, usergroup_tag
+from app.services.tag_service import create_tag, get_popular_tags, reconcile_tag_usage, suggest_tags
+from app.services.usergroup_service import create_user_group, update_user_group, mass_delete_groups
+
+
+def _usage():
+    db.session.expire_all()
+    return dict(db.session.execute(db.select(Tag.name, Tag.usage_count)).all())
+
+
+def _group_tags(group_id):
+    return set(db.session.scalars(db.select(usergroup_tag.c.tag_id).filter_by(usergroup_id=group_id)))
+
+
+def test_update_writes_only_the_tag_difference(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+
+    update_user_group(org_id, instructor_id, "group-01", tags=["tag-math", "tag-science"])
+    assert _group_tags("group-01") == {"tag-math", "tag-science"}
+    assert _usage() == {"math": 5, "science": 4}
+
+    query_counter.clear()
+    update_user_group(org_id, instructor_id, "group-01", tags=["tag-science", "missing"])
+    assert _group_tags("group-01") == {"tag-science"}
+    assert _usage() == {"math": 4, "science": 4}
+    assert not [s for s in query_counter if s.startswith("INSERT INTO usergroup_tag")]
+    assert len([s for s in query_counter if s.startswith("DELETE FROM usergroup_tag")]) == 1
+
+    update_user_group(org_id, instructor_id, "group-01", title="Renamed")  # tags untouched
+    assert _usage() == {"math": 4, "science": 4}
+
+
+def test_create_and_delete_adjust_counters(usergroup_data):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+
+    group = create_user_group(org_id, instructor_id, "Group 07", tags=["tag-math"])["data"]
+    assert _group_tags(group["id"]) == {"tag-math"}
+    assert _usage() == {"math": 5, "science": 3}
+
+    mass_delete_groups(org_id, instructor_id, ["group-00", "group-06", group["id"]])
+    assert _usage() == {"math": 2, "science": 1}
+
+
+def test_reconcile_repairs_drift(usergroup_data):
+    org_id = usergroup_data["org"].id
+    db.session.execute(db.update(Tag).where(Tag.id == "tag-math").values(usage_count=40))
+    db.session.execute(usergroup_tag.delete().where(usergroup_tag.c.usergroup_id == "group-03"))
+    db.session.commit()
+
+    assert reconcile_tag_usage(org_id) == 2
+    assert _usage() == {"math": 4, "science": 2}
+    assert reconcile_tag_usage() == 0
+
+
+def test_popular_tags_read_the_counters(usergroup_data, test_client, query_counter):
+    org_id = usergroup_data["org"].id
+    create_tag("res-usergroup", org_id, "history", usergroup_data["users"]["instructor"].id)
+
+    query_counter.clear()
+    assert [tag["name"] for tag in get_popular_tags(org_id)] == ["math", "science"]
+    assert not [s for s in query_counter if "usergroup_tag" in s]
+    assert [tag["name"] for tag in suggest_tags(org_id, "")] == ["math", "science", "history"]
+
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+    response = test_client.get("/api/tags/popular?limit=1")
+    assert response.get_json()["data"]["tags"] == [{"id": "tag-math", "name": "math", "usage": 4}]
+    assert test_client.get("/api/tags/popular?limit=100").status_code == 400
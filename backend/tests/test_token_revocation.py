@@ -0,0 +1,108 @@
+import pytest
+import time
+from datetime import datetime, timedelta, timezone
+from flask_jwt_extended import decode_token, verify_jwt_in_request
+from app import db
+from app.models import RevokedToken
+from sqlalchemy.exc import OperationalError
+from app.utils.cache_utils import bump_generation
+from app.utils.token_revocation import (
+    REVOCATION_GENERATION_KEY,
+    BloomFilter,
+    prune_revoked_tokens,
+    revoke_token,
+    token_revocation_list,
+)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_logout_revokes_access_token(rbac_data, test_client, app_instance):
+    login = test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+    assert login.status_code == 200
+    access_token = test_client.get_cookie(app_instance.config["JWT_ACCESS_COOKIE_NAME"], path="/api").value
+    csrf = decode_token(access_token)["csrf"]
+
+    assert test_client.get("/api/session").status_code == 200
+
+    logout = test_client.post("/api/logout", headers={"X-CSRF-TOKEN": csrf})
+    assert logout.status_code == 200
+    assert db.session.get(RevokedToken, decode_token(access_token, allow_expired=True)["jti"]) is not None
+
+    # Replaying the old cookie is rejected
+    test_client.set_cookie(app_instance.config["JWT_ACCESS_COOKIE_NAME"], access_token, path="/api")
+    assert test_client.get("/api/session").status_code == 401
+
+
+def test_unrevoked_token_checked_without_queries(rbac_data, app_instance, query_counter):
+    from app.utils.jwt_utils import create_jwt_token
+
+    token = create_jwt_token(rbac_data["org"].id, rbac_data["users"]["student"].id).get_json()["data"]["access_token"]
+    cookie_name = app_instance.config["JWT_ACCESS_COOKIE_NAME"]
+    token_revocation_list.sync()
+
+    with app_instance.test_request_context(headers={"Cookie": f"{cookie_name}={token}"}):
+        query_counter.clear()
+        verify_jwt_in_request()
+        assert query_counter == []
+
+
+def test_sync_skips_expired_entries_without_pruning(rbac_data):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.session.add(RevokedToken(jti="expired-jti", token_type="access", expires_at=now - timedelta(minutes=1)))
+    db.session.commit()
+    revoke_token({"jti": "live-jti", "exp": int(time.time()) + 3600, "sub": "user-student"})
+
+    assert token_revocation_list.sync() is True
+
+    assert token_revocation_list.is_revoked("live-jti") is True
+    assert token_revocation_list.is_revoked("expired-jti") is False
+    assert not token_revocation_list.might_contain("expired-jti")
+    # Pruning is left to `flask prune-revoked-tokens`
+    db.session.expire_all()
+    assert db.session.get(RevokedToken, "expired-jti") is not None
+    assert prune_revoked_tokens() == 1
+    assert db.session.get(RevokedToken, "expired-jti") is None
+
+
+def test_other_workers_revocation_triggers_resync(rbac_data, query_counter):
+    token_revocation_list.sync()
+    # Revoked by another worker: the row and the shared generation change, this filter does not
+    db.session.add(RevokedToken(jti="remote-jti", token_type="access",
+                                expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)))
+    db.session.commit()
+    assert not token_revocation_list.might_contain("remote-jti")
+
+    bump_generation(REVOCATION_GENERATION_KEY)
+
+    assert token_revocation_list.is_revoked("remote-jti") is True
+    query_counter.clear()
+    assert token_revocation_list.is_revoked("other-jti") is False
+    assert query_counter == []  # no resync until the generation changes again
+
+
+def test_failed_first_sync_fails_closed(rbac_data, app_instance, monkeypatch):
+    revoke_token({"jti": "revoked-jti", "exp": int(time.time()) + 3600, "sub": "user-student"})
+    token_revocation_list.configure(capacity=1000, error_rate=0.001, sync_seconds=60)
+
+    class BrokenEngine:
+        def begin(self):
+            raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(type(db), "engine", property(lambda self: BrokenEngine()))
+        assert token_revocation_list.sync() is False
+        assert token_revocation_list.sync_if_due() is False
+        # Never loaded: the empty filter proves nothing, so each check asks the table
+        assert not token_revocation_list.might_contain("revoked-jti")
+        assert token_revocation_list.is_revoked("revoked-jti") is True
+        assert token_revocation_list.is_revoked("other-jti") is False
@@ -0,0 +1,137 @@
+import pytest
+from flask_jwt_extended import decode_token
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models import UserGroup, usergroup_user, usergroup_tag
+from app.services.usergroup_service import mass_update_group_status, bulk_delete_groups, delete_user_group
+
+
+@pytest.fixture
+def small_chunks(app_instance, monkeypatch):
+    monkeypatch.setitem(app_instance.config, "USERGROUP_BULK_CHUNK_SIZE", 2)
+
+
+def _login(test_client, app_instance):
+    test_client.post("/api/login", json={"userId": "instructor@email.com", "password": "123"})
+    token = test_client.get_cookie(app_instance.config["JWT_ACCESS_COOKIE_NAME"], path="/api").value
+    return {"X-CSRF-TOKEN": decode_token(token)["csrf"]}
+
+
+def test_mass_status_update_counts_matched_rows(usergroup_data, small_chunks, query_counter):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["instructor"].id
+    group_ids = ["group-00", "group-01", "group-02", "group-03", "group-04", "missing", "group-00"]
+    mass_update_group_status(org_id, user_id, ["group-06"], "1")  # warm the permission cache
+
+    query_counter.clear()
+    result = mass_update_group_status(org_id, user_id, group_ids, "0")
+
+    assert result["data"] == {"updated_count": 5}
+    assert len([s for s in query_counter if s.startswith("UPDATE usergroup")]) == 3
+    assert not [s for s in query_counter if s.startswith("SELECT")]
+    db.session.expire_all()
+    closed = db.session.scalars(db.select(UserGroup.id).filter_by(org_id=org_id, status="0")).all()
+    assert sorted(closed) == ["group-00", "group-01", "group-02", "group-03", "group-04"]
+
+
+def test_mass_status_update_route(usergroup_data, test_client, app_instance):
+    headers = _login(test_client, app_instance)
+
+    response = test_client.put("/api/massUpdateGroupStatus", headers=headers,
+                               json={"groupIds": ["group-01", "group-02"], "status": "0"})
+    assert response.status_code == 200
+    assert response.get_json()["data"] == {"updated_count": 2}
+
+    response = test_client.put("/api/massUpdateGroupStatus", headers=headers,
+                               json={"groupIds": ["missing"], "status": "0"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"status": "0"},
+    {"groupIds": None, "status": "0"},
+    {"groupIds": [], "status": "0"},
+    {"groupIds": "group-01", "status": "0"},
+    {"groupIds": [None, 5], "status": "0"},
+    ["group-01"],
+])
+def test_mass_status_update_rejects_bad_group_ids(usergroup_data, test_client, app_instance, body):
+    headers = _login(test_client, app_instance)
+
+    response = test_client.put("/api/massUpdateGroupStatus", headers=headers, json=body)
+    assert response.status_code == 400
+
+
+def test_mass_status_update_service_rejects_missing_group_ids(usergroup_data):
+    result = mass_update_group_status(usergroup_data["org"].id, usergroup_data["users"]["instructor"].id, None, "0")
+
+    assert result["success"] is False
+    assert "non-empty list" in result["message"]
+
+
+def _count(table, **where):
+    return db.session.scalar(db.select(db.func.count()).select_from(table).filter_by(**where))
+
+
+def test_bulk_delete_removes_associations_in_short_transactions(usergroup_data, small_chunks, query_counter):
+    org_id = usergroup_data["org"].id
+    db.session.execute(usergroup_user.insert(), [
+        {"org_id": org_id, "group_id": group_id, "user_id": "user-student", "created_by": "system"}
+        for group_id in ("group-00", "group-03", "group-05")
+    ])
+    db.session.commit()
+    progress = []
+
+    query_counter.clear()
+    deleted, failed = bulk_delete_groups(org_id, ["group-00", "group-02", "group-03", "missing", "group-05"],
+                                         progress=lambda done, total: progress.append((done, total)))
+
+    assert (deleted, failed) == (4, [])
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert len([s for s in query_counter if s.startswith("DELETE FROM usergroup ")]) == 3
+    assert not [s for s in query_counter if s.startswith("SELECT")]
+    assert _count(UserGroup.__table__, org_id=org_id) == 3
+    assert _count(usergroup_user, org_id=org_id) == 0
+    # Only group-04 and group-06 keep their tag rows: math, math + science
+    assert _count(usergroup_tag, org_id=org_id) == 3
+
+
+def test_delete_user_group_reports_missing_group(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["instructor"].id
+
+    assert delete_user_group(org_id, user_id, "group-06")["success"] is True
+    assert _count(usergroup_tag, org_id=org_id, usergroup_id="group-06") == 0
+    assert delete_user_group(org_id, user_id, "group-06")["success"] is False
+
+
+def test_mass_delete_route(usergroup_data, test_client, app_instance):
+    headers = _login(test_client, app_instance)
+
+    response = test_client.post("/api/massDeleteGroups", headers=headers, json={"groupIds": ["group-01", "group-02"]})
+    assert response.status_code == 200
+    assert response.get_json()["data"] == {"deleted_count": 2}
+
+    response = test_client.post("/api/massDeleteGroups", headers=headers, json={"groupIds": ["group-01"]})
+    assert response.status_code == 400
+
+
+def test_mass_delete_reports_partial_failure(usergroup_data, small_chunks, test_client, app_instance, monkeypatch):
+    headers = _login(test_client, app_instance)
+    execute = db.session.execute
+
+    def fail_second_chunk(statement, *args, **kwargs):
+        if statement.is_delete and statement.table.name == "usergroup_user" and "group-02" in str(
+                statement.compile(compile_kwargs={"literal_binds": True})):
+            raise OperationalError("DELETE", {}, Exception("database is locked"))
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db.session, "execute", fail_second_chunk)
+    response = test_client.post("/api/massDeleteGroups", headers=headers,
+                                json={"groupIds": ["group-00", "group-01", "group-02", "group-03", "group-04"]})
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert response.get_json()["data"] == {"deleted_count": 3, "failedIds": ["group-02", "group-03"]}
+    remaining = db.session.scalars(db.select(UserGroup.id).filter_by(org_id=usergroup_data["org"].id)).all()
+    assert sorted(remaining) == ["group-02", "group-03", "group-05", "group-06"]
@@ -0,0 +1,95 @@
+import pytest
+from app import db
+from app.models import User, usergroup_user
+from app.services.usergroup_service import get_user_group_by_id
+
+
+def _enroll(usergroup_data, group_id, count):
+    org_id = usergroup_data["org"].id
+    db.session.execute(User.__table__.insert(), [
+        {"id": f"user-s{n:03d}", "org_id": org_id, "username": f"s{n:03d}", "email": f"s{n:03d}@email.com",
+         "password_hash": "x", "firstname": "Student", "lastname": f"{n:03d}", "user_type": "student",
+         "locked": n % 5 == 0, "logon_attempt": 0, "created_by": "system", "updated_by": "system"}
+        for n in range(count)
+    ])
+    db.session.execute(usergroup_user.insert(), [
+        {"org_id": org_id, "group_id": group_id, "user_id": f"user-s{n:03d}", "created_by": "system"}
+        for n in range(count)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize("size", [2, 40])
+def test_students_and_tags_in_bounded_statements(usergroup_data, query_counter, size):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["instructor"].id
+    _enroll(usergroup_data, "group-00", size)
+    get_user_group_by_id(org_id, user_id, "group-00")  # warm the permission cache
+
+    query_counter.clear()
+    data = get_user_group_by_id(org_id, user_id, "group-00", include_students=True, include_tags=True)["data"]
+
+    assert len(query_counter) == 3  # group, students, tags
+    assert not [s for s in query_counter if "password_hash" in s]
+    assert len(data["studentsInGroup"]) == size
+    assert {"id": "user-s000", "name": "Student 000", "locked": True} in data["studentsInGroup"]
+    assert sorted(tag["name"] for tag in data["tags"]) == ["math", "science"]
+
+
+def _get(test_client, url, etag=None):
+    return test_client.get(url, headers={"If-None-Match": etag} if etag else {})
+
+
+def test_detail_answers_304_from_version_row(usergroup_data, test_client, query_counter):
+    test_client.post("/api/login", json={"userId": "instructor@email.com", "password": "123"})
+    url = "/api/usergroups/group-00?include_students=true&include_tags=true"
+
+    first = _get(test_client, url)
+    etag = first.headers["ETag"].strip('"')
+    assert first.status_code == 200 and first.headers["Last-Modified"]
+
+    query_counter.clear()
+    second = _get(test_client, url, etag)
+    assert second.status_code == 304
+    assert len(query_counter) == 1
+    assert not [s for s in query_counter if "FROM tag" in s or "password_hash" in s]
+
+    # A membership write bumps the group's revision
+    _enroll(usergroup_data, "group-00", 1)
+    from app.services.usergroup_service import touch_user_groups
+    touch_user_groups(usergroup_data["org"].id, ["group-00"])
+    db.session.commit()
+    third = _get(test_client, url, etag)
+    assert third.status_code == 200
+    assert len(third.get_json()["data"]["data"]["studentsInGroup"]) == 1
+
+
+def test_tag_list_etag_follows_tag_writes(usergroup_data, test_client):
+    from app.services.tag_service import delete_tag
+
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+    url = "/api/userGroupTags/group-00"
+    etag = _get(test_client, url).headers["ETag"].strip('"')
+
+    assert _get(test_client, url, etag).status_code == 304
+    assert _get(test_client, "/api/userGroupTags/group-01", etag).status_code == 200
+
+    assert delete_tag(usergroup_data["org"].id, "tag-science") is True
+    response = _get(test_client, url, etag)
+    assert response.status_code == 200
+    assert [tag["name"] for tag in response.get_json()["data"]["tags"]] == ["math"]
+
+
+def test_tag_delete_is_scoped_and_authorized(usergroup_data, test_client, app_instance):
+    from flask_jwt_extended import decode_token
+    from app.models import Tag
+    from app.services.tag_service import delete_tag
+
+    assert delete_tag("org-other", "tag-math") is False
+
+    for email, status in (("student@email.com", 403), ("instructor@email.com", 200)):
+        test_client.post("/api/login", json={"userId": email, "password": "123"})
+        token = test_client.get_cookie(app_instance.config["JWT_ACCESS_COOKIE_NAME"], path="/api").value
+        response = test_client.delete("/api/tags/tag-math", headers={"X-CSRF-TOKEN": decode_token(token)["csrf"]})
+        assert response.status_code == status
+    assert Tag.query.filter_by(id="tag-math").first() is None
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+import pytest
+from app import db
+from app.models import usergroup_user
+
+
+@pytest.fixture
+def logged_in(usergroup_data, test_client, app_instance, monkeypatch):
+    monkeypatch.setitem(app_instance.config, "USERGROUP_EXPORT_BATCH_SIZE", 3)
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+    return test_client
+
+
+def test_csv_export_streams_every_group(logged_in):
+    response = logged_in.get("/api/usergroups/export")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert 'filename="usergroups.csv"' in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert sorted(row["id"] for row in rows) == [f"group-{n:02d}" for n in range(7)]
+    assert rows[0]["title"].startswith("Group ")
+
+
+def test_ndjson_export_honors_filters_and_includes_members(logged_in, usergroup_data, query_counter):
+    db.session.execute(usergroup_user.insert(), [
+        {"org_id": usergroup_data["org"].id, "group_id": "group-06", "user_id": "user-student", "created_by": "system"}
+    ])
+    db.session.commit()
+
+    query_counter.clear()
+    response = logged_in.get("/api/usergroups/export?format=ndjson&tags=math&include_students=true&include_tags=true")
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert sorted(record["id"] for record in records) == ["group-00", "group-02", "group-04", "group-06"]
+    group_06 = next(record for record in records if record["id"] == "group-06")
+    assert group_06["studentsInGroup"] == [{"id": "user-student", "name": "Student Tester", "locked": False}]
+    assert sorted(tag["name"] for tag in group_06["tags"]) == ["math", "science"]
+    # Members and tags are fetched once per batch of three groups, not per group
+    assert len([s for s in query_counter if "FROM usergroup_user" in s]) == 2
+
+
+def test_export_rejects_unknown_format(logged_in):
+    assert logged_in.get("/api/usergroups/export?format=xml").status_code == 400
+    assert logged_in.get("/api/usergroups/export?match=some&tags=math").status_code == 400
+
+
+def test_csv_export_neutralizes_formulas(logged_in, usergroup_data):
+    from app.models import UserGroup
+
+    db.session.execute(db.update(UserGroup).where(UserGroup.id == "group-01")
+                       .values(title='=HYPERLINK("http://x")', description="@SUM(A1)"))
+    db.session.commit()
+
+    rows = list(csv.DictReader(io.StringIO(logged_in.get("/api/usergroups/export").get_data(as_text=True))))
+    group_01 = next(row for row in rows if row["id"] == "group-01")
+
+    assert group_01["title"] == '\'=HYPERLINK("http://x")'
+    assert group_01["description"] == "'@SUM(A1)"
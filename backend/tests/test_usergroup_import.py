@@ -0,0 +1,73 @@
+import io
+import pytest
+from flask_jwt_extended import decode_token
+from app import db
+from app.models import usergroup_user
+from app.services.usergroup_service import import_group_members
+
+CSV = """group,email
+group-00,student@email.com
+group-00,student@email.com
+group-01,instructor@email.com
+group-99,student@email.com
+group-02,nobody@email.com
+,student@email.com
+
+group-03,student@email.com
+"""
+
+
+@pytest.fixture
+def existing_member(usergroup_data):
+    db.session.execute(usergroup_user.insert(), [
+        {"org_id": usergroup_data["org"].id, "group_id": "group-03", "user_id": "user-student", "created_by": "system"}
+    ])
+    db.session.commit()
+
+
+def _members():
+    return sorted(db.session.execute(db.select(usergroup_user.c.group_id, usergroup_user.c.user_id)).all())
+
+
+def test_import_reports_each_bad_row(usergroup_data, existing_member, app_instance, monkeypatch, query_counter):
+    monkeypatch.setitem(app_instance.config, "USERGROUP_IMPORT_BATCH_SIZE", 3)
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["instructor"].id
+
+    query_counter.clear()
+    report = import_group_members(org_id, user_id, io.StringIO(CSV))["data"]
+
+    assert report["imported"] == 2
+    assert report["skipped"] == 2
+    assert [(error["row"], error["error"]) for error in report["errors"]] == [
+        (5, "Unknown group: group-99"),
+        (6, "Unknown email: nobody@email.com"),
+        (7, "Both group and email are required."),
+    ]
+    assert report["errorCount"] == 3
+    assert _members() == [("group-00", "user-student"), ("group-01", "user-instructor"), ("group-03", "user-student")]
+    # Batches of three valid rows; only the first has new pairs, inserted with one executemany
+    assert len([s for s in query_counter if s.startswith("INSERT INTO usergroup_user")]) == 1
+
+
+def test_import_requires_header_columns(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["instructor"].id
+
+    with pytest.raises(ValueError):
+        import_group_members(org_id, user_id, io.StringIO("name,mail\ngroup-00,student@email.com\n"))
+
+
+def test_import_route(usergroup_data, test_client, app_instance, monkeypatch, tmp_path):
+    monkeypatch.setitem(app_instance.config, "UPLOAD_FOLDER", str(tmp_path))
+    test_client.post("/api/login", json={"userId": "instructor@email.com", "password": "123"})
+    token = test_client.get_cookie(app_instance.config["JWT_ACCESS_COOKIE_NAME"], path="/api").value
+    headers = {"X-CSRF-TOKEN": decode_token(token)["csrf"]}
+
+    response = test_client.post("/api/usergroups/members/import", headers=headers,
+                                data={"file": (io.BytesIO(CSV.encode("utf-8-sig")), "members.csv")})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["imported"] == 3
+    assert list(tmp_path.iterdir()) == []
+
+    assert test_client.post("/api/usergroups/members/import", headers=headers, data={}).status_code == 400
@@ -0,0 +1,75 @@
+from app.extensions import cache
+from app.services.tag_service import create_tag
+from app.services.usergroup_service import get_user_groups, update_user_group, list_cache_stats
+
+
+def test_repeated_page_is_served_from_cache(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+    list_cache_stats.reset()
+    first = get_user_groups(org_id, user_id, tags="math", per_page=2)["data"]
+
+    query_counter.clear()
+    second = get_user_groups(org_id, user_id, tags="math", per_page=2)["data"]
+
+    assert second == first
+    assert not [s for s in query_counter if "FROM usergroup" in s]
+    assert list_cache_stats.snapshot() == {"hits_total": 1, "misses_total": 1, "hit_ratio": 0.5}
+    # Other filters and pages are separate entries
+    assert get_user_groups(org_id, user_id, tags="math", page=2, per_page=2)["data"] != first
+    assert list_cache_stats.misses == 2
+
+
+def test_group_and_tag_writes_invalidate_pages(usergroup_data):
+    org_id = usergroup_data["org"].id
+    student_id = usergroup_data["users"]["student"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+    get_user_groups(org_id, student_id, search_term="group")
+
+    update_user_group(org_id, instructor_id, "group-00", title="Renamed group")
+    rows = get_user_groups(org_id, student_id, search_term="group")["data"]["rows"]
+    assert "Renamed group" in [row["title"] for row in rows]
+
+    assert get_user_groups(org_id, student_id, tags="history")["data"]["rows"] == []
+    create_tag("res-usergroup", org_id, "history", instructor_id)
+    misses = list_cache_stats.misses
+    get_user_groups(org_id, student_id, tags="history")
+    assert list_cache_stats.misses == misses + 1
+
+
+def test_pages_are_keyed_by_permission_set(usergroup_data):
+    org_id = usergroup_data["org"].id
+    list_cache_stats.reset()
+
+    get_user_groups(org_id, usergroup_data["users"]["student"].id)
+    get_user_groups(org_id, usergroup_data["users"]["instructor"].id)
+
+    assert list_cache_stats.misses == 2
+
+
+def test_cache_outage_bypasses_the_cache(usergroup_data, monkeypatch):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+    expected = get_user_groups(org_id, user_id, tags="math")["data"]
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("cache backend unavailable")
+
+    monkeypatch.setattr(cache, "get", unavailable)
+    monkeypatch.setattr(cache, "set", unavailable)
+    list_cache_stats.reset()
+
+    result = get_user_groups(org_id, user_id, tags="math")
+    assert result["success"] is True
+    assert result["data"] == expected
+    assert list_cache_stats.snapshot()["hits_total"] == 0
+
+
+def test_metrics_report_list_cache(usergroup_data, metrics_access, test_client):
+    test_client.post("/api/login", json={"userId": "instructor@email.com", "password": "123"})
+    list_cache_stats.reset()
+    test_client.get("/api/usergroups")
+    test_client.get("/api/usergroups")
+
+    metrics = test_client.get("/api/metrics").get_json()["data"]["usergroup_list_cache"]
+    assert metrics["hits_total"] == 1 and metrics["misses_total"] == 1
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import usergroup_user
+
+
+def _join(org_id, *group_ids, user_id="user-student"):
+    db.session.execute(usergroup_user.insert(), [
+        {"org_id": org_id, "group_id": group_id, "user_id": user_id, "created_by": "system"} for group_id in group_ids
+    ])
+    db.session.commit()
+
+
+def test_duplicate_membership_rejected(usergroup_data):
+    org_id = usergroup_data["org"].id
+    _join(org_id, "group-01")
+
+    with pytest.raises(IntegrityError):
+        _join(org_id, "group-01")
+    db.session.rollback()
+
+
+def test_member_groups_use_reverse_index(usergroup_data):
+    statement = db.select(usergroup_user.c.group_id).where(
+        usergroup_user.c.org_id == "org-1", usergroup_user.c.user_id == "user-student"
+    ).compile(db.engine, compile_kwargs={"literal_binds": True})
+
+    plan = " ".join(row[3] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {statement}")))
+
+    assert "idx_usergroup_user_member" in plan
+
+
+def test_my_usergroups_route_pages_by_title(usergroup_data, test_client):
+    org_id = usergroup_data["org"].id
+    _join(org_id, "group-05", "group-01", "group-03")
+    _join(org_id, "group-02", user_id="user-instructor")
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    first = test_client.get("/api/me/usergroups?per_page=2").get_json()["data"]["data"]
+    second = test_client.get("/api/me/usergroups?per_page=2&page=2").get_json()["data"]["data"]
+
+    assert [row["id"] for row in first["rows"]] == ["group-01", "group-03"]
+    assert [row["id"] for row in second["rows"]] == ["group-05"]
+    assert first["pageInfo"] == {"currentPage": 1, "rowsPerPage": 2, "totalRows": 3}
@@ -0,0 +1,126 @@
+import pytest
+from app.services.usergroup_service import get_user_groups_by_cursor
+from app.utils.pagination_utils import encode_cursor
+
+
+def _page(org_id, user_id, **kwargs):
+    return get_user_groups_by_cursor(org_id, user_id, per_page=3, **kwargs)["data"]
+
+
+@pytest.mark.parametrize("sort", ["title", "created_at"])
+def test_cursor_walks_every_group_once(usergroup_data, sort):
+    """created_at ties (one insert batch) are broken by id, so nothing is skipped or repeated."""
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = _page(org_id, user_id, cursor=cursor, sort=sort)
+        seen.extend(row["id"] for row in page["rows"])
+        pages += 1
+        cursor = page["pageInfo"]["next"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == [group.id for group in usergroup_data["groups"]]
+    assert len(set(seen)) == len(seen)
+
+
+def test_prev_cursor_returns_previous_page(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    first = _page(org_id, user_id)
+    assert first["pageInfo"]["prev"] is None
+    second = _page(org_id, user_id, cursor=first["pageInfo"]["next"])
+    back = _page(org_id, user_id, cursor=second["pageInfo"]["prev"])
+
+    assert [row["title"] for row in first["rows"]] == ["Group 00", "Group 01", "Group 02"]
+    assert [row["id"] for row in back["rows"]] == [row["id"] for row in first["rows"]]
+    assert back["pageInfo"]["prev"] is None
+
+
+def test_cursor_rejects_mismatched_sort(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+    cursor = _page(org_id, user_id, sort="title")["pageInfo"]["next"]
+
+    with pytest.raises(ValueError):
+        _page(org_id, user_id, cursor=cursor, sort="created_at")
+    with pytest.raises(ValueError):
+        _page(org_id, user_id, cursor="not-a-cursor")
+
+
+@pytest.mark.parametrize("position", [
+    {"sort": "created_at", "value": 5, "id": "group-01", "direction": "next"},
+    {"sort": "created_at", "value": "yesterday", "id": "group-01", "direction": "next"},
+    {"sort": "created_at", "value": "2024-09-01T00:00:00", "id": ["group-01"], "direction": "next"},
+])
+def test_tampered_cursor_is_rejected(usergroup_data, test_client, position):
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    response = test_client.get(f"/api/usergroups?sort=created_at&cursor={encode_cursor(position)}")
+    assert response.status_code == 400
+
+
+def test_per_page_is_clamped(usergroup_data, test_client, app_instance, monkeypatch):
+    monkeypatch.setitem(app_instance.config, "MAX_PER_PAGE", 2)
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    offset = test_client.get("/api/usergroups?per_page=100000").get_json()["data"]["data"]
+    assert offset["pageInfo"]["rowsPerPage"] == 2 and len(offset["rows"]) == 2
+    cursor = test_client.get("/api/usergroups?pagination=cursor&per_page=100000").get_json()["data"]["data"]
+    assert cursor["pageInfo"]["rowsPerPage"] == 2 and len(cursor["rows"]) == 2
+    assert test_client.get("/api/usergroups?per_page=-5").get_json()["data"]["data"]["pageInfo"]["rowsPerPage"] == 1
+
+
+def test_cursor_mode_route(usergroup_data, test_client):
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    response = test_client.get("/api/usergroups?pagination=cursor&per_page=5")
+    page_info = response.get_json()["data"]["data"]["pageInfo"]
+    assert response.status_code == 200
+    assert page_info["next"] and page_info["prev"] is None
+
+    offset = test_client.get("/api/usergroups?page=2&per_page=5").get_json()["data"]["data"]
+    assert offset["pageInfo"]["totalRows"] == 7
+    assert len(offset["rows"]) == 2
+
+
+def _count_statements(statements):
+    return [s for s in statements if "count(" in s.lower()]
+
+
+def test_total_rows_cached_until_groups_change(usergroup_data, query_counter):
+    from app.services.usergroup_service import get_user_groups, create_user_group
+
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+
+    first = get_user_groups(org_id, instructor_id, search_term="Group", per_page=2)["data"]["pageInfo"]
+    query_counter.clear()
+    second = get_user_groups(org_id, instructor_id, search_term="Group", page=2, per_page=2)["data"]["pageInfo"]
+
+    assert first["totalRows"] == second["totalRows"] == 7
+    assert _count_statements(query_counter) == []
+
+    create_user_group(org_id, instructor_id, "Group 07")
+    third = get_user_groups(org_id, instructor_id, search_term="Group", per_page=2)["data"]["pageInfo"]
+    assert third["totalRows"] == 8
+
+
+def test_estimate_mode_flags_inexact_totals(usergroup_data, app_instance, monkeypatch):
+    from app.services.usergroup_service import get_user_groups
+
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    monkeypatch.setitem(app_instance.config, "USERGROUP_LIST_CACHE_TIMEOUT", 0)  # counts are under test
+    monkeypatch.setitem(app_instance.config, "USERGROUP_COUNT_ESTIMATE_THRESHOLD", 3)
+    estimated = get_user_groups(org_id, user_id, count_mode="estimate")["data"]["pageInfo"]
+    assert estimated == {**estimated, "totalRows": 3, "exact": False}
+
+    monkeypatch.setitem(app_instance.config, "USERGROUP_COUNT_ESTIMATE_THRESHOLD", 100)
+    small = get_user_groups(org_id, user_id, count_mode="estimate")["data"]["pageInfo"]
+    assert small["totalRows"] == 7 and small["exact"] is True
@@ -0,0 +1,72 @@
+import pytest
+from app.services.usergroup_service import get_user_groups, update_user_group, delete_user_group
+
+
+def _titles(org_id, user_id, search_term):
+    return [row["title"] for row in get_user_groups(org_id, user_id, search_term=search_term)["data"]["rows"]]
+
+
+def test_search_prefix_matches_and_ranks_title_first(usergroup_data):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+    update_user_group(org_id, instructor_id, "group-01", title="Algebra Basics")
+    update_user_group(org_id, instructor_id, "group-02", description="Intro to algebra")
+
+    assert _titles(org_id, instructor_id, "alg") == ["Algebra Basics", "Group 02"]
+    assert _titles(org_id, instructor_id, "algebra bas") == ["Algebra Basics"]
+    assert _titles(org_id, instructor_id, "geometry") == []
+
+
+def test_search_index_follows_updates_and_deletes(usergroup_data):
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+
+    update_user_group(org_id, instructor_id, "group-03", title="Chemistry Lab")
+    assert _titles(org_id, instructor_id, "chem") == ["Chemistry Lab"]
+
+    update_user_group(org_id, instructor_id, "group-03", title="Physics Lab")
+    assert _titles(org_id, instructor_id, "chem") == []
+    assert _titles(org_id, instructor_id, "physics") == ["Physics Lab"]
+
+    delete_user_group(org_id, instructor_id, "group-03")
+    assert _titles(org_id, instructor_id, "physics") == []
+
+
+def test_search_ignores_punctuation(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    assert _titles(org_id, user_id, 'Group "05"') == ["Group 05"]
+    assert len(_titles(org_id, user_id, "%")) == 7
+
+
+def test_search_is_scoped_to_title_and_description(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    # Words of the organization id column never match
+    assert _titles(org_id, user_id, "org") == []
+    assert _titles(org_id, user_id, "group 06") == ["Group 06"]
+
+
+@pytest.mark.parametrize("legacy_ddl", [
+    None,
+    "CREATE VIRTUAL TABLE usergroup_fts USING fts5("
+    "title, description, content='usergroup', content_rowid='rowid', tokenize='unicode61', prefix='2 3')",
+])
+def test_startup_builds_missing_or_outdated_index(usergroup_data, app_instance, legacy_ddl):
+    from app import db
+    from app.models.usergroup_models import USERGROUP_FTS_DROP, init_usergroup_search_index
+
+    org_id = usergroup_data["org"].id
+    instructor_id = usergroup_data["users"]["instructor"].id
+    db.session.commit()
+    with db.engine.begin() as connection:
+        for statement in USERGROUP_FTS_DROP + ([legacy_ddl] if legacy_ddl else []):
+            connection.exec_driver_sql(statement)
+
+    init_usergroup_search_index(app_instance)
+
+    assert _titles(org_id, instructor_id, "group 04") == ["Group 04"]
+    update_user_group(org_id, instructor_id, "group-04", title="Geometry")
+    assert _titles(org_id, instructor_id, "geo") == ["Geometry"]
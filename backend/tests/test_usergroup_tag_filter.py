@@ -0,0 +1,56 @@
+import pytest
+from app.services.tag_service import create_tag
+from app.services.usergroup_service import get_user_groups, get_user_groups_by_cursor, get_tag_id_map
+
+
+def _ids(usergroup_data, **kwargs):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+    return get_user_groups(org_id, user_id, **kwargs)["data"]
+
+
+def test_any_returns_each_group_once(usergroup_data):
+    data = _ids(usergroup_data, tags="math,science")
+
+    assert [row["id"] for row in data["rows"]] == ["group-00", "group-02", "group-03", "group-04", "group-06"]
+    assert data["pageInfo"]["totalRows"] == 5
+
+
+def test_all_requires_every_tag(usergroup_data):
+    data = _ids(usergroup_data, tags="math, science", match="all")
+
+    assert [row["id"] for row in data["rows"]] == ["group-00", "group-06"]
+    assert data["pageInfo"]["totalRows"] == 2
+    assert _ids(usergroup_data, tags="math,unknown", match="all")["pageInfo"]["totalRows"] == 0
+    assert _ids(usergroup_data, tags="math,unknown", match="any")["pageInfo"]["totalRows"] == 4
+
+
+def test_cursor_mode_filters_by_all_tags(usergroup_data):
+    org_id = usergroup_data["org"].id
+    user_id = usergroup_data["users"]["student"].id
+
+    page = get_user_groups_by_cursor(org_id, user_id, tags="math,science", match="all")["data"]
+
+    assert [row["id"] for row in page["rows"]] == ["group-00", "group-06"]
+    with pytest.raises(ValueError):
+        get_user_groups_by_cursor(org_id, user_id, tags="math", match="some")
+
+
+def test_tag_names_resolved_from_cache(usergroup_data, query_counter):
+    org_id = usergroup_data["org"].id
+    get_tag_id_map(org_id)
+
+    query_counter.clear()
+    _ids(usergroup_data, tags="science")
+    assert not [s for s in query_counter if "FROM tag " in s]
+
+    create_tag("res-usergroup", org_id, "history", "user-instructor")
+    assert "history" in get_tag_id_map(org_id)
+
+
+def test_route_rejects_unknown_match_mode(usergroup_data, test_client):
+    test_client.post("/api/login", json={"userId": "student@email.com", "password": "123"})
+
+    assert test_client.get("/api/usergroups?tags=math&match=some").status_code == 400
+    response = test_client.get("/api/usergroups?tags=math,science&match=all")
+    assert response.get_json()["data"]["data"]["pageInfo"]["totalRows"] == 2